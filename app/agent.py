@@ -3,56 +3,117 @@ Agent Saad - Main Agent Logic
 This module handles the monitoring and processing cycle
 """
 
+import itertools
 import logging
-from typing import Dict, List
-from app.database.db import Database
-from app.models.sentiment import SentimentAnalyzer
-from app.monitors.twitter_monitor import TwitterMonitor
-from app.monitors.reddit_monitor import RedditMonitor
-from app.alerts.slack_alert import SlackAlerter
-from app.alerts.email_alert import EmailAlerter
+import time
+from typing import Dict, Iterable, Iterator, List, Optional
+from app.components import components
+from app.monitors.items import MentionItem
+from app.monitors.rate_limits import RateLimitManager
+from app.jobs import MonitorJobs
+from app.pipeline import batched, prefetch, prioritized
+from app.priority import pre_score
 from config import Config
 
 logger = logging.getLogger(__name__)
 
-# Initialize components
-db = Database(Config.DATABASE_PATH)
-sentiment_analyzer = SentimentAnalyzer()
-twitter_monitor = TwitterMonitor()
-reddit_monitor = RedditMonitor()
-slack_alerter = SlackAlerter()
-email_alerter = EmailAlerter()
+# Database, model, monitors and alerters come from the shared registry in
+# app.components and are built on first use
 
-def process_item(item: Dict, source: str) -> bool:
+# Set when adaptive scheduling is enabled
+adaptive_scheduler = None
+
+# Set when running as one of several sharded workers
+keyword_shard = None
+
+# Name of the scheduler's row in the process_heartbeats table
+SCHEDULER_HEARTBEAT = 'scheduler'
+
+def analyze_items(items: List[MentionItem]) -> Dict[str, Dict]:
+    """
+    Run sentiment analysis for a batch of unprocessed items in one pass
+    
+    With the lexicon pre-filter enabled, items the lexicon scores above
+    SENTIMENT_PREFILTER_MARGIN cannot reach the alert threshold and keep the
+    lexicon result; only the rest go through the transformer.
+    
+    Args:
+        items: Items not yet processed
+    
+    Returns:
+        dict: Sentiment results keyed by item id
+    """
+    pending = [item for item in items if len(item.text.strip()) >= 10]
+    if not pending:
+        return {}
+    
+    results = {}
+    if components.lexicon_scorer is not None:
+        # Never let the lexicon decide an item the threshold would alert on
+        margin = max(Config.SENTIMENT_PREFILTER_MARGIN, Config.SENTIMENT_THRESHOLD)
+        scores = components.lexicon_scorer.score_batch([item.text for item in pending])
+        escalated = []
+        for item, score in zip(pending, scores):
+            if score > margin:
+                results[item.id] = lexicon_result(float(score))
+            else:
+                escalated.append(item)
+        logger.debug(f"Lexicon pre-filter escalated {len(escalated)} of {len(pending)} items")
+        pending = escalated
+        if not pending:
+            return results
+    
+    sentiments = components.sentiment_analyzer.analyze_batch(
+        [item.text for item in pending],
+        with_embeddings=components.incident_index is not None
+    )
+    results.update((item.id, sentiment) for item, sentiment in zip(pending, sentiments))
+    return results
+
+def lexicon_result(score: float) -> Dict:
+    """Sentiment dict for an item decided by the lexicon pre-filter"""
+    return {
+        'label': 'NEGATIVE' if score < 0 else 'POSITIVE',
+        'score': abs(score),
+        'normalized_score': score,
+        'stage': 'lexicon'
+    }
+
+def process_item(item: MentionItem, sentiment: Dict = None, claimed: bool = False) -> bool:
     """
     Process a single social media item for sentiment analysis
     
     Args:
-        item: Dictionary containing item data
-        source: Source platform (Twitter/Reddit)
+        item: The fetched item
+        sentiment: Precomputed sentiment result (from analyze_items)
+        claimed: The caller already claimed the item with claim_item
     
     Returns:
         bool: True if alert was created, False otherwise
     """
     try:
-        item_id = item.get('id')
-        text = item.get('text', '')
+        source = item.source
+        item_id = item.id
+        text = item.text
         
-        # Skip if already processed
-        if db.is_processed(source, item_id):
+        # Claim the item atomically so concurrent workers never process it twice
+        if not claimed and not components.db.claim_item(source, item_id):
             logger.debug(f"Item {item_id} already processed, skipping")
             return False
         
-        # Mark as processed
-        db.mark_as_processed(source, item_id)
-        
         # Skip if no text
         if not text or len(text.strip()) < 10:
             logger.debug(f"Item {item_id} has insufficient text, skipping")
             return False
         
         # Analyze sentiment
-        sentiment = sentiment_analyzer.analyze(text)
+        if sentiment is None:
+            sentiment = components.sentiment_analyzer.analyze_batch(
+                [text], with_embeddings=components.incident_index is not None
+            )[0]
+        components.db.record_item_sentiment(
+            source, item_id, sentiment['normalized_score'], sentiment['label'], sentiment.get('stage', 'model')
+        )
         
         # Check if sentiment is negative enough to alert
         if sentiment['normalized_score'] > Config.SENTIMENT_THRESHOLD:
@@ -60,18 +121,19 @@ def process_item(item: Dict, source: str) -> bool:
             return False
         
         # Determine urgency
-        engagement = item.get('engagement', 0)
-        urgency = sentiment_analyzer.determine_urgency(sentiment['normalized_score'], engagement)
+        engagement = item.engagement
+        urgency = components.sentiment_analyzer.determine_urgency(sentiment['normalized_score'], engagement)
         
         # Generate recommendation
-        recommendation = sentiment_analyzer.generate_response_recommendation(text, sentiment['label'])
+        category = sentiment.get('heads', {}).get('issue_category', {}).get('label')
+        recommendation = components.sentiment_analyzer.generate_response_recommendation(text, sentiment['label'], category)
         
         # Create alert data
         alert_data = {
             'source': source,
             'content': text,
-            'author': item.get('author', 'Unknown'),
-            'url': item.get('url', ''),
+            'author': item.author,
+            'url': item.url,
             'sentiment_score': sentiment['normalized_score'],
             'sentiment_label': sentiment['label'],
             'urgency_level': urgency,
@@ -79,26 +141,21 @@ def process_item(item: Dict, source: str) -> bool:
         }
         
         # Save alert to database
-        alert_id = db.add_alert(alert_data)
+        alert_id = components.db.add_alert(alert_data)
         logger.info(f"Created alert {alert_id} for item {item_id} with urgency {urgency}")
         
-        # Send notifications
-        notifications_sent = False
-        
-        if urgency in ['CRITICAL', 'HIGH']:
-            # Send Slack notification
-            if slack_alerter.send_alert(alert_data):
-                logger.info(f"Slack alert sent for alert {alert_id}")
-                notifications_sent = True
-            
-            # Send Email notification
-            if email_alerter.send_alert(alert_data):
-                logger.info(f"Email alert sent for alert {alert_id}")
-                notifications_sent = True
+        # Group with semantically similar recent alerts
+        incident_id = None
+        notify = urgency in ['CRITICAL', 'HIGH']
+        if components.incident_index is not None and sentiment.get('embedding'):
+            incident_id, created = components.incident_index.assign(alert_id, sentiment['embedding'], urgency)
+            alert_data['incident_id'] = incident_id
+            if notify and not created and not components.incident_index.should_notify(incident_id, urgency):
+                logger.info(f"Alert {alert_id} joins already-notified incident {incident_id}, not notifying")
+                notify = False
         
-        # Mark as notified if any notification was sent
-        if notifications_sent:
-            db.mark_as_notified(alert_id)
+        if notify:
+            send_notifications(alert_id, alert_data, incident_id)
         
         return True
         
@@ -106,6 +163,186 @@ def process_item(item: Dict, source: str) -> bool:
         logger.error(f"Error processing item: {e}")
         return False
 
+def send_notifications(alert_id: int, alert_data: Dict, incident_id: Optional[int] = None) -> bool:
+    """
+    Send an alert to Slack and email
+    
+    The alert is marked notified if any channel accepted it; otherwise (e.g.
+    the Slack quota is spent) it is deferred for retry_deferred_notifications.
+    
+    Returns:
+        bool: True if a notification was sent
+    """
+    notifications_sent = False
+    
+    if components.slack_alerter.send_alert(alert_data):
+        logger.info(f"Slack alert sent for alert {alert_id}")
+        notifications_sent = True
+    
+    if components.email_alerter.send_alert(alert_data):
+        logger.info(f"Email alert sent for alert {alert_id}")
+        notifications_sent = True
+    
+    if notifications_sent:
+        components.db.mark_as_notified(alert_id)
+        if incident_id is not None:
+            components.db.mark_incident_notified(incident_id, alert_data['urgency_level'])
+    elif components.slack_alerter.is_configured() or components.email_alerter.is_configured():
+        logger.warning(f"No notification channel accepted alert {alert_id}, deferring it")
+        components.db.defer_notification(alert_id)
+    return notifications_sent
+
+def retry_deferred_notifications() -> int:
+    """
+    Resend alerts whose notification was deferred, oldest first
+    
+    Returns:
+        int: Number of alerts notified
+    """
+    sent = 0
+    for alert in components.db.get_unnotified_alerts(Config.NOTIFY_RETRY_HOURS, Config.NOTIFY_RETRY_BATCH):
+        # Claimed first so two processes never resend the same alert
+        if not components.db.claim_notification(alert['id']):
+            continue
+        incident_id = alert.get('incident_id')
+        if (incident_id is not None and components.incident_index is not None
+                and not components.incident_index.should_notify(incident_id, alert['urgency_level'])):
+            logger.info(f"Deferred alert {alert['id']} is covered by notified incident {incident_id}")
+            continue
+        if send_notifications(alert['id'], alert, incident_id):
+            sent += 1
+    if sent:
+        logger.info(f"Sent {sent} deferred alert notifications")
+    return sent
+
+def process_batch(batch: List[MentionItem], counts: Dict):
+    """
+    Process one batch of fetched items, in order
+    
+    Already-seen items are dropped, the rest claimed together (one group
+    commit) and the claimed ones analyzed in one model pass and then
+    processed. Updates counts in place.
+    """
+    counts['items'] += len(batch)
+    for item in batch:
+        counts['by_source'][item.source] = counts['by_source'].get(item.source, 0) + 1
+    
+    pending = [item for item in batch if not components.db.is_processed(item.source, item.id)]
+    counts['new_items'] += len(pending)
+    claims = [(item, components.db.claim_item_async(item.source, item.id)) for item in pending]
+    claimed = [item for item, claim in claims if claim.result()]
+    sentiments = analyze_items(claimed)
+    
+    for item in claimed:
+        if process_item(item, sentiments.get(item.id), claimed=True):
+            counts['alerts_created'] += 1
+
+def new_counts() -> Dict:
+    return {'items': 0, 'new_items': 0, 'alerts_created': 0, 'by_source': {}}
+
+def process_items(items: Iterable[MentionItem]) -> Dict:
+    """
+    Stream fetched items through the pipeline in arrival order
+    
+    Items are taken in batches of SENTIMENT_BATCH_SIZE (see process_batch).
+    The next batch is fetched in the background meanwhile, so only about
+    two batches are held in memory regardless of how many items arrive.
+    
+    Args:
+        items: Iterable (usually a monitor generator) of fetched items
+    
+    Returns:
+        dict: Counts of fetched items (also per source), new (previously
+            unseen) items and alerts created
+    """
+    counts = new_counts()
+    for batch in prefetch(batched(items, max(Config.SENTIMENT_BATCH_SIZE, 1)), depth=1):
+        process_batch(batch, counts)
+    return counts
+
+def process_prioritized(streams: List[Iterable[MentionItem]]) -> Dict:
+    """
+    Fetch several sources at once and process the most urgent-looking items first
+    
+    Items from all streams are ordered by pre_score (engagement, audience
+    and severe wording) as they arrive, so a viral complaint on one source
+    is not classified after every harmless item of another.
+    
+    Returns:
+        dict: Counts as for process_items
+    """
+    counts = new_counts()
+    for batch in prioritized(streams, pre_score, max(Config.SENTIMENT_BATCH_SIZE, 1),
+                             max_pending=Config.PRIORITY_MAX_PENDING):
+        process_batch(batch, counts)
+    return counts
+
+def poll_keyword(keyword: str, source: str) -> int:
+    """
+    Poll a single keyword on a single source (used by the adaptive scheduler)
+    
+    Returns:
+        int: Number of new mentions found
+    """
+    if source == 'Twitter':
+        items = components.twitter_monitor.search_mentions([keyword], max_results=Config.MONITOR_MAX_RESULTS)
+    else:
+        items = components.reddit_monitor.search_mentions([keyword], limit=Config.MONITOR_MAX_RESULTS)
+    
+    return process_items(items)['new_items']
+
+def source_available(source: str) -> bool:
+    """Check whether a source's search endpoint has quota left"""
+    if source == 'Twitter':
+        from app.monitors.twitter_monitor import SEARCH_ENDPOINT as endpoint
+    else:
+        from app.monitors.reddit_monitor import API_ENDPOINT as endpoint
+    return RateLimitManager().can_call(source, endpoint)
+
+def current_keywords() -> List[str]:
+    """Keywords this process is responsible for (its shard in worker mode)"""
+    if keyword_shard is not None:
+        return keyword_shard.get_keywords()
+    return Config.KEYWORDS
+
+def record_ids(items: Iterable[MentionItem], ids: List[str]) -> Iterator[MentionItem]:
+    """Pass items through unchanged, appending each id to ids"""
+    for item in items:
+        ids.append(item.id)
+        yield item
+
+def scan_reddit_comments(keywords: List[str], matched_threads: List[str]) -> Dict:
+    """
+    Scan the comment trees of recently matched and watched Reddit threads
+    
+    Threads are remembered in the database so a post that matched once keeps
+    being followed for REDDIT_THREAD_FOLLOW_HOURS; each scan only processes
+    comments newer than the thread's high-water mark.
+    
+    Args:
+        keywords: Keywords a comment must mention
+        matched_threads: Submission ids that matched in this cycle
+    
+    Returns:
+        dict: Counts from process_items
+    """
+    db = components.db
+    db.track_reddit_threads(matched_threads)
+    db.track_reddit_threads(Config.REDDIT_WATCHED_SUBMISSIONS, watched=True)
+    threads = db.get_reddit_threads(Config.REDDIT_THREAD_FOLLOW_HOURS, Config.REDDIT_COMMENT_THREADS_PER_CYCLE)
+    
+    marks = {}
+    
+    def comments() -> Iterator[MentionItem]:
+        for submission_id, mark, items in components.reddit_monitor.scan_comments(threads, keywords):
+            marks[submission_id] = mark
+            yield from items
+    
+    counts = process_items(comments())
+    db.update_reddit_threads(marks)
+    logger.info(f"Scanned {len(marks)} Reddit threads, {counts['items']} matching comments")
+    return counts
+
 def process_monitoring_cycle() -> Dict:
     """
     Run a complete monitoring cycle for all sources
@@ -122,28 +359,37 @@ def process_monitoring_cycle() -> Dict:
         'alerts_created': 0
     }
     
+    keywords = current_keywords()
+    
     try:
-        # Monitor Twitter
-        if Config.KEYWORDS:
-            logger.info(f"Monitoring Twitter for keywords: {Config.KEYWORDS}")
-            tweets = twitter_monitor.search_mentions(Config.KEYWORDS, max_results=20)
-            results['twitter_items'] = len(tweets)
+        if keywords:
+            logger.info(f"Monitoring Twitter and Reddit for keywords: {keywords}")
+            matched_threads = []
+            streams = [
+                components.twitter_monitor.search_mentions(keywords, max_results=Config.MONITOR_MAX_RESULTS),
+                record_ids(
+                    components.reddit_monitor.search_mentions(keywords, limit=Config.MONITOR_MAX_RESULTS),
+                    matched_threads
+                )
+            ]
             
-            for tweet in tweets:
-                if process_item(tweet, 'Twitter'):
-                    results['alerts_created'] += 1
-        
-        # Monitor Reddit
-        if Config.KEYWORDS:
-            logger.info(f"Monitoring Reddit for keywords: {Config.KEYWORDS}")
-            reddit_posts = reddit_monitor.search_mentions(Config.KEYWORDS, limit=20)
-            results['reddit_items'] = len(reddit_posts)
+            if Config.PRIORITY_PROCESSING:
+                counts = process_prioritized(streams)
+            else:
+                counts = process_items(itertools.chain(*streams))
+            
+            results['twitter_items'] = counts['by_source'].get('Twitter', 0)
+            results['reddit_items'] = counts['by_source'].get('Reddit', 0)
+            results['alerts_created'] += counts['alerts_created']
             
-            for post in reddit_posts:
-                if process_item(post, 'Reddit'):
-                    results['alerts_created'] += 1
+            if Config.REDDIT_COMMENT_SCAN:
+                counts = scan_reddit_comments(keywords, matched_threads)
+                results['reddit_comments'] = counts['items']
+                results['alerts_created'] += counts['alerts_created']
         
-        results['total_processed'] = results['twitter_items'] + results['reddit_items']
+        results['total_processed'] = (
+            results['twitter_items'] + results['reddit_items'] + results.get('reddit_comments', 0)
+        )
         
         logger.info(f"Monitoring cycle completed: {results}")
         return results
@@ -152,19 +398,122 @@ def process_monitoring_cycle() -> Dict:
         logger.error(f"Error in monitoring cycle: {e}")
         return results
 
-def start_scheduled_monitoring():
-    """Start the scheduled monitoring agent"""
+# Background runner shared by manual triggers and the scheduler (jobs live in the database)
+monitor_jobs = MonitorJobs(process_monitoring_cycle)
+
+def record_scheduler_heartbeat():
+    components.db.record_heartbeat(SCHEDULER_HEARTBEAT)
+
+def scheduler_status() -> Optional[Dict]:
+    """
+    Liveness of the monitoring scheduler, from the heartbeat it records in the database
+    
+    Returns:
+        dict: pid, seconds since the last heartbeat and whether it is alive,
+        or None if no scheduler has run against this database
+    """
+    heartbeat = components.db.get_heartbeat(SCHEDULER_HEARTBEAT)
+    if heartbeat is None:
+        return None
+    age = time.time() - heartbeat['heartbeat_at']
+    return {
+        'pid': heartbeat['pid'],
+        'last_heartbeat_seconds': round(age, 1),
+        'alive': age < Config.SCHEDULER_STALE_SECONDS
+    }
+
+def start_scheduled_monitoring(worker_id: str = None):
+    """
+    Start the scheduled monitoring agent
+    
+    Args:
+        worker_id: Run as a sharded worker that only monitors the keywords
+            leased to it in the shared database
+    """
     from apscheduler.schedulers.background import BackgroundScheduler
     
+    global adaptive_scheduler, keyword_shard
+    
     scheduler = BackgroundScheduler()
     
-    # Schedule monitoring job
+    if worker_id:
+        from app.worker import KeywordShard
+        keyword_shard = KeywordShard(components.db, worker_id, Config.KEYWORDS, Config.LEASE_TTL_SECONDS)
+        # Each shard monitors different keywords, so its cycles never coalesce with other processes'
+        monitor_jobs.scope = f"worker:{worker_id}"
+        keyword_shard.heartbeat()
+        scheduler.add_job(
+            keyword_shard.heartbeat,
+            'interval',
+            seconds=Config.LEASE_HEARTBEAT_SECONDS,
+            id='keyword_lease_heartbeat',
+            replace_existing=True,
+            max_instances=1
+        )
+        if Config.ADAPTIVE_SCHEDULING:
+            logger.warning("Adaptive scheduling is not supported in worker mode, using fixed interval")
+    else:
+        # Lets /health (in any process) tell that scheduled monitoring is still running
+        record_scheduler_heartbeat()
+        scheduler.add_job(
+            record_scheduler_heartbeat,
+            'interval',
+            seconds=Config.SCHEDULER_HEARTBEAT_SECONDS,
+            id='scheduler_heartbeat',
+            replace_existing=True,
+            max_instances=1
+        )
+        # Run manual triggers queued by web workers that do not execute jobs themselves
+        scheduler.add_job(
+            monitor_jobs.run_queued,
+            'interval',
+            seconds=Config.MONITOR_JOB_POLL_SECONDS,
+            id='monitor_queued_jobs',
+            replace_existing=True,
+            max_instances=1
+        )
+    
+    # Alerts no channel accepted (e.g. Slack quota spent) are retried, never dropped
+    scheduler.add_job(
+        retry_deferred_notifications,
+        'interval',
+        seconds=Config.NOTIFY_RETRY_SECONDS,
+        id='retry_deferred_notifications',
+        replace_existing=True,
+        max_instances=1
+    )
+    
+    if Config.ADAPTIVE_SCHEDULING and not worker_id:
+        # Poll each keyword on its own velocity-driven interval
+        from app.scheduler import AdaptiveScheduler
+        adaptive_scheduler = AdaptiveScheduler(
+            poll_keyword,
+            [keyword for keyword in Config.KEYWORDS if keyword.strip()],
+            ['Twitter', 'Reddit'],
+            is_available=source_available,
+            store=components.db
+        )
+        scheduler.add_job(
+            adaptive_scheduler.tick,
+            'interval',
+            seconds=Config.SCHEDULER_TICK_SECONDS,
+            id='monitor_sentiment',
+            replace_existing=True,
+            max_instances=1
+        )
+        scheduler.start()
+        logger.info(f"Adaptive monitoring started (budget {adaptive_scheduler.calls_per_hour} API calls/hour)")
+        return scheduler
+    
+    # Schedule monitoring job (coalesced with manual runs via monitor_jobs)
     scheduler.add_job(
-        process_monitoring_cycle,
+        monitor_jobs.run_scheduled,
         'interval',
         minutes=Config.CHECK_INTERVAL_MINUTES,
         id='monitor_sentiment',
-        replace_existing=True
+        replace_existing=True,
+        max_instances=1,
+        coalesce=True
     )
     
     scheduler.start()
@@ -15,6 +15,9 @@ class EmailAlerter:
         self.password = Config.SMTP_PASSWORD
         self.recipient = Config.ALERT_EMAIL_TO
     
+    def is_configured(self) -> bool:
+        return all([self.smtp_server, self.username, self.password, self.recipient])
+    
     def send_alert(self, alert_data: dict) -> bool:
         """
         Send an alert via email
@@ -50,7 +53,8 @@ class EmailAlerter:
             
             # Send email
             with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
+                if Config.SMTP_STARTTLS:
+                    server.starttls()
                 server.login(self.username, self.password)
                 server.send_message(msg)
             
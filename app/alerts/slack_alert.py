@@ -2,6 +2,7 @@ import logging
 from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
 from config import Config
+from app.monitors.rate_limits import RateLimitManager
 
 logger = logging.getLogger(__name__)
 
@@ -15,13 +16,22 @@ class SlackAlerter:
         """Setup Slack client"""
         try:
             if Config.SLACK_BOT_TOKEN:
-                self.client = WebClient(token=Config.SLACK_BOT_TOKEN)
+                if Config.SLACK_API_BASE_URL:
+                    self.client = WebClient(
+                        token=Config.SLACK_BOT_TOKEN,
+                        base_url=Config.SLACK_API_BASE_URL.rstrip('/') + '/'
+                    )
+                else:
+                    self.client = WebClient(token=Config.SLACK_BOT_TOKEN)
                 logger.info("Slack client initialized successfully")
             else:
                 logger.warning("Slack bot token not configured")
         except Exception as e:
             logger.error(f"Failed to initialize Slack client: {e}")
     
+    def is_configured(self) -> bool:
+        return self.client is not None
+    
     def send_alert(self, alert_data: dict) -> bool:
         """
         Send an alert to Slack
@@ -36,6 +46,14 @@ class SlackAlerter:
             logger.warning("Slack client not initialized, skipping alert")
             return False
         
+        rate_limits = RateLimitManager()
+        if not rate_limits.consume('Slack', 'chat.postMessage'):
+            logger.warning(
+                f"Slack rate limited, deferring alert for "
+                f"{rate_limits.retry_after('Slack', 'chat.postMessage'):.0f}s"
+            )
+            return False
+        
         try:
             # Determine urgency emoji and color
             urgency = alert_data.get('urgency_level', 'LOW')
@@ -126,6 +144,8 @@ class SlackAlerter:
             return True
             
         except SlackApiError as e:
+            if e.response.status_code == 429:
+                rate_limits.update_from_headers('Slack', 'chat.postMessage', e.response.headers, throttled=True)
             logger.error(f"Slack API error: {e.response['error']}")
             return False
         except Exception as e:
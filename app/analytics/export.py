@@ -0,0 +1,270 @@
+"""
+Agent Saad - Columnar Analytics Export
+Incrementally copies alerts and per-item sentiment results from SQLite
+into date-partitioned Parquet files, so ad hoc analysis runs off the
+columnar copy instead of the production database
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, Optional
+from app.database.db import inflate
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Columns exported per table; the partition date comes from the timestamp column
+EXPORT_TABLES = {
+    'alerts': {
+        'timestamp': 'created_at',
+        'columns': [
+            'id', 'source', 'content', 'author', 'url', 'sentiment_score', 'sentiment_label',
+            'urgency_level', 'recommended_response', 'created_at', 'status', 'notified'
+        ]
+    },
+    'processed_items': {
+        'timestamp': 'processed_at',
+        'columns': ['id', 'source', 'item_id', 'processed_at', 'sentiment_score', 'sentiment_label', 'sentiment_stage']
+    }
+}
+
+WATERMARK_FILE = '_watermarks.json'
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("Analytics export requires pyarrow (pip install pyarrow)")
+
+def _schema(pa, table: str):
+    """Arrow schema for an exported table"""
+    if table == 'alerts':
+        return pa.schema([
+            ('id', pa.int64()),
+            ('source', pa.string()),
+            ('content', pa.string()),
+            ('author', pa.string()),
+            ('url', pa.string()),
+            ('sentiment_score', pa.float64()),
+            ('sentiment_label', pa.string()),
+            ('urgency_level', pa.string()),
+            ('recommended_response', pa.string()),
+            ('created_at', pa.timestamp('s')),
+            ('status', pa.string()),
+            ('notified', pa.bool_())
+        ])
+    return pa.schema([
+        ('id', pa.int64()),
+        ('source', pa.string()),
+        ('item_id', pa.string()),
+        ('processed_at', pa.timestamp('s')),
+        ('sentiment_score', pa.float64()),
+        ('sentiment_label', pa.string()),
+        ('sentiment_stage', pa.string())
+    ])
+
+class AnalyticsExporter:
+    """
+    Appends rows newer than the last exported id to Parquet files
+
+    Files are laid out as <export_dir>/<table>/date=YYYY-MM-DD/part-<first>-<last>.parquet
+    and the highest exported id per table is kept in <export_dir>/_watermarks.json.
+    Alert rows are snapshots: later status changes are not re-exported.
+    """
+
+    def __init__(self, db_path: str = None, export_dir: str = None, batch_size: int = 50000,
+                 settle_seconds: int = 300):
+        """
+        Args:
+            db_path: SQLite database to read (opened read-only)
+            export_dir: Root directory of the Parquet copy
+            batch_size: Rows read from SQLite per batch
+            settle_seconds: Only export rows at least this old, so per-item
+                sentiment written just after an item is claimed is included
+        """
+        self.db_path = db_path or Config.DATABASE_PATH
+        self.export_dir = export_dir or Config.ANALYTICS_EXPORT_DIR
+        self.batch_size = batch_size
+        self.settle_seconds = settle_seconds
+
+    def _connect(self):
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def load_watermarks(self) -> Dict[str, int]:
+        path = os.path.join(self.export_dir, WATERMARK_FILE)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def save_watermarks(self, watermarks: Dict[str, int]):
+        os.makedirs(self.export_dir, exist_ok=True)
+        path = os.path.join(self.export_dir, WATERMARK_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(watermarks, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def export(self) -> Dict[str, int]:
+        """
+        Export all new rows from every table
+
+        Returns:
+            dict: Number of rows exported per table
+        """
+        pa = _require_pyarrow()
+        watermarks = self.load_watermarks()
+        exported = {}
+
+        conn = self._connect()
+        try:
+            for table, spec in EXPORT_TABLES.items():
+                exported[table] = 0
+                while True:
+                    last_id = watermarks.get(table, 0)
+                    cutoff = conn.execute(
+                        "SELECT datetime('now', ?)", (f'-{self.settle_seconds} seconds',)
+                    ).fetchone()[0]
+                    rows = conn.execute(
+                        f'SELECT {", ".join(spec["columns"])} FROM {table} WHERE id > ? ORDER BY id LIMIT ?',
+                        (last_id, self.batch_size)
+                    ).fetchall()
+
+                    # Stop at the first unsettled row so the watermark never skips past it
+                    for index, row in enumerate(rows):
+                        if str(row[spec['timestamp']])[:19] > cutoff:
+                            rows = rows[:index]
+                            break
+                    if not rows:
+                        break
+
+                    self._write_batch(pa, table, spec, rows)
+                    watermarks[table] = rows[-1]['id']
+                    self.save_watermarks(watermarks)
+                    exported[table] += len(rows)
+        finally:
+            conn.close()
+
+        logger.info(f"Analytics export completed: {exported}")
+        return exported
+
+    def _write_batch(self, pa, table: str, spec: Dict, rows: List[sqlite3.Row]):
+        """Write one batch of rows, split into one file per date partition"""
+        import pyarrow.parquet as pq
+
+        schema = _schema(pa, table)
+        timestamp_column = spec['timestamp']
+        partitions: Dict[str, List[sqlite3.Row]] = {}
+        for row in rows:
+            partitions.setdefault(str(row[timestamp_column])[:10], []).append(row)
+
+        for date, partition_rows in partitions.items():
+            columns = {}
+            for field in schema:
+                values = [row[field.name] for row in partition_rows]
+                if field.name == timestamp_column:
+                    values = [datetime.fromisoformat(value) if value else None for value in values]
+                elif field.name == 'content':
+                    values = [inflate(value) for value in values]
+                elif field.name == 'notified':
+                    values = [bool(value) if value is not None else None for value in values]
+                columns[field.name] = values
+
+            arrow_table = pa.table(columns, schema=schema)
+            directory = os.path.join(self.export_dir, table, f"date={date}")
+            os.makedirs(directory, exist_ok=True)
+            filename = f"part-{partition_rows[0]['id']:012d}-{partition_rows[-1]['id']:012d}.parquet"
+            pq.write_table(arrow_table, os.path.join(directory, filename), compression='zstd')
+
+def load_table(table: str, export_dir: str = None, columns: Optional[List[str]] = None,
+               start_date: str = None, end_date: str = None, source: str = None):
+    """
+    Read an exported table, pruning date partitions outside the range
+
+    Args:
+        table: 'alerts' or 'processed_items'
+        export_dir: Root directory of the Parquet copy
+        columns: Columns to read (all if None)
+        start_date: Inclusive YYYY-MM-DD lower bound
+        end_date: Inclusive YYYY-MM-DD upper bound
+        source: Only rows from this source platform
+
+    Returns:
+        pyarrow.Table
+    """
+    pa = _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    path = os.path.join(export_dir or Config.ANALYTICS_EXPORT_DIR, table)
+    partitioning = ds.partitioning(pa.schema([('date', pa.string())]), flavor='hive')
+    # An explicit schema lets files written before a column was added read it as null
+    schema = _schema(pa, table).append(pa.field('date', pa.string()))
+    dataset = ds.dataset(path, schema=schema, format='parquet', partitioning=partitioning)
+
+    expression = None
+    conditions = []
+    if start_date:
+        conditions.append(ds.field('date') >= start_date)
+    if end_date:
+        conditions.append(ds.field('date') <= end_date)
+    if source:
+        conditions.append(ds.field('source') == source)
+    for condition in conditions:
+        expression = condition if expression is None else expression & condition
+
+    return dataset.to_table(columns=columns, filter=expression)
+
+def sentiment_distribution(table: str = 'processed_items', export_dir: str = None,
+                           start_date: str = None, end_date: str = None):
+    """
+    Sentiment distribution by source and month
+
+    processed_items rows are also split by the stage that scored them, so
+    lexicon pre-filter scores are never averaged with transformer scores.
+
+    Returns:
+        pyarrow.Table with source, month, (sentiment_stage,) sentiment_label,
+        count and mean score
+    """
+    _require_pyarrow()
+    import pyarrow.compute as pc
+
+    keys = ['source', 'month', 'sentiment_label']
+    columns = ['source', 'sentiment_label', 'sentiment_score', 'date']
+    if table == 'processed_items':
+        keys.insert(2, 'sentiment_stage')
+        columns.append('sentiment_stage')
+    data = load_table(table, export_dir, columns=columns, start_date=start_date, end_date=end_date)
+    data = data.append_column('month', pc.utf8_slice_codeunits(data['date'], 0, 7))
+    return data.group_by(keys).aggregate([
+        ('sentiment_score', 'count'),
+        ('sentiment_score', 'mean')
+    ]).sort_by([('month', 'ascending'), ('source', 'ascending')])
+
+def main():
+    parser = argparse.ArgumentParser(description="Export Agent Saad history to Parquet")
+    parser.add_argument('--db', default=Config.DATABASE_PATH, help="SQLite database path")
+    parser.add_argument('--out', default=Config.ANALYTICS_EXPORT_DIR, help="Export directory")
+    parser.add_argument('--report', action='store_true', help="Print sentiment distribution after exporting")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    AnalyticsExporter(args.db, args.out).export()
+
+    if args.report:
+        for row in sentiment_distribution(export_dir=args.out).to_pylist():
+            print(
+                f"{row['month']}  {row['source']:<10} {row['sentiment_stage'] or '-':<8} {row['sentiment_label']:<10} "
+                f"{row['sentiment_score_count']:>8}  {row['sentiment_score_mean'] or 0:+.3f}"
+            )
+
+if __name__ == '__main__':
+    main()
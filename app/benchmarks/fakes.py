@@ -0,0 +1,279 @@
+"""
+Agent Saad - Local Stand-in Upstreams
+Minimal HTTP servers emulating the parts of the Twitter v2, Reddit and
+Slack APIs the agent uses, plus an SMTP sink, for soak testing the real
+stack without network access or credentials
+"""
+
+import base64
+import itertools
+import json
+import random
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+NEGATIVE_TEXTS = [
+    "{kw} has been down for an hour, this is unacceptable and I want a refund",
+    "Worst update ever from {kw}, the app crashes every time I open it",
+    "{kw} charged me twice and support still hasn't answered after three days",
+    "Is {kw} broken for anyone else? Nothing loads and it's so slow",
+]
+POSITIVE_TEXTS = [
+    "Really loving the new {kw} release, great work",
+    "{kw} support sorted my issue in five minutes, thanks!",
+    "Switched to {kw} last month and it has been smooth",
+]
+
+class Traffic:
+    """Shared generator of fake mentions, with counters for the soak report"""
+
+    def __init__(self, items_per_request: int = 10, negative_ratio: float = 0.3, seed: int = 0):
+        self.items_per_request = items_per_request
+        self.negative_ratio = negative_ratio
+        self.random = random.Random(seed)
+        self.ids = itertools.count(10 ** 15)
+        self.counts = {'twitter_items': 0, 'reddit_items': 0, 'slack_messages': 0, 'emails': 0}
+        self._lock = threading.Lock()
+
+    def texts(self, keyword: str, count: int) -> List[str]:
+        with self._lock:
+            return [
+                self.random.choice(
+                    NEGATIVE_TEXTS if self.random.random() < self.negative_ratio else POSITIVE_TEXTS
+                ).format(kw=keyword)
+                for _ in range(count)
+            ]
+
+    def next_id(self) -> int:
+        with self._lock:
+            return next(self.ids)
+
+    def count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.counts[key] += amount
+
+class _Handler(BaseHTTPRequestHandler):
+    traffic: Traffic = None
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload: Dict, status: int = 200, headers: Dict = None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, str(value))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get('Content-Length', 0) or 0))
+
+class TwitterHandler(_Handler):
+    """GET /2/tweets/search/recent"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != '/2/tweets/search/recent':
+            return self._send_json({'title': 'Not Found'}, 404)
+
+        params = parse_qs(url.query)
+        query = params.get('query', [''])[0]
+        keyword = query.split('"')[1] if query.count('"') >= 2 else 'brand'
+        count = min(int(params.get('max_results', [10])[0]), self.traffic.items_per_request)
+        now = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime())
+
+        tweets, users = [], []
+        for text in self.traffic.texts(keyword, count):
+            tweet_id, user_id = self.traffic.next_id(), self.traffic.next_id()
+            tweets.append({
+                'id': str(tweet_id),
+                'text': text,
+                'author_id': str(user_id),
+                'created_at': now,
+                'edit_history_tweet_ids': [str(tweet_id)],
+                'public_metrics': {
+                    'like_count': tweet_id % 150, 'retweet_count': tweet_id % 20,
+                    'reply_count': tweet_id % 7, 'quote_count': 0
+                }
+            })
+            users.append({
+                'id': str(user_id), 'name': f"User {user_id}", 'username': f"user{user_id}",
+                'public_metrics': {'followers_count': user_id % 5000}
+            })
+        self.traffic.count('twitter_items', len(tweets))
+
+        self._send_json(
+            {'data': tweets, 'includes': {'users': users}, 'meta': {'result_count': len(tweets)}},
+            headers={
+                'x-rate-limit-limit': 450,
+                'x-rate-limit-remaining': 449,
+                'x-rate-limit-reset': int(time.time()) + 900
+            }
+        )
+
+class RedditHandler(_Handler):
+    """POST /api/v1/access_token and GET .../search"""
+
+    RATE_HEADERS = {'x-ratelimit-used': 1, 'x-ratelimit-remaining': 599, 'x-ratelimit-reset': 600}
+
+    def do_POST(self):
+        self._read_body()
+        if urlparse(self.path).path == '/api/v1/access_token':
+            return self._send_json({
+                'access_token': 'soak-token', 'token_type': 'bearer', 'expires_in': 86400, 'scope': '*'
+            })
+        self._send_json({'error': 404}, 404)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if not url.path.rstrip('/').endswith('/search'):
+            return self._send_json({'error': 404}, 404)
+
+        params = parse_qs(url.query)
+        keyword = params.get('q', ['brand'])[0]
+        count = min(int(params.get('limit', [10])[0]), self.traffic.items_per_request)
+
+        children = []
+        for text in self.traffic.texts(keyword, count):
+            post_id = base36(self.traffic.next_id())
+            children.append({'kind': 't3', 'data': {
+                'id': post_id,
+                'name': f"t3_{post_id}",
+                'title': text,
+                'selftext': '',
+                'author': f"redditor{post_id}",
+                'created_utc': time.time(),
+                'permalink': f"/r/soak/comments/{post_id}/",
+                'score': len(post_id) * 7,
+                'num_comments': 3,
+                'subreddit': 'soak',
+                'subreddit_subscribers': 25000
+            }})
+        self.traffic.count('reddit_items', len(children))
+
+        self._send_json(
+            {'kind': 'Listing', 'data': {'children': children, 'after': None, 'before': None}},
+            headers=self.RATE_HEADERS
+        )
+
+class SlackHandler(_Handler):
+    """POST /api/chat.postMessage"""
+
+    def do_POST(self):
+        self._read_body()
+        if urlparse(self.path).path.endswith('/chat.postMessage'):
+            self.traffic.count('slack_messages')
+            return self._send_json({'ok': True, 'channel': 'C0SOAK', 'ts': f"{time.time():.6f}"})
+        self._send_json({'ok': False, 'error': 'unknown_method'})
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Accepts any login and message and discards it (no STARTTLS: set SMTP_STARTTLS=False)"""
+
+    traffic: Traffic = None
+
+    def reply(self, line: str):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply('220 soak-smtp ready')
+        in_data = False
+        for raw in self.rfile:
+            line = raw.decode('utf-8', 'replace').rstrip('\r\n')
+            if in_data:
+                if line == '.':
+                    in_data = False
+                    self.traffic.count('emails')
+                    self.reply('250 OK queued')
+                continue
+
+            command = line.split(' ', 1)[0].upper()
+            if command == 'EHLO':
+                self.reply('250-soak-smtp')
+                self.reply('250 AUTH PLAIN LOGIN')
+            elif command == 'HELO':
+                self.reply('250 soak-smtp')
+            elif command == 'AUTH':
+                self._auth(line)
+            elif command == 'DATA':
+                in_data = True
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+    def _auth(self, line: str):
+        parts = line.split()
+        if len(parts) >= 2 and parts[1].upper() == 'LOGIN':
+            self.reply(f"334 {base64.b64encode(b'Username:').decode()}")
+            self.rfile.readline()
+            self.reply(f"334 {base64.b64encode(b'Password:').decode()}")
+            self.rfile.readline()
+        elif len(parts) == 2:
+            self.reply('334 ')
+            self.rfile.readline()
+        self.reply('235 Authentication successful')
+
+class _ThreadingTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+def base36(number: int) -> str:
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    out = ''
+    while number:
+        number, remainder = divmod(number, 36)
+        out = digits[remainder] + out
+    return out or '0'
+
+class FakeUpstreams:
+    """Starts all stand-ins on free localhost ports, each in a daemon thread"""
+
+    def __init__(self, traffic: Traffic):
+        self.traffic = traffic
+        self.servers = {}
+
+    def start(self) -> Dict[str, str]:
+        """
+        Returns:
+            dict: Environment variables pointing the agent at the stand-ins
+        """
+        for name, handler in (('twitter', TwitterHandler), ('reddit', RedditHandler), ('slack', SlackHandler)):
+            bound = type(handler.__name__, (handler,), {'traffic': self.traffic})
+            self.servers[name] = ThreadingHTTPServer(('127.0.0.1', 0), bound)
+        self.servers['smtp'] = _ThreadingTCPServer(
+            ('127.0.0.1', 0), type('SMTPSink', (SMTPSinkHandler,), {'traffic': self.traffic})
+        )
+        for name, server in self.servers.items():
+            threading.Thread(target=server.serve_forever, name=f"fake-{name}", daemon=True).start()
+
+        port = {name: server.server_address[1] for name, server in self.servers.items()}
+        return {
+            'TWITTER_BEARER_TOKEN': 'soak-bearer-token',
+            'TWITTER_API_BASE_URL': f"http://127.0.0.1:{port['twitter']}",
+            'REDDIT_CLIENT_ID': 'soak-client',
+            'REDDIT_CLIENT_SECRET': 'soak-secret',
+            'REDDIT_API_BASE_URL': f"http://127.0.0.1:{port['reddit']}",
+            'SLACK_BOT_TOKEN': 'xoxb-soak',
+            'SLACK_API_BASE_URL': f"http://127.0.0.1:{port['slack']}/api/",
+            'SMTP_SERVER': '127.0.0.1',
+            'SMTP_PORT': str(port['smtp']),
+            'SMTP_STARTTLS': 'False',
+            'SMTP_USERNAME': 'soak@example.com',
+            'SMTP_PASSWORD': 'soak',
+            'ALERT_EMAIL_TO': 'oncall@example.com'
+        }
+
+    def stop(self):
+        for server in self.servers.values():
+            server.shutdown()
+            server.server_close()
@@ -0,0 +1,149 @@
+"""
+Agent Saad - Lexicon Pre-filter Evaluation
+Scores a sample of mentions with both the lexicon and the transformer and
+reports, per margin, how many alert-worthy items the pre-filter would have
+dropped and how much model CPU time it would have saved
+
+    python -m app.benchmarks.prefilter mentions.csv [--column text]
+                                                    [--label-column label --negative-label negative]
+                                                    [--margins -0.1,0,0.05,0.1,0.2]
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from typing import Iterable, List, Optional, Tuple
+
+DEFAULT_MARGINS = '-0.2,-0.1,0,0.05,0.1,0.2,0.3,0.5'
+
+def load_texts(path: str, column: str, label_column: Optional[str] = None,
+               negative_labels: Iterable[str] = ()) -> Tuple[List[str], Optional[List[bool]]]:
+    """
+    Read texts (and optional human labels) from .txt (one per line), .csv or .jsonl
+
+    Args:
+        path: Sample file
+        column: Text column/field for .csv and .jsonl
+        label_column: Column with human labels
+        negative_labels: Label values (case-insensitive) that mark an item negative
+
+    Returns:
+        tuple: (texts, labels) where labels[i] is True for a negative item,
+        or None without a label column
+    """
+    rows = []
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+    elif path.endswith('.jsonl'):
+        with open(path, encoding='utf-8') as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    else:
+        with open(path, encoding='utf-8') as f:
+            rows = [{column: line.rstrip('\n')} for line in f if line.strip()]
+
+    texts = [str(row.get(column) or '') for row in rows]
+    labels = None
+    if label_column:
+        negative = {label.strip().lower() for label in negative_labels}
+        labels = [str(row.get(label_column, '')).strip().lower() in negative for row in rows]
+    return texts, labels
+
+def evaluate(texts: List[str], margins: List[float], labels: Optional[List[bool]] = None) -> Tuple[List[dict], dict]:
+    """
+    Run both stages over texts and simulate the cascade at each margin
+
+    An item counts as alert-worthy when the transformer scores it at or
+    below SENTIMENT_THRESHOLD (or, with labels, when it is labelled
+    negative). Model cost per item is apportioned by text length, since
+    batched inference cannot be timed per item.
+
+    Returns:
+        tuple: (one dict per margin with escalated share, recall, missed
+        items and cascade CPU seconds; totals for the whole sample)
+    """
+    from config import Config
+    from app.models.lexicon import LexiconScorer
+    from app.models.sentiment import SentimentAnalyzer
+
+    scorer = LexiconScorer(Config.SENTIMENT_PREFILTER_LEXICON or None)
+    cpu_start = time.process_time()
+    lexicon_scores = scorer.score_batch(texts)
+    lexicon_cpu = time.process_time() - cpu_start
+
+    analyzer = SentimentAnalyzer()
+    analyzer.analyze_batch(texts[:8])  # warm-up
+    cpu_start = time.process_time()
+    model_results = analyzer.analyze_batch(texts)
+    model_cpu = time.process_time() - cpu_start
+
+    if labels is None:
+        labels = [result['normalized_score'] <= Config.SENTIMENT_THRESHOLD for result in model_results]
+    negatives = sum(labels)
+    lengths = [max(len(text), 1) for text in texts]
+    total_length = sum(lengths)
+
+    report = []
+    for margin in margins:
+        cutoff = max(margin, Config.SENTIMENT_THRESHOLD)
+        escalated = [score <= cutoff for score in lexicon_scores]
+        missed = sum(1 for negative, kept in zip(labels, escalated) if negative and not kept)
+        cascade_cpu = lexicon_cpu + model_cpu * sum(
+            length for length, kept in zip(lengths, escalated) if kept
+        ) / total_length
+        report.append({
+            'margin': margin,
+            'escalated': sum(escalated) / len(texts),
+            'recall': (negatives - missed) / negatives if negatives else 1.0,
+            'missed': missed,
+            'cpu_seconds': cascade_cpu,
+            'cpu_saved': 1 - cascade_cpu / model_cpu if model_cpu else 0.0
+        })
+    return report, {'items': len(texts), 'negatives': negatives, 'lexicon_cpu': lexicon_cpu, 'model_cpu': model_cpu}
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate the lexicon sentiment pre-filter against the model")
+    parser.add_argument('path', help="Sample of mentions: .txt (one per line), .csv or .jsonl")
+    parser.add_argument('--column', default='text', help="Text column/field for .csv and .jsonl")
+    parser.add_argument('--label-column', help="Column with human labels; defaults to the model's verdict")
+    parser.add_argument('--negative-label', action='append', default=[],
+                        help="Label value marking a negative item (case-insensitive, repeatable); "
+                             "required with --label-column")
+    parser.add_argument('--margins', default=DEFAULT_MARGINS, help="Comma-separated margins to simulate")
+    parser.add_argument('--limit', type=int, help="Only use the first N texts")
+    args = parser.parse_args()
+
+    # Run from the project root so `app` and `config` are importable
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.insert(0, root)
+
+    if args.label_column and not args.negative_label:
+        parser.error("--label-column needs --negative-label (the value(s) that mean negative)")
+    if args.negative_label and not args.label_column:
+        parser.error("--negative-label needs --label-column")
+
+    texts, labels = load_texts(args.path, args.column, args.label_column, args.negative_label)
+    if args.limit:
+        texts = texts[:args.limit]
+        labels = labels[:args.limit] if labels else None
+    if not texts:
+        parser.error(f"No texts found in {args.path}")
+
+    margins = [float(value) for value in args.margins.split(',')]
+    report, totals = evaluate(texts, margins, labels)
+
+    reference = 'labelled' if labels else 'model-flagged'
+    print(f"\n{totals['items']} items, {totals['negatives']} {reference} negative")
+    print(f"CPU: lexicon {totals['lexicon_cpu']:.3f}s, transformer {totals['model_cpu']:.3f}s\n")
+    print(f"{'margin':>7}  {'escalated':>9}  {'recall':>7}  {'missed':>6}  {'cpu':>8}  {'saved':>6}")
+    for row in report:
+        print(
+            f"{row['margin']:>7.2f}  {row['escalated']:>9.1%}  {row['recall']:>7.1%}  "
+            f"{row['missed']:>6}  {row['cpu_seconds']:>7.2f}s  {row['cpu_saved']:>6.1%}"
+        )
+
+if __name__ == '__main__':
+    main()
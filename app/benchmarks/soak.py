@@ -0,0 +1,336 @@
+"""
+Agent Saad - Soak Test Harness
+Runs the real run.py stack for hours against local stand-in upstreams
+(app.benchmarks.fakes), driving monitoring cycles and dashboard traffic
+while sampling RSS, open file descriptors, SQLite size and latency.
+Growth trends are flagged at the end and the exit status is 1 if any
+metric keeps climbing.
+
+    python -m app.benchmarks.soak --duration 6h --cycle-interval 30 --items 20
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from typing import Dict, List, Tuple
+from app.benchmarks.fakes import FakeUpstreams, Traffic
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Read-only dashboard requests mixed into the load
+DASHBOARD_PATHS = [
+    '/api/alerts?limit=50',
+    '/api/alerts?limit=50&urgency=CRITICAL,HIGH',
+    '/api/stats',
+    '/api/alerts/search?q=crash',
+    '/api/incidents',
+    '/'
+]
+
+# Metrics checked for sustained growth; the database is judged per stored item
+# because it is supposed to grow with the data
+TREND_METRICS = ['rss_kb', 'open_fds', 'wal_bytes', 'db_bytes_per_item', 'cycle_seconds', 'request_p95_ms']
+
+def parse_duration(value: str) -> float:
+    """'90', '90s', '15m' or '6h' to seconds"""
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    if value[-1:] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+def process_tree(root_pid: int) -> List[int]:
+    """root_pid and all of its descendants (gunicorn workers, scheduler process)"""
+    children: Dict[int, List[int]] = {}
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name may contain spaces; fields after it are fixed
+                parent = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children.setdefault(parent, []).append(int(entry))
+
+    pids, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending.extend(children.get(pid, []))
+    return pids
+
+def process_resources(pids: List[int]) -> Tuple[int, int]:
+    """Summed RSS (kB) and open file descriptors of the given processes"""
+    rss_kb, fds = 0, 0
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        rss_kb += int(line.split()[1])
+                        break
+            fds += len(os.listdir(f"/proc/{pid}/fd"))
+        except OSError:
+            continue  # exited between listing and reading
+    return rss_kb, fds
+
+def detect_trend(points: List[Tuple[float, float]], min_growth: float, min_correlation: float) -> Dict:
+    """
+    Least-squares trend of (seconds, value) samples
+
+    A metric is flagged when it rises steadily (Pearson r >= min_correlation)
+    and the fitted line grows by at least min_growth (a fraction) over the
+    analysed window. Noisy or flat series are not flagged.
+    """
+    if len(points) < 3:
+        return {'flagged': False, 'reason': 'not enough samples'}
+
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    syy = sum((y - mean_y) ** 2 for y in ys)
+    sxy = sum((x - mean_x) * (y - mean_y) for x, y in points)
+    if sxx == 0 or syy == 0:
+        return {'flagged': False, 'slope_per_hour': 0.0, 'growth': 0.0, 'r': 0.0}
+
+    slope = sxy / sxx
+    r = sxy / (sxx * syy) ** 0.5
+    start = mean_y + slope * (xs[0] - mean_x)
+    growth = slope * (xs[-1] - xs[0]) / abs(start) if start else float('inf')
+    return {
+        'flagged': r >= min_correlation and growth >= min_growth,
+        'slope_per_hour': slope * 3600,
+        'growth': growth,
+        'r': r
+    }
+
+class SoakRun:
+    """One soak run: fake upstreams, the agent process, load drivers and the sampler"""
+
+    def __init__(self, args):
+        self.args = args
+        self.traffic = Traffic(args.items, args.negative_ratio, args.seed)
+        self.upstreams = FakeUpstreams(self.traffic)
+        self.workdir = tempfile.mkdtemp(prefix='agent-saad-soak-')
+        self.db_path = os.path.join(self.workdir, 'soak.db')
+        self.port = args.port
+        self.base_url = f"http://127.0.0.1:{self.port}"
+        self.process = None
+        self.stop = threading.Event()
+        self.samples: List[Dict] = []
+        self.cycle_seconds: List[float] = []
+        self.request_ms: List[float] = []
+        self.errors = {'cycles': 0, 'requests': 0}
+        self._lock = threading.Lock()
+
+    def _request(self, path: str, data: Dict = None, timeout: float = 60) -> Dict:
+        body = json.dumps(data).encode() if data is not None else None
+        request = urllib.request.Request(
+            self.base_url + path, data=body, headers={'Content-Type': 'application/json'}
+        )
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            content = response.read()
+            if response.headers.get_content_type() == 'application/json':
+                return json.loads(content)
+            return {}
+
+    def start_agent(self):
+        env = dict(os.environ)
+        env.update(self.upstreams.start())
+        env.update({
+            'DATABASE_PATH': self.db_path,
+            'FLASK_PORT': str(self.port),
+            'FLASK_DEBUG': 'False',
+            'KEYWORDS': self.args.keywords,
+            # Cycles are driven through the API so each one can be timed
+            'CHECK_INTERVAL_MINUTES': '1440',
+            'SERVER_MODE': 'production' if self.args.production else 'development'
+        })
+        log = open(os.path.join(self.workdir, 'agent.log'), 'w')
+        self.process = subprocess.Popen(
+            [sys.executable, 'run.py'], cwd=PROJECT_ROOT, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+        log.close()
+
+        deadline = time.monotonic() + self.args.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Agent exited during startup, see {self.workdir}/agent.log")
+            try:
+                self._request('/health', timeout=5)
+                logger.info(f"Agent up (pid {self.process.pid}), working directory {self.workdir}")
+                return
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.5)
+        raise TimeoutError(f"Agent did not answer /health within {self.args.startup_timeout}s")
+
+    def drive_cycles(self):
+        """Trigger a monitoring cycle every cycle_interval seconds and time it"""
+        while not self.stop.is_set():
+            started = time.monotonic()
+            try:
+                job = self._request('/api/monitor/run', data={})['job']
+                while job['status'] in ('queued', 'running') and not self.stop.is_set():
+                    time.sleep(0.2)
+                    job = self._request(f"/api/monitor/jobs/{job['id']}")['job']
+                if job['status'] == 'completed':
+                    duration = (
+                        datetime.fromisoformat(job['finished_at']) - datetime.fromisoformat(job['started_at'])
+                    ).total_seconds()
+                    with self._lock:
+                        self.cycle_seconds.append(duration)
+                elif job['status'] == 'failed':
+                    with self._lock:
+                        self.errors['cycles'] += 1
+            except Exception as e:
+                logger.warning(f"Cycle request failed: {e}")
+                with self._lock:
+                    self.errors['cycles'] += 1
+            self.stop.wait(max(0.0, self.args.cycle_interval - (time.monotonic() - started)))
+
+    def drive_requests(self):
+        """Issue dashboard reads at roughly request_rate per second"""
+        rng = random.Random(self.args.seed)
+        while not self.stop.is_set():
+            started = time.monotonic()
+            try:
+                self._request(rng.choice(DASHBOARD_PATHS))
+                with self._lock:
+                    self.request_ms.append((time.monotonic() - started) * 1000)
+            except Exception:
+                with self._lock:
+                    self.errors['requests'] += 1
+            self.stop.wait(rng.expovariate(self.args.request_rate))
+
+    def sample(self, elapsed: float) -> Dict:
+        rss_kb, fds = process_resources(process_tree(self.process.pid))
+        sizes = {
+            suffix: os.path.getsize(self.db_path + suffix) if os.path.exists(self.db_path + suffix) else 0
+            for suffix in ('', '-wal', '-shm')
+        }
+        with self._lock:
+            cycles, self.cycle_seconds = self.cycle_seconds, []
+            requests, self.request_ms = self.request_ms, []
+            errors = dict(self.errors)
+        items = self.traffic.counts['twitter_items'] + self.traffic.counts['reddit_items']
+
+        row = {
+            'elapsed_s': round(elapsed, 1),
+            'rss_kb': rss_kb,
+            'open_fds': fds,
+            'db_bytes': sum(sizes.values()),
+            'wal_bytes': sizes['-wal'],
+            'db_bytes_per_item': round(sum(sizes.values()) / items, 1) if items else 0,
+            'cycle_seconds': round(statistics.median(cycles), 3) if cycles else None,
+            'request_p95_ms': round(sorted(requests)[int(len(requests) * 0.95)], 1) if requests else None,
+            'cycles': len(cycles),
+            'requests': len(requests),
+            'cycle_errors': errors['cycles'],
+            'request_errors': errors['requests'],
+            **self.traffic.counts
+        }
+        self.samples.append(row)
+        return row
+
+    def run(self) -> bool:
+        """Run the soak; returns True if no growth trend was flagged"""
+        self.start_agent()
+        threads = [threading.Thread(target=self.drive_cycles, daemon=True)]
+        if self.args.request_rate > 0:
+            threads.append(threading.Thread(target=self.drive_requests, daemon=True))
+        for thread in threads:
+            thread.start()
+
+        started = time.monotonic()
+        output = open(self.args.out, 'w', newline='')
+        writer = None
+        try:
+            while time.monotonic() - started < self.args.duration:
+                self.stop.wait(self.args.sample_interval)
+                if self.process.poll() is not None:
+                    raise RuntimeError(f"Agent exited with {self.process.returncode}, see {self.workdir}/agent.log")
+                row = self.sample(time.monotonic() - started)
+                if writer is None:
+                    writer = csv.DictWriter(output, fieldnames=list(row))
+                    writer.writeheader()
+                writer.writerow(row)
+                output.flush()
+                logger.info(
+                    f"{row['elapsed_s'] / 60:7.1f} min  rss {row['rss_kb'] / 1024:7.1f} MB  fds {row['open_fds']:4}  "
+                    f"db {row['db_bytes'] / 1e6:7.2f} MB  wal {row['wal_bytes'] / 1e6:6.2f} MB  "
+                    f"cycle {row['cycle_seconds']}s  p95 {row['request_p95_ms']}ms"
+                )
+        finally:
+            self.stop.set()
+            output.close()
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+            self.upstreams.stop()
+
+        return self.report()
+
+    def report(self) -> bool:
+        # Startup, imports and cache warm-up dominate the first samples
+        warm = self.samples[int(len(self.samples) * self.args.warmup):]
+        print(f"\nSoak summary ({len(self.samples)} samples, trends over the last {len(warm)}):")
+        print(f"  upstream traffic: {self.traffic.counts}")
+        print(f"  errors: {self.errors}")
+
+        healthy = True
+        for metric in TREND_METRICS:
+            points = [(row['elapsed_s'], row[metric]) for row in warm if row[metric] is not None]
+            trend = detect_trend(points, self.args.growth_threshold, self.args.min_correlation)
+            if 'slope_per_hour' not in trend:
+                print(f"  {metric:<18} {trend['reason']}")
+                continue
+            status = 'GROWING' if trend['flagged'] else 'ok'
+            healthy = healthy and not trend['flagged']
+            print(
+                f"  {metric:<18} {status:<8} {trend['slope_per_hour']:+12.2f}/h  "
+                f"growth {trend['growth']:+7.1%}  r={trend['r']:+.2f}"
+            )
+        print(f"\nSamples written to {self.args.out}; agent log in {self.workdir}/agent.log")
+        return healthy
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-test Agent Saad against local stand-in upstreams")
+    parser.add_argument('--duration', type=parse_duration, default=parse_duration('1h'), help="e.g. 90m, 6h")
+    parser.add_argument('--cycle-interval', type=float, default=30, help="Seconds between monitoring cycles")
+    parser.add_argument('--items', type=int, default=20, help="Mentions returned per upstream search")
+    parser.add_argument('--negative-ratio', type=float, default=0.3, help="Share of negative mentions")
+    parser.add_argument('--request-rate', type=float, default=2, help="Dashboard requests per second (0 to disable)")
+    parser.add_argument('--keywords', default='acme,acme app,acme support')
+    parser.add_argument('--sample-interval', type=float, default=60, help="Seconds between samples")
+    parser.add_argument('--warmup', type=float, default=0.1, help="Fraction of samples ignored for trends")
+    parser.add_argument('--growth-threshold', type=float, default=0.1, help="Flag growth above this fraction")
+    parser.add_argument('--min-correlation', type=float, default=0.7, help="Flag only steady trends (Pearson r)")
+    parser.add_argument('--production', action='store_true', help="Run the gunicorn production server")
+    parser.add_argument('--port', type=int, default=5057)
+    parser.add_argument('--startup-timeout', type=float, default=600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='soak.csv', help="CSV file for samples")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    sys.exit(0 if SoakRun(args).run() else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Agent Saad - Startup Benchmark
+Measures what importing the app costs (python -X importtime) and how long
+a fresh server takes to answer its first request, and its first request
+that needs the sentiment model
+
+    python -m app.benchmarks.startup [--module app.main] [--top 15]
+"""
+
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List, Tuple
+
+def measure_importtime(module: str) -> Tuple[float, List[Tuple[int, str]]]:
+    """
+    Import a module in a fresh interpreter with -X importtime
+
+    Returns:
+        tuple: (wall seconds, [(cumulative microseconds, top-level package), ...])
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    packages: Dict[str, int] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue  # the header line
+        # Only top-level imports: nested ones are already in their parent's cumulative time
+        if not name.startswith('  '):
+            package = name.strip().split('.')[0]
+            packages[package] = packages.get(package, 0) + int(cumulative)
+
+    ranked = sorted(((us, package) for package, us in packages.items()), reverse=True)
+    return wall, ranked
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _wait_for(url: str, started: float, timeout: float, data: bytes = None) -> float:
+    """Retry a request until it succeeds, returning seconds since started"""
+    while time.perf_counter() - started < timeout:
+        request = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                response.read()
+                return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.05)
+    raise TimeoutError(f"No response from {url} within {timeout}s")
+
+def measure_first_request(timeout: float = 300) -> Dict[str, float]:
+    """
+    Start the development server in a fresh process and time its first responses
+
+    Returns:
+        dict: seconds from process start to the first /health response and
+        to the first /api/test/sentiment response (which builds the model)
+    """
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, '-c', f"from app.main import app; app.run(host='127.0.0.1', port={port})"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        base = f"http://127.0.0.1:{port}"
+        health = _wait_for(f"{base}/health", started, timeout)
+        request_started = time.perf_counter()
+        _wait_for(
+            f"{base}/api/test/sentiment", request_started, timeout,
+            data=json.dumps({'text': "The app keeps crashing since the update"}).encode()
+        )
+        return {
+            'first_request': health,
+            'first_sentiment_request': time.perf_counter() - started
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Agent Saad import and startup time")
+    parser.add_argument('--module', action='append', help="Module to import (default: app.main and app.agent)")
+    parser.add_argument('--top', type=int, default=15, help="Slowest top-level imports to list")
+    parser.add_argument('--skip-server', action='store_true', help="Only measure imports")
+    args = parser.parse_args()
+
+    # Run from the project root so `app` and `config` are importable in the children
+    os.chdir(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+    for module in args.module or ['app.main', 'app.agent']:
+        wall, ranked = measure_importtime(module)
+        print(f"\nimport {module}: {wall:.2f}s wall")
+        for us, package in ranked[:args.top]:
+            print(f"  {us / 1000:>9.1f} ms  {package}")
+
+    if not args.skip_server:
+        timings = measure_first_request()
+        print(f"\ntime to first request:            {timings['first_request']:.2f}s")
+        print(f"time to first sentiment request:  {timings['first_sentiment_request']:.2f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Agent Saad - Dashboard Response Cache
+Read-through cache for dashboard API payloads, invalidated by the data
+version the database bumps on every alert write
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable
+
+class ResponseCache:
+    """
+    LRU cache of computed responses tagged with the data version they were built at
+
+    The version lives in the database, so a write through any web worker or
+    the scheduler process invalidates every worker's cache on its next read.
+    Entries also expire after max_age seconds, for responses that depend on
+    the clock (e.g. "alerts in the last 24 hours").
+    """
+
+    def __init__(self, max_entries: int = 256, max_age: float = 30):
+        """
+        Args:
+            max_entries: Number of responses kept (0 disables caching)
+            max_age: Seconds an entry may be served without a write happening
+        """
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, version: int, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key if it was computed at this version
+
+        Args:
+            key: Endpoint and normalized query parameters
+            version: Current data version from the database
+            compute: Builds the value on a miss
+
+        Returns:
+            The cached or freshly computed value
+        """
+        if self.max_entries <= 0:
+            return compute()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] == version and now - entry[1] < self.max_age:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        # Concurrent misses may compute twice; both results are equally fresh
+        value = compute()
+        with self._lock:
+            self.entries[key] = (version, now, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def get_status(self) -> dict:
+        with self._lock:
+            return {'entries': len(self.entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,124 @@
+"""
+Agent Saad - Component Registry
+One shared set of components (database, model, monitors, alerters) for the
+web app and the agent, each built on first use so that importing a module
+never pays for transformers/torch, tweepy, praw or slack_sdk up front
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class ComponentRegistry:
+    """
+    Lazily built, process-wide singletons looked up by name
+
+    Factories import their heavy libraries inside the factory body. Each
+    component has its own build lock, so a slow model load never blocks
+    requests that only need the database.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._build_seconds: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]):
+        """Register (or replace) the factory for a component"""
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+            self._instances.pop(name, None)
+
+    def get(self, name: str) -> Any:
+        """Return the component, building it on first use"""
+        try:
+            return self._instances[name]
+        except KeyError:
+            pass
+        if name not in self._factories:
+            raise KeyError(f"Unknown component '{name}'")
+
+        with self._locks[name]:
+            if name not in self._instances:
+                start = time.perf_counter()
+                self._instances[name] = self._factories[name]()
+                self._build_seconds[name] = time.perf_counter() - start
+                logger.info(f"Built component '{name}' in {self._build_seconds[name]:.2f}s")
+        return self._instances[name]
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError as e:
+            raise AttributeError(str(e)) from None
+
+    def preload(self, names: List[str] = None):
+        """Build components ahead of time (e.g. in a server master before forking)"""
+        for name in names or list(self._factories):
+            self.get(name)
+
+    def get_status(self) -> Dict:
+        return {
+            name: {
+                'built': name in self._instances,
+                'build_seconds': round(self._build_seconds[name], 3) if name in self._build_seconds else None
+            }
+            for name in self._factories
+        }
+
+def _build_db():
+    from app.database.db import Database
+    return Database(Config.DATABASE_PATH)
+
+def _build_sentiment_analyzer():
+    from app.models.sentiment import SentimentAnalyzer
+    return SentimentAnalyzer()
+
+def _build_twitter_monitor():
+    from app.monitors.twitter_monitor import TwitterMonitor
+    return TwitterMonitor()
+
+def _build_reddit_monitor():
+    from app.monitors.reddit_monitor import RedditMonitor
+    return RedditMonitor()
+
+def _build_slack_alerter():
+    from app.alerts.slack_alert import SlackAlerter
+    return SlackAlerter()
+
+def _build_email_alerter():
+    from app.alerts.email_alert import EmailAlerter
+    return EmailAlerter()
+
+def _build_lexicon_scorer():
+    """Cheap first-stage sentiment scorer; None when the pre-filter is disabled"""
+    if not Config.SENTIMENT_PREFILTER:
+        return None
+    from app.models.lexicon import LexiconScorer
+    return LexiconScorer(Config.SENTIMENT_PREFILTER_LEXICON or None)
+
+def _build_incident_index():
+    """Groups similar alerts into incidents; None when grouping is disabled"""
+    if not Config.INCIDENT_GROUPING:
+        return None
+    from app.incidents import IncidentIndex
+    return IncidentIndex(components.db)
+
+components = ComponentRegistry()
+components.register('db', _build_db)
+components.register('sentiment_analyzer', _build_sentiment_analyzer)
+components.register('twitter_monitor', _build_twitter_monitor)
+components.register('reddit_monitor', _build_reddit_monitor)
+components.register('slack_alerter', _build_slack_alerter)
+components.register('email_alerter', _build_email_alerter)
+components.register('incident_index', _build_incident_index)
+components.register('lexicon_scorer', _build_lexicon_scorer)
@@ -1,8 +1,53 @@
+import atexit
+import os
 import sqlite3
 import json
+import html
+import time
+import uuid
 from datetime import datetime
-from typing import List, Dict, Optional
+from concurrent.futures import Future
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
 import threading
+import logging
+import zlib
+from app.database.writer import DatabaseWriter
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Lower rank is more urgent
+URGENCY_RANK = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
+
+def compress_content(text: str):
+    """zlib-compress alert content at or above ALERT_CONTENT_COMPRESS_MIN_BYTES (0 disables)"""
+    threshold = Config.ALERT_CONTENT_COMPRESS_MIN_BYTES
+    if not threshold or text is None:
+        return text
+    encoded = text.encode('utf-8')
+    if len(encoded) < threshold:
+        return text
+    compressed = zlib.compress(encoded, 6)
+    return compressed if len(compressed) < len(encoded) else text
+
+def inflate(value):
+    """Alert content as text, whether stored plain (TEXT) or compressed (BLOB)"""
+    if isinstance(value, bytes):
+        return zlib.decompress(value).decode('utf-8')
+    return value
+
+def content_preview(value, length: int) -> str:
+    """First length characters of alert content, with an ellipsis if cut"""
+    text = inflate(value) or ''
+    if len(text) <= length:
+        return text
+    return text[:length].rstrip() + '…'
+
+# Columns of the alert list projection; the full record comes from get_alert
+ALERT_LIST_COLUMNS = [
+    'id', 'source', 'author', 'url', 'sentiment_score', 'sentiment_label', 'urgency_level',
+    'created_at', 'status', 'notified', 'version', 'incident_id'
+]
 
 class Database:
     _instance = None
@@ -15,12 +60,26 @@ class Database:
                     cls._instance = super(Database, cls).__new__(cls)
                     cls._instance.db_path = db_path
                     cls._instance.init_db()
+                    cls._instance.writer = DatabaseWriter(
+                        cls._instance.get_connection,
+                        max_batch=Config.DB_WRITE_BATCH_SIZE,
+                        max_delay=Config.DB_WRITE_BATCH_MS / 1000
+                    )
+                    atexit.register(cls._instance.close)
         return cls._instance
     
+    def close(self):
+        """Flush queued writes (called at exit)"""
+        self.writer.close()
+    
     def get_connection(self):
         """Get a new database connection"""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Wait on the write lock rather than failing when several processes share the file
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
         conn.row_factory = sqlite3.Row
+        # Read compressed content in queries (the schema itself never depends on these)
+        conn.create_function('inflate', 1, inflate, deterministic=True)
+        conn.create_function('content_preview', 2, content_preview, deterministic=True)
         return conn
     
     def init_db(self):
@@ -28,6 +87,9 @@ class Database:
         conn = self.get_connection()
         cursor = conn.cursor()
         
+        # WAL lets readers proceed while another process writes
+        cursor.execute('PRAGMA journal_mode=WAL')
+        
         # Create alerts table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS alerts (
@@ -57,42 +119,300 @@ class Database:
             )
         ''')
         
+        # Optimistic-concurrency version for alert triage, incident the alert belongs to,
+        # and whether a notification no channel accepted yet is waiting to be retried
+        self._add_missing_columns(cursor, 'alerts', {
+            'version': 'INTEGER NOT NULL DEFAULT 0',
+            'incident_id': 'INTEGER',
+            'notify_pending': 'INTEGER NOT NULL DEFAULT 0'
+        })
+        
+        # Incidents group alerts that describe the same problem
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS incidents (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                lead_alert_id INTEGER NOT NULL,
+                alert_count INTEGER NOT NULL DEFAULT 1,
+                max_urgency TEXT,
+                notified_urgency TEXT,
+                first_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                last_seen_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        
+        # Sentence embeddings used to rebuild the incident index after a restart
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS alert_embeddings (
+                alert_id INTEGER PRIMARY KEY,
+                embedding BLOB NOT NULL
+            )
+        ''')
+        
+        # Per-item sentiment results (for analytics export), added after the initial schema;
+        # the stage is 'lexicon' for items the pre-filter settled, 'model' otherwise
+        self._add_missing_columns(cursor, 'processed_items', {
+            'sentiment_score': 'REAL',
+            'sentiment_label': 'TEXT',
+            'sentiment_stage': 'TEXT'
+        })
+        
+        # Composite indexes backing the filtered/faceted alert list (newest first)
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_created ON alerts (created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_source_created ON alerts (source, created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_urgency_created ON alerts (urgency_level, created_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_status_created ON alerts (status, created_at)')
+        
+        # Create worker and keyword lease tables for sharded (multi-process) monitoring
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY,
+                heartbeat_at REAL NOT NULL,
+                started_at REAL NOT NULL
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_leases (
+                keyword TEXT PRIMARY KEY,
+                worker_id TEXT NOT NULL,
+                acquired_at REAL NOT NULL
+            )
+        ''')
+        
+        # Reddit threads whose comments are scanned, with per-thread high-water marks
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS reddit_threads (
+                submission_id TEXT PRIMARY KEY,
+                watched BOOLEAN NOT NULL DEFAULT 0,
+                first_seen_at REAL NOT NULL,
+                scanned_at REAL,
+                num_comments INTEGER,
+                last_comment_utc REAL
+            )
+        ''')
+        
+        # Monitoring cycle jobs, shared so any process can report on and coalesce with them
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS monitor_jobs (
+                id TEXT PRIMARY KEY,
+                scope TEXT NOT NULL,
+                status TEXT NOT NULL,
+                triggers TEXT NOT NULL,
+                created_at TEXT NOT NULL,
+                started_at TEXT,
+                finished_at TEXT,
+                results TEXT,
+                error TEXT,
+                heartbeat_at REAL NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_monitor_jobs_scope_status ON monitor_jobs (scope, status)')
+        
+        # Adaptive polling state per (keyword, source) and the API calls it made
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS poll_schedule (
+                keyword TEXT NOT NULL,
+                source TEXT NOT NULL,
+                interval REAL NOT NULL,
+                next_due REAL NOT NULL,
+                last_polled REAL,
+                velocity REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (keyword, source)
+            )
+        ''')
+        cursor.execute('CREATE TABLE IF NOT EXISTS poll_calls (called_at REAL NOT NULL)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_poll_calls_called ON poll_calls (called_at)')
+        
+        # Last known API quota per platform endpoint, shared by every process using the credentials
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                source TEXT NOT NULL,
+                endpoint TEXT NOT NULL,
+                remaining INTEGER,
+                quota_limit INTEGER,
+                reset_at REAL,
+                PRIMARY KEY (source, endpoint)
+            )
+        ''')
+        
+        # Liveness of long-running processes (the scheduler), for health checks
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS process_heartbeats (
+                name TEXT PRIMARY KEY,
+                pid INTEGER,
+                heartbeat_at REAL NOT NULL
+            )
+        ''')
+        
+        # Counter bumped on every alert write; keys the dashboard response cache
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('data_version', 0)")
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS alerts_data_version_{event.lower()} AFTER {event} ON alerts BEGIN
+                    UPDATE meta SET value = value + 1 WHERE key = 'data_version';
+                END
+            ''')
+        
+        self.fts_enabled = self._init_fts(cursor)
+        
         conn.commit()
         conn.close()
     
-    def add_alert(self, alert_data: Dict) -> int:
-        """Add a new alert to the database"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def _init_fts(self, cursor) -> bool:
+        """
+        Create the FTS5 index over alert text, kept in sync by triggers
         
+        The index stores its own plain-text copy of each alert, so the
+        triggers need no application functions and any SQLite connection can
+        write to alerts. Plain content is indexed by the triggers; content
+        stored compressed (only ever written by add_alert) is added to the
+        index by add_alert itself.
+        
+        Returns:
+            bool: False if this SQLite build lacks FTS5 (search is then disabled)
+        """
+        existing = cursor.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'alerts_fts'"
+        ).fetchone()
+        
+        # Earlier indexes were external-content tables reading alerts (or the
+        # alerts_text view), whose triggers called inflate()
+        if existing and "content='alerts" in existing['sql']:
+            for trigger in ('alerts_fts_insert', 'alerts_fts_delete', 'alerts_fts_update'):
+                cursor.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+            cursor.execute('DROP TABLE alerts_fts')
+            cursor.execute('DROP VIEW IF EXISTS alerts_text')
+            existing = None
+        
+        try:
+            cursor.execute('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS alerts_fts USING fts5(
+                    content, author, recommended_response
+                )
+            ''')
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable, alert search disabled: {e}")
+            return False
+        
+        # Compressed (BLOB) content cannot be read here; add_alert fills it in and
+        # updates that leave it unchanged keep the indexed text
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS alerts_fts_insert AFTER INSERT ON alerts BEGIN
+                INSERT INTO alerts_fts (rowid, content, author, recommended_response)
+                VALUES (new.id, CASE WHEN typeof(new.content) = 'text' THEN new.content END,
+                        new.author, new.recommended_response);
+            END
+        ''')
         cursor.execute('''
-            INSERT INTO alerts (
-                source, content, author, url, sentiment_score,
-                sentiment_label, urgency_level, recommended_response
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+            CREATE TRIGGER IF NOT EXISTS alerts_fts_delete AFTER DELETE ON alerts BEGIN
+                DELETE FROM alerts_fts WHERE rowid = old.id;
+            END
+        ''')
+        cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS alerts_fts_update
+            AFTER UPDATE OF content, author, recommended_response ON alerts BEGIN
+                UPDATE alerts_fts SET
+                    content = CASE WHEN typeof(new.content) = 'text' THEN new.content
+                                   WHEN new.content IS old.content THEN content END,
+                    author = new.author,
+                    recommended_response = new.recommended_response
+                WHERE rowid = old.id;
+            END
+        ''')
+        
+        # Backfill alerts that existed before the index was created
+        if not existing:
+            cursor.execute('''
+                INSERT INTO alerts_fts (rowid, content, author, recommended_response)
+                SELECT id, inflate(content), author, recommended_response FROM alerts
+            ''')
+            logger.info("Built full-text index for existing alerts")
+        
+        return True
+    
+    def _add_missing_columns(self, cursor, table: str, columns: Dict[str, str]):
+        """Add columns to an existing table if an older database lacks them"""
+        existing = {row['name'] for row in cursor.execute(f'PRAGMA table_info({table})')}
+        for name, column_type in columns.items():
+            if name not in existing:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN {name} {column_type}')
+    
+    def get_data_version(self) -> int:
+        """
+        Version of the alert data, increased by triggers in the same
+        transaction as every insert, update or delete on alerts
+        """
+        conn = self.get_connection()
+        row = conn.execute("SELECT value FROM meta WHERE key = 'data_version'").fetchone()
+        conn.close()
+        return row['value'] if row else 0
+    
+    def add_alert(self, alert_data: Dict) -> int:
+        """Add a new alert to the database"""
+        return self.add_alert_async(alert_data).result()
+    
+    def add_alert_async(self, alert_data: Dict) -> Future:
+        """Queue a new alert; the Future resolves to its id once committed"""
+        content = compress_content(alert_data.get('content'))
+        params = (
             alert_data.get('source'),
-            alert_data.get('content'),
+            content,
             alert_data.get('author'),
             alert_data.get('url'),
             alert_data.get('sentiment_score'),
             alert_data.get('sentiment_label'),
             alert_data.get('urgency_level'),
             alert_data.get('recommended_response')
-        ))
+        )
         
-        alert_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        return alert_id
+        def write(cursor):
+            cursor.execute('''
+                INSERT INTO alerts (
+                    source, content, author, url, sentiment_score,
+                    sentiment_label, urgency_level, recommended_response
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', params)
+            alert_id = cursor.lastrowid
+            # The insert trigger cannot read compressed content
+            if isinstance(content, bytes) and self.fts_enabled:
+                cursor.execute(
+                    'UPDATE alerts_fts SET content = ? WHERE rowid = ?',
+                    (alert_data.get('content'), alert_id)
+                )
+            return alert_id
+        
+        return self.writer.submit(write)
     
-    def mark_as_notified(self, alert_id: int):
-        """Mark an alert as notified"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute('UPDATE alerts SET notified = 1 WHERE id = ?', (alert_id,))
-        conn.commit()
-        conn.close()
+    def mark_as_notified(self, alert_id: int) -> Future:
+        """Mark an alert as notified (queued; wait on the Future to confirm)"""
+        return self.writer.submit(lambda cursor: cursor.execute(
+            'UPDATE alerts SET notified = 1, notify_pending = 0 WHERE id = ?', (alert_id,)
+        ))
+    
+    def defer_notification(self, alert_id: int) -> Future:
+        """Queue an alert's notification for retry (see get_unnotified_alerts)"""
+        return self.writer.submit(lambda cursor: cursor.execute(
+            'UPDATE alerts SET notify_pending = 1 WHERE id = ? AND notified = 0', (alert_id,)
+        ))
+    
+    def claim_notification(self, alert_id: int) -> bool:
+        """
+        Atomically take a deferred notification, so only one process resends it
+        
+        Returns:
+            bool: True if the caller should send it
+        """
+        def write(cursor):
+            cursor.execute('UPDATE alerts SET notify_pending = 0 WHERE id = ? AND notify_pending = 1', (alert_id,))
+            return cursor.rowcount == 1
+        
+        return self.writer.submit(write).result()
     
     def is_processed(self, source: str, item_id: str) -> bool:
         """Check if an item has already been processed"""
@@ -106,61 +426,772 @@ class Database:
         conn.close()
         return result is not None
     
-    def mark_as_processed(self, source: str, item_id: str):
-        """Mark an item as processed"""
+    def mark_as_processed(self, source: str, item_id: str) -> Future:
+        """Mark an item as processed (queued; a no-op if it already is)"""
+        return self.writer.submit(lambda cursor: cursor.execute(
+            'INSERT OR IGNORE INTO processed_items (source, item_id) VALUES (?, ?)',
+            (source, item_id)
+        ))
+    
+    def add_alert_embedding(self, alert_id: int, embedding: bytes) -> Future:
+        """Store an alert's sentence embedding (float32 bytes)"""
+        return self.writer.submit(lambda cursor: cursor.execute(
+            'INSERT OR REPLACE INTO alert_embeddings (alert_id, embedding) VALUES (?, ?)',
+            (alert_id, embedding)
+        ))
+    
+    def get_recent_alert_embeddings(self, hours: float, limit: int) -> List[Dict]:
+        """Embeddings of the newest alerts within the window, oldest first"""
         conn = self.get_connection()
         cursor = conn.cursor()
-        try:
+        cursor.execute('''
+            SELECT alerts.id AS alert_id, alerts.incident_id, alert_embeddings.embedding
+            FROM alerts
+            JOIN alert_embeddings ON alert_embeddings.alert_id = alerts.id
+            WHERE alerts.created_at >= datetime('now', ?)
+            ORDER BY alerts.id DESC
+            LIMIT ?
+        ''', (f'-{hours} hours', limit))
+        rows = cursor.fetchall()
+        conn.close()
+        return [dict(row) for row in reversed(rows)]
+    
+    def create_incident(self, alert_id: int, urgency: str) -> int:
+        """Open a new incident led by the given alert"""
+        def write(cursor):
             cursor.execute(
-                'INSERT INTO processed_items (source, item_id) VALUES (?, ?)',
-                (source, item_id)
+                'INSERT INTO incidents (lead_alert_id, max_urgency) VALUES (?, ?)',
+                (alert_id, urgency)
             )
-            conn.commit()
-        except sqlite3.IntegrityError:
-            pass  # Already processed
-        finally:
-            conn.close()
+            incident_id = cursor.lastrowid
+            cursor.execute('UPDATE alerts SET incident_id = ? WHERE id = ?', (incident_id, alert_id))
+            return incident_id
+        
+        return self.writer.submit(write).result()
+    
+    def attach_to_incident(self, incident_id: int, alert_id: int, urgency: str) -> Future:
+        """Add an alert to an existing incident, escalating its urgency if needed"""
+        def write(cursor):
+            cursor.execute('UPDATE alerts SET incident_id = ? WHERE id = ?', (incident_id, alert_id))
+            row = cursor.execute('SELECT max_urgency FROM incidents WHERE id = ?', (incident_id,)).fetchone()
+            if row and URGENCY_RANK.get(urgency, 99) < URGENCY_RANK.get(row['max_urgency'], 99):
+                cursor.execute('UPDATE incidents SET max_urgency = ? WHERE id = ?', (urgency, incident_id))
+            cursor.execute('''
+                UPDATE incidents
+                SET alert_count = alert_count + 1, last_seen_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+            ''', (incident_id,))
+        
+        return self.writer.submit(write)
+    
+    def get_incident(self, incident_id: int) -> Optional[Dict]:
+        conn = self.get_connection()
+        row = conn.execute('SELECT * FROM incidents WHERE id = ?', (incident_id,)).fetchone()
+        conn.close()
+        return dict(row) if row else None
+    
+    def mark_incident_notified(self, incident_id: int, urgency: str) -> Future:
+        """Record the highest urgency a notification was sent for"""
+        return self.writer.submit(lambda cursor: cursor.execute(
+            'UPDATE incidents SET notified_urgency = ? WHERE id = ?', (urgency, incident_id)
+        ))
     
-    def get_recent_alerts(self, limit: int = 50) -> List[Dict]:
-        """Get recent alerts"""
+    def get_incidents(self, limit: int = 50) -> List[Dict]:
+        """Recent incidents with their lead alert"""
         conn = self.get_connection()
         cursor = conn.cursor()
         cursor.execute('''
-            SELECT * FROM alerts 
-            ORDER BY created_at DESC 
+            SELECT incidents.*, alerts.source, alerts.content, alerts.url, alerts.author
+            FROM incidents
+            JOIN alerts ON alerts.id = incidents.lead_alert_id
+            ORDER BY incidents.last_seen_at DESC
             LIMIT ?
         ''', (limit,))
+        rows = cursor.fetchall()
+        conn.close()
+        return [self._alert_dict(row) for row in rows]
+    
+    def claim_item(self, source: str, item_id: str) -> bool:
+        """
+        Atomically mark an item as processed
+        
+        Returns:
+            bool: True if this caller claimed the item, False if any worker already had
+        """
+        return self.claim_item_async(source, item_id).result()
+    
+    def claim_item_async(self, source: str, item_id: str) -> Future:
+        """Queue a claim_item; claims submitted together share one commit"""
+        def write(cursor):
+            cursor.execute(
+                'INSERT OR IGNORE INTO processed_items (source, item_id) VALUES (?, ?)',
+                (source, item_id)
+            )
+            return cursor.rowcount == 1
+        
+        return self.writer.submit(write)
+    
+    def record_item_sentiment(self, source: str, item_id: str, score: float, label: str,
+                              stage: str = 'model') -> Future:
+        """Store the sentiment result for a processed item and the stage that produced it"""
+        return self.writer.submit(lambda cursor: cursor.execute(
+            'UPDATE processed_items SET sentiment_score = ?, sentiment_label = ?, sentiment_stage = ? '
+            'WHERE source = ? AND item_id = ?',
+            (score, label, stage, source, item_id)
+        ))
+    
+    def track_reddit_threads(self, submission_ids: List[str], watched: bool = False):
+        """Start following the comments of these submissions (no-op for known ones)"""
+        if not submission_ids:
+            return
+        now = time.time()
+        
+        def write(cursor):
+            cursor.executemany(
+                'INSERT OR IGNORE INTO reddit_threads (submission_id, watched, first_seen_at) VALUES (?, ?, ?)',
+                [(submission_id, int(watched), now) for submission_id in submission_ids]
+            )
+            if watched:
+                cursor.executemany(
+                    'UPDATE reddit_threads SET watched = 1 WHERE submission_id = ?',
+                    [(submission_id,) for submission_id in submission_ids]
+                )
         
+        self.writer.submit(write).result()
+    
+    def get_reddit_threads(self, hours: float, limit: int) -> List[Dict]:
+        """
+        Threads due for a comment scan: watched ones plus those first seen in
+        the last hours, least recently scanned first
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('''
+            SELECT submission_id, num_comments, last_comment_utc FROM reddit_threads
+            WHERE watched = 1 OR first_seen_at >= ?
+            ORDER BY scanned_at IS NOT NULL, scanned_at
+            LIMIT ?
+        ''', (time.time() - hours * 3600, limit))
         rows = cursor.fetchall()
         conn.close()
+        return [dict(row) for row in rows]
+    
+    def update_reddit_threads(self, marks: Dict[str, Dict]):
+        """Store the comment count and newest comment time seen per thread"""
+        if not marks:
+            return
+        now = time.time()
+        rows = [
+            (now, mark.get('num_comments'), mark.get('last_comment_utc'), submission_id)
+            for submission_id, mark in marks.items()
+        ]
+        self.writer.submit(lambda cursor: cursor.executemany('''
+            UPDATE reddit_threads SET scanned_at = ?, num_comments = ?, last_comment_utc = ?
+            WHERE submission_id = ?
+        ''', rows)).result()
+    
+    def acquire_keyword_leases(self, worker_id: str, keywords: List[str], ttl: float) -> List[str]:
+        """
+        Heartbeat a worker and rebalance keyword leases across live workers
+        
+        Workers whose heartbeat is older than ttl are considered dead and their
+        leases are freed. Each live worker is entitled to an even share of the
+        keywords; workers above their share release the excess and workers
+        below it claim unowned keywords.
+        
+        Args:
+            worker_id: Unique id of the calling worker
+            keywords: Full keyword set to shard
+            ttl: Seconds after which a silent worker is considered dead
+        
+        Returns:
+            List of keywords currently leased to this worker
+        """
+        now = time.time()
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            
+            cursor.execute('''
+                INSERT INTO workers (worker_id, heartbeat_at, started_at) VALUES (?, ?, ?)
+                ON CONFLICT(worker_id) DO UPDATE SET heartbeat_at = excluded.heartbeat_at
+            ''', (worker_id, now, now))
+            
+            # Expire dead workers and free their leases
+            cursor.execute('DELETE FROM workers WHERE heartbeat_at < ?', (now - ttl,))
+            cursor.execute(
+                'DELETE FROM keyword_leases WHERE worker_id NOT IN (SELECT worker_id FROM workers)'
+            )
+            
+            live_workers = [row['worker_id'] for row in cursor.execute(
+                'SELECT worker_id FROM workers ORDER BY worker_id'
+            )]
+            leases = {row['keyword']: row['worker_id'] for row in cursor.execute(
+                'SELECT keyword, worker_id FROM keyword_leases'
+            )}
+            
+            # Even share, with the remainder going to the lowest worker ids
+            base, extra = divmod(len(keywords), len(live_workers))
+            share = base + (1 if live_workers.index(worker_id) < extra else 0)
+            
+            held = sorted(k for k in keywords if leases.get(k) == worker_id)
+            for keyword in held[share:]:
+                cursor.execute(
+                    'DELETE FROM keyword_leases WHERE keyword = ? AND worker_id = ?',
+                    (keyword, worker_id)
+                )
+            held = held[:share]
+            
+            for keyword in keywords:
+                if len(held) >= share:
+                    break
+                if keyword not in leases:
+                    cursor.execute(
+                        'INSERT INTO keyword_leases (keyword, worker_id, acquired_at) VALUES (?, ?, ?)',
+                        (keyword, worker_id, now)
+                    )
+                    held.append(keyword)
+            
+            conn.commit()
+            return held
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    def release_worker(self, worker_id: str):
+        """Remove a worker and free its keyword leases (clean shutdown)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute('DELETE FROM keyword_leases WHERE worker_id = ?', (worker_id,))
+        cursor.execute('DELETE FROM workers WHERE worker_id = ?', (worker_id,))
+        conn.commit()
+        conn.close()
+    
+    @staticmethod
+    def _job_dict(row) -> Dict:
+        job = dict(row)
+        job['triggers'] = json.loads(job['triggers'])
+        job['results'] = json.loads(job['results']) if job['results'] else None
+        return job
+    
+    def claim_monitor_job(self, scope: str, trigger: str, stale_before: float) -> Tuple[Dict, bool]:
+        """
+        Join the scope's in-flight monitoring job or queue a new one
+        
+        Runs in one write transaction, so processes racing to trigger a
+        cycle always agree on a single job. Active jobs whose heartbeat is
+        older than stale_before belonged to a process that died and are
+        failed first.
+        
+        Returns:
+            tuple: (job, created) where created is False if the trigger was
+            attached to a job that was already queued or running
+        """
+        def write(cursor):
+            cursor.execute('''
+                UPDATE monitor_jobs
+                SET status = 'failed', error = 'Abandoned: the process running it stopped', finished_at = ?
+                WHERE scope = ? AND status IN ('queued', 'running') AND heartbeat_at < ?
+            ''', (datetime.now().isoformat(), scope, stale_before))
+            
+            row = cursor.execute('''
+                SELECT * FROM monitor_jobs WHERE scope = ? AND status IN ('queued', 'running')
+                ORDER BY rowid LIMIT 1
+            ''', (scope,)).fetchone()
+            if row:
+                job = self._job_dict(row)
+                job['triggers'].append(trigger)
+                cursor.execute(
+                    'UPDATE monitor_jobs SET triggers = ? WHERE id = ?', (json.dumps(job['triggers']), job['id'])
+                )
+                return job, False
+            
+            job = {
+                'id': uuid.uuid4().hex,
+                'scope': scope,
+                'status': 'queued',
+                'triggers': [trigger],
+                'created_at': datetime.now().isoformat(),
+                'started_at': None,
+                'finished_at': None,
+                'results': None,
+                'error': None,
+                'heartbeat_at': time.time()
+            }
+            cursor.execute('''
+                INSERT INTO monitor_jobs (id, scope, status, triggers, created_at, heartbeat_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (job['id'], scope, job['status'], json.dumps(job['triggers']), job['created_at'], job['heartbeat_at']))
+            return job, True
         
+        return self.writer.submit(write).result()
+    
+    def start_monitor_job(self, job_id: Optional[str] = None, scope: Optional[str] = None) -> Optional[Dict]:
+        """
+        Move a queued job to running (by id, or the oldest queued job of a scope)
+        
+        Returns:
+            dict: The started job, or None if it was not queued (another
+            process started it first)
+        """
+        def write(cursor):
+            if job_id is not None:
+                row = cursor.execute(
+                    "SELECT * FROM monitor_jobs WHERE id = ? AND status = 'queued'", (job_id,)
+                ).fetchone()
+            else:
+                row = cursor.execute(
+                    "SELECT * FROM monitor_jobs WHERE scope = ? AND status = 'queued' ORDER BY rowid LIMIT 1",
+                    (scope,)
+                ).fetchone()
+            if not row:
+                return None
+            job = self._job_dict(row)
+            job.update(status='running', started_at=datetime.now().isoformat(), heartbeat_at=time.time())
+            cursor.execute(
+                'UPDATE monitor_jobs SET status = ?, started_at = ?, heartbeat_at = ? WHERE id = ?',
+                (job['status'], job['started_at'], job['heartbeat_at'], job['id'])
+            )
+            return job
+        
+        return self.writer.submit(write).result()
+    
+    def heartbeat_monitor_job(self, job_id: str) -> Future:
+        """Record that the job's process is still running it"""
+        return self.writer.submit(lambda cursor: cursor.execute(
+            'UPDATE monitor_jobs SET heartbeat_at = ? WHERE id = ?', (time.time(), job_id)
+        ))
+    
+    def finish_monitor_job(self, job_id: str, status: str, results: Optional[Dict] = None,
+                           error: Optional[str] = None, history: int = 100):
+        """Record a job's outcome and keep only the newest history jobs"""
+        def write(cursor):
+            cursor.execute('''
+                UPDATE monitor_jobs SET status = ?, results = ?, error = ?, finished_at = ? WHERE id = ?
+            ''', (status, json.dumps(results) if results is not None else None, error,
+                  datetime.now().isoformat(), job_id))
+            cursor.execute('''
+                DELETE FROM monitor_jobs
+                WHERE status NOT IN ('queued', 'running')
+                  AND rowid NOT IN (SELECT rowid FROM monitor_jobs ORDER BY rowid DESC LIMIT ?)
+            ''', (history,))
+        
+        self.writer.submit(write).result()
+    
+    def get_monitor_job(self, job_id: str) -> Optional[Dict]:
+        conn = self.get_connection()
+        row = conn.execute('SELECT * FROM monitor_jobs WHERE id = ?', (job_id,)).fetchone()
+        conn.close()
+        return self._job_dict(row) if row else None
+    
+    def get_poll_schedule(self) -> List[Dict]:
+        """Saved adaptive polling state of every (keyword, source) pair"""
+        conn = self.get_connection()
+        rows = conn.execute('SELECT * FROM poll_schedule ORDER BY keyword, source').fetchall()
+        conn.close()
+        return [dict(row) for row in rows]
+    
+    def save_poll_state(self, state: Dict, called_at: Optional[float] = None) -> Future:
+        """
+        Store one pair's polling state, and the API call that produced it
+        
+        Args:
+            state: keyword, source, interval, next_due, last_polled, velocity
+            called_at: Time of the poll's API call; calls older than an hour
+                are pruned
+        """
+        def write(cursor):
+            cursor.execute('''
+                INSERT OR REPLACE INTO poll_schedule (keyword, source, interval, next_due, last_polled, velocity)
+                VALUES (:keyword, :source, :interval, :next_due, :last_polled, :velocity)
+            ''', state)
+            if called_at is not None:
+                cursor.execute('INSERT INTO poll_calls (called_at) VALUES (?)', (called_at,))
+                cursor.execute('DELETE FROM poll_calls WHERE called_at <= ?', (called_at - 3600,))
+        
+        return self.writer.submit(write)
+    
+    def get_poll_calls(self, since: float) -> List[float]:
+        """Times of adaptive polling API calls made after since, oldest first"""
+        conn = self.get_connection()
+        rows = conn.execute(
+            'SELECT called_at FROM poll_calls WHERE called_at > ? ORDER BY called_at', (since,)
+        ).fetchall()
+        conn.close()
+        return [row['called_at'] for row in rows]
+    
+    def get_rate_limits(self) -> List[Dict]:
+        conn = self.get_connection()
+        rows = conn.execute('SELECT * FROM rate_limits ORDER BY source, endpoint').fetchall()
+        conn.close()
         return [dict(row) for row in rows]
     
-    def get_unnotified_alerts(self) -> List[Dict]:
-        """Get alerts that haven't been notified yet"""
+    def get_rate_limit(self, source: str, endpoint: str) -> Optional[Dict]:
+        conn = self.get_connection()
+        row = conn.execute(
+            'SELECT * FROM rate_limits WHERE source = ? AND endpoint = ?', (source, endpoint)
+        ).fetchone()
+        conn.close()
+        return dict(row) if row else None
+    
+    def modify_rate_limit(self, source: str, endpoint: str,
+                          change: Callable[[Optional[Dict]], Tuple[Optional[Dict], Any]]) -> Any:
+        """
+        Read-modify-write one endpoint's quota in a single transaction
+        
+        Args:
+            change: Called with the stored row (None if there is none);
+                returns (row to store or None to leave it, result)
+        
+        Returns:
+            The result returned by change
+        """
+        def write(cursor):
+            row = cursor.execute(
+                'SELECT remaining, quota_limit, reset_at FROM rate_limits WHERE source = ? AND endpoint = ?',
+                (source, endpoint)
+            ).fetchone()
+            updated, result = change(dict(row) if row else None)
+            if updated is not None:
+                cursor.execute('''
+                    INSERT OR REPLACE INTO rate_limits (source, endpoint, remaining, quota_limit, reset_at)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', (source, endpoint, updated['remaining'], updated['quota_limit'], updated['reset_at']))
+            return result
+        
+        return self.writer.submit(write).result()
+    
+    def record_heartbeat(self, name: str) -> Future:
+        """Note that the named process is alive (queued; wait on the Future to confirm)"""
+        pid, now = os.getpid(), time.time()
+        return self.writer.submit(lambda cursor: cursor.execute(
+            'INSERT OR REPLACE INTO process_heartbeats (name, pid, heartbeat_at) VALUES (?, ?, ?)',
+            (name, pid, now)
+        ))
+    
+    def get_heartbeat(self, name: str) -> Optional[Dict]:
+        conn = self.get_connection()
+        row = conn.execute('SELECT * FROM process_heartbeats WHERE name = ?', (name,)).fetchone()
+        conn.close()
+        return dict(row) if row else None
+    
+    # Columns that can be filtered with an exact (possibly multi-valued) match
+    ALERT_FILTER_COLUMNS = {
+        'source': 'source',
+        'urgency': 'urgency_level',
+        'status': 'status'
+    }
+    
+    def _build_alert_filters(self, filters: Optional[Dict]) -> Tuple[str, list]:
+        """
+        Build a WHERE clause for the alert list
+        
+        Args:
+            filters: Optional keys source, urgency, status (value or list of values),
+                since/until ('YYYY-MM-DD HH:MM:SS', UTC) and min_score/max_score
+        
+        Returns:
+            tuple: (where_sql, params)
+        """
+        clauses = []
+        params = []
+        filters = filters or {}
+        
+        for key, column in self.ALERT_FILTER_COLUMNS.items():
+            values = filters.get(key)
+            if not values:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+        
+        if filters.get('since'):
+            clauses.append('created_at >= ?')
+            params.append(filters['since'])
+        if filters.get('until'):
+            clauses.append('created_at <= ?')
+            params.append(filters['until'])
+        if filters.get('min_score') is not None:
+            clauses.append('sentiment_score >= ?')
+            params.append(filters['min_score'])
+        if filters.get('max_score') is not None:
+            clauses.append('sentiment_score <= ?')
+            params.append(filters['max_score'])
+        
+        where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return where_sql, params
+    
+    def get_recent_alerts(self, limit: int = 50, filters: Optional[Dict] = None, offset: int = 0,
+                          preview_chars: Optional[int] = None) -> List[Dict]:
+        """
+        Get recent alerts, optionally filtered (see _build_alert_filters)
+        
+        Returns the list projection: ALERT_LIST_COLUMNS plus a content_preview
+        of at most preview_chars characters and content_truncated. The full
+        content and recommended response come from get_alert.
+        """
+        where_sql, params = self._build_alert_filters(filters)
+        preview_chars = preview_chars or Config.ALERT_PREVIEW_CHARS
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        # Content is inflated once per row of the page, in the subquery, and
+        # both the preview and the truncation flag are taken from that text
+        columns = ", ".join(ALERT_LIST_COLUMNS)
+        cursor.execute(f'''
+            SELECT {columns},
+                   content_preview(content, ?) AS content_preview,
+                   length(content) > ? AS content_truncated
+            FROM (
+                SELECT {columns}, inflate(content) AS content
+                FROM alerts
+                {where_sql}
+                ORDER BY created_at DESC, id DESC
+                LIMIT ? OFFSET ?
+            )
+            ORDER BY created_at DESC, id DESC
+        ''', [preview_chars, preview_chars] + params + [limit, offset])
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        alerts = []
+        for row in rows:
+            alert = dict(row)
+            alert['content_truncated'] = bool(alert['content_truncated'])
+            alerts.append(alert)
+        return alerts
+    
+    def iter_alerts(self, filters: Optional[Dict] = None, limit: Optional[int] = None,
+                    batch_size: int = 500) -> Iterator[Dict]:
+        """
+        Stream full alert records matching the filters, oldest first
+        
+        Rows are fetched from an open cursor batch_size at a time, so memory
+        stays constant however many alerts match. The connection stays open
+        until the generator is exhausted or closed.
+        
+        Args:
+            filters: See _build_alert_filters
+            limit: Stop after this many alerts (None for all)
+            batch_size: Rows per fetchmany call
+        
+        Yields:
+            Alert dicts with content inflated
+        """
+        where_sql, params = self._build_alert_filters(filters)
+        limit_sql = ''
+        if limit is not None:
+            limit_sql = 'LIMIT ?'
+            params = params + [limit]
+        
+        conn = self.get_connection()
+        try:
+            # id follows created_at in idx_alerts_created, so this order needs no sort
+            cursor = conn.execute(f'SELECT * FROM alerts {where_sql} ORDER BY created_at, id {limit_sql}', params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield self._alert_dict(row)
+        finally:
+            conn.close()
+    
+    def get_alert(self, alert_id: int) -> Optional[Dict]:
+        """Get the full record of one alert"""
+        conn = self.get_connection()
+        row = conn.execute('SELECT * FROM alerts WHERE id = ?', (alert_id,)).fetchone()
+        conn.close()
+        return self._alert_dict(row) if row else None
+    
+    @staticmethod
+    def _alert_dict(row) -> Dict:
+        """Row to dict with compressed content inflated"""
+        alert = dict(row)
+        if 'content' in alert:
+            alert['content'] = inflate(alert['content'])
+        return alert
+    
+    def get_alert_facets(self, filters: Optional[Dict] = None) -> Dict:
+        """
+        Count matching alerts per source, urgency and status in a single query
+        
+        Each facet is counted with every filter applied except its own, so the
+        counts show what selecting another value of that facet would return.
+        
+        Returns:
+            dict: {'total': int, 'source': {...}, 'urgency': {...}, 'status': {...}}
+        """
+        filters = filters or {}
+        selected = {}
+        for key in self.ALERT_FILTER_COLUMNS:
+            values = filters.get(key)
+            if values:
+                selected[key] = {values} if isinstance(values, str) else set(values)
+        
+        # Range filters go to SQL; the few (source, urgency, status) groups are split here
+        range_filters = {key: value for key, value in filters.items() if key not in self.ALERT_FILTER_COLUMNS}
+        where_sql, params = self._build_alert_filters(range_filters)
+        
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute(f'''
+            SELECT source, urgency_level, status, COUNT(*) AS count
+            FROM alerts
+            {where_sql}
+            GROUP BY source, urgency_level, status
+        ''', params)
+        
+        rows = cursor.fetchall()
+        conn.close()
+        
+        facets = {'total': 0, 'source': {}, 'urgency': {}, 'status': {}}
+        for row in rows:
+            mismatched = [
+                key for key, column in self.ALERT_FILTER_COLUMNS.items()
+                if key in selected and row[column] not in selected[key]
+            ]
+            if not mismatched:
+                facets['total'] += row['count']
+            for key, column in self.ALERT_FILTER_COLUMNS.items():
+                if not mismatched or mismatched == [key]:
+                    value = row[column]
+                    facets[key][value] = facets[key].get(value, 0) + row['count']
+        
+        return facets
+    
+    def search_alerts(self, query: str, limit: int = 20, offset: int = 0, raw: bool = False) -> Dict:
+        """
+        Full-text search over alert content, author and recommended response
+        
+        Args:
+            query: Search terms (all must match)
+            limit: Page size
+            offset: Number of results to skip
+            raw: Pass the query through as FTS5 syntax (phrases, OR, NEAR, prefix*)
+        
+        Returns:
+            dict: {'total': int, 'results': ranked alerts with an HTML-safe 'snippet'}
+        """
+        if not self.fts_enabled:
+            raise RuntimeError("Full-text search is not available in this SQLite build")
+        
+        if not raw:
+            # Quote every term so user input can never be parsed as FTS5 syntax
+            query = ' '.join('"' + term.replace('"', '""') + '"' for term in query.split())
+        
         conn = self.get_connection()
         cursor = conn.cursor()
+        
+        cursor.execute('SELECT COUNT(*) AS total FROM alerts_fts WHERE alerts_fts MATCH ?', (query,))
+        total = cursor.fetchone()['total']
+        
+        # \x02/\x03 mark matches so the snippet can be HTML-escaped before highlighting
         cursor.execute('''
-            SELECT * FROM alerts 
-            WHERE notified = 0 
-            ORDER BY created_at DESC
-        ''')
+            SELECT alerts.*,
+                   snippet(alerts_fts, -1, char(2), char(3), '…', 16) AS snippet,
+                   bm25(alerts_fts) AS rank
+            FROM alerts_fts
+            JOIN alerts ON alerts.id = alerts_fts.rowid
+            WHERE alerts_fts MATCH ?
+            ORDER BY rank
+            LIMIT ? OFFSET ?
+        ''', (query, limit, offset))
         
         rows = cursor.fetchall()
         conn.close()
         
-        return [dict(row) for row in rows]
+        results = []
+        for row in rows:
+            result = self._alert_dict(row)
+            result['snippet'] = html.escape(result['snippet'] or '').replace('\x02', '<mark>').replace('\x03', '</mark>')
+            results.append(result)
+        
+        return {'total': total, 'results': results}
     
-    def update_alert_status(self, alert_id: int, status: str):
-        """Update alert status"""
+    def get_unnotified_alerts(self, max_age_hours: float = 24, limit: int = 100) -> List[Dict]:
+        """
+        Get alerts whose notification was deferred, oldest first
+        
+        Args:
+            max_age_hours: Alerts older than this are no longer worth notifying
+            limit: Most alerts returned
+        """
         conn = self.get_connection()
         cursor = conn.cursor()
-        cursor.execute(
-            'UPDATE alerts SET status = ? WHERE id = ?',
-            (status, alert_id)
-        )
-        conn.commit()
+        cursor.execute('''
+            SELECT * FROM alerts 
+            WHERE notified = 0 AND notify_pending = 1
+              AND datetime(created_at) > datetime('now', ?)
+            ORDER BY id
+            LIMIT ?
+        ''', (f'-{max_age_hours} hours', limit))
+        
+        rows = cursor.fetchall()
         conn.close()
+        
+        return [self._alert_dict(row) for row in rows]
+    
+    def update_alert_status(self, alert_id: int, status: str, version: Optional[int] = None) -> bool:
+        """
+        Update alert status
+        
+        Args:
+            alert_id: Alert to update
+            status: New status
+            version: Only update if the alert is still at this version
+        
+        Returns:
+            bool: False if the alert is missing or its version changed
+        """
+        result = self.bulk_update_alert_status(status, items=[(alert_id, version)])
+        return bool(result['updated'])
+    
+    def bulk_update_alert_status(self, status: str, items: Optional[List[Tuple[int, Optional[int]]]] = None,
+                                 filters: Optional[Dict] = None) -> Dict:
+        """
+        Change the status of many alerts in one transaction
+        
+        Args:
+            status: New status
+            items: (alert_id, expected_version) pairs; a row whose version no
+                longer matches was changed by someone else and is skipped.
+                A version of None updates unconditionally.
+            filters: Alternatively, update every alert matching these filters
+                (see _build_alert_filters) as of the start of the transaction
+        
+        Returns:
+            dict: {'updated': [ids], 'conflicts': [ids]}
+        """
+        def write(cursor):
+            selected = items
+            if selected is None:
+                where_sql, params = self._build_alert_filters(filters)
+                cursor.execute(f'SELECT id, version FROM alerts {where_sql}', params)
+                selected = [(row['id'], row['version']) for row in cursor.fetchall()]
+            
+            updated, conflicts = [], []
+            for alert_id, version in selected:
+                if version is None:
+                    cursor.execute(
+                        'UPDATE alerts SET status = ?, version = version + 1 WHERE id = ?',
+                        (status, alert_id)
+                    )
+                else:
+                    cursor.execute(
+                        'UPDATE alerts SET status = ?, version = version + 1 WHERE id = ? AND version = ?',
+                        (status, alert_id, version)
+                    )
+                (updated if cursor.rowcount == 1 else conflicts).append(alert_id)
+            return {'updated': updated, 'conflicts': conflicts}
+        
+        # Runs in the writer's transaction, so the selection and updates are atomic
+        return self.writer.submit(write).result()
     
     def get_stats(self) -> Dict:
         """Get dashboard statistics"""
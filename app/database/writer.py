@@ -0,0 +1,191 @@
+"""
+Agent Saad - Database Writer
+Funnels all writes of a process through one thread that commits them in
+groups, so many small writes share a transaction (and an fsync) and the
+process never competes with itself for SQLite's write lock
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+class DatabaseWriter:
+    """
+    Single writer thread with group commit
+
+    Callers submit a function taking a cursor and get a Future for its
+    return value. The writer takes the first pending write, gathers more
+    for up to max_delay seconds or max_batch writes, and runs them all in
+    one BEGIN IMMEDIATE transaction. Each write runs in its own savepoint,
+    so a failing write is rolled back alone and only its Future fails.
+    Futures resolve after the commit, so a result is never seen before it
+    is durable. If the writer itself fails (the connection cannot be
+    opened, a commit raises), every write in flight or queued fails with
+    that error and the next submit starts a new writer thread.
+    """
+
+    def __init__(self, connect: Callable[[], sqlite3.Connection], max_batch: int = 100, max_delay: float = 0.002):
+        """
+        Args:
+            connect: Opens a new connection to the database
+            max_batch: Most writes committed in one transaction
+            max_delay: Seconds to wait for more writes after the first one
+        """
+        self.connect = connect
+        self.max_batch = max(max_batch, 1)
+        self.max_delay = max_delay
+        self.commits = 0
+        self.writes = 0
+        self._queue: Optional[queue.Queue] = None
+        self._thread: Optional[threading.Thread] = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> queue.Queue:
+        # A forked child (gunicorn worker, scheduler process) inherits the
+        # object but not the thread, so each process starts its own; a writer
+        # that stopped on a fatal error is replaced the same way. Called with
+        # self._lock held.
+        if self._pid != os.getpid() or self._queue is None or not self._thread.is_alive():
+            self._pid = os.getpid()
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._queue,), name='db-writer', daemon=True
+            )
+            self._thread.start()
+        return self._queue
+
+    def submit(self, write: Callable[[sqlite3.Cursor], Any]) -> Future:
+        """
+        Queue a write
+
+        Args:
+            write: Function run on the writer thread with a cursor inside
+                the group transaction; must not commit or roll back
+
+        Returns:
+            Future resolving to the function's return value after commit
+        """
+        future = Future()
+        # Queued under the lock so a writer failing meanwhile cannot strand the write
+        with self._lock:
+            self._ensure_started().put((write, future))
+        return future
+
+    def close(self, timeout: float = 10):
+        """Commit everything queued so far and stop the writer thread"""
+        with self._lock:
+            if self._queue is None or self._pid != os.getpid() or not self._thread.is_alive():
+                return
+            self._queue.put(_STOP)
+            thread = self._thread
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Database writer did not finish flushing before the timeout")
+
+    def get_status(self) -> dict:
+        return {
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'writes': self.writes,
+            'commits': self.commits
+        }
+
+    def _run(self, pending: queue.Queue):
+        conn = None
+        batch = []
+        try:
+            conn = self.connect()
+            # Transactions are managed explicitly below
+            conn.isolation_level = None
+            while True:
+                batch, stop = self._gather(pending)
+                if batch:
+                    self._commit(conn, batch)
+                batch = []
+                if stop:
+                    return
+        except BaseException as e:
+            logger.error(f"Database writer stopped: {e}")
+            self._fail_pending(pending, batch, e)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def _fail_pending(self, pending: queue.Queue, batch: list, error: BaseException):
+        """Fail the batch in flight and every queued write, and let the next submit start a new writer"""
+        with self._lock:
+            if self._queue is pending:
+                self._queue = None
+            while True:
+                try:
+                    item = pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    batch.append(item)
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    def _gather(self, pending: queue.Queue):
+        """Block for one write, then collect more until the batch is full or the delay passes"""
+        first = pending.get()
+        if first is _STOP:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = pending.get(timeout=remaining) if remaining > 0 else pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _commit(self, conn: sqlite3.Connection, batch: list):
+        cursor = conn.cursor()
+        results = []
+        try:
+            cursor.execute('BEGIN IMMEDIATE')
+            for write, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                cursor.execute('SAVEPOINT write')
+                try:
+                    results.append((future, write(cursor), None))
+                    cursor.execute('RELEASE write')
+                except Exception as e:
+                    cursor.execute('ROLLBACK TO write')
+                    cursor.execute('RELEASE write')
+                    logger.warning(f"Database write failed: {e}")
+                    results.append((future, None, e))
+            cursor.execute('COMMIT')
+        except Exception as e:
+            logger.error(f"Error committing {len(batch)} database writes: {e}")
+            if conn.in_transaction:
+                conn.rollback()
+            for write, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.commits += 1
+        self.writes += len(results)
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
@@ -0,0 +1,164 @@
+"""
+Agent Saad - Semantic Incident Grouping
+Attaches new alerts to an existing incident when their content is close
+to a recent alert's, so an outage notifies once instead of once per post
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from app.database.db import Database, URGENCY_RANK
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class IncidentIndex:
+    """
+    Brute-force nearest-neighbour index over recent alert embeddings
+
+    Embeddings are L2-normalized, so cosine similarity is a single matrix
+    product against the window. The window holds at most max_size alerts
+    from the last window_hours; at a few thousand rows the product takes
+    well under a millisecond, so no approximate index is needed.
+
+    Rows live in preallocated buffers: expiry advances a start offset and
+    appends fill spare rows, so assigning an alert never copies the window
+    (the window is moved to the front of the buffers, grown to twice its
+    size if needed, only when they fill up).
+    """
+
+    # Rows allocated for the first embedding
+    INITIAL_CAPACITY = 64
+
+    def __init__(self, db: Database, threshold: float = None, window_hours: float = None,
+                 max_size: int = None):
+        self.db = db
+        self.threshold = threshold or Config.INCIDENT_SIMILARITY_THRESHOLD
+        self.window_hours = window_hours or Config.INCIDENT_WINDOW_HOURS
+        self.max_size = max_size or Config.INCIDENT_INDEX_MAX_SIZE
+        # Window rows are [_start, _end) of these buffers
+        self._vectors: Optional[np.ndarray] = None
+        self._incident_ids = np.empty(0, dtype=np.int64)
+        self._added_at = np.empty(0, dtype=np.float64)
+        self._start = 0
+        self._end = 0
+        self._lock = threading.Lock()
+        self.load()
+
+    def load(self):
+        """Rebuild the window from embeddings stored in the database"""
+        rows = self.db.get_recent_alert_embeddings(self.window_hours, self.max_size)
+        rows = [row for row in rows if row['incident_id'] is not None]
+        with self._lock:
+            self._vectors = None
+            self._start = self._end = 0
+            if rows:
+                vectors = np.vstack([np.frombuffer(row['embedding'], dtype=np.float32) for row in rows])
+                self._allocate(max(2 * len(rows), self.INITIAL_CAPACITY), vectors.shape[1])
+                self._vectors[:len(rows)] = vectors
+                self._incident_ids[:len(rows)] = [row['incident_id'] for row in rows]
+                # Exact ages are not needed after a restart; expire them as a block
+                self._added_at[:len(rows)] = time.time()
+                self._end = len(rows)
+        logger.info(f"Incident index loaded with {len(rows)} recent alerts")
+
+    @property
+    def vectors(self) -> Optional[np.ndarray]:
+        """Embeddings in the window, oldest first (None when empty)"""
+        return self._vectors[self._start:self._end] if self._end > self._start else None
+
+    @property
+    def incident_ids(self) -> np.ndarray:
+        """Incident of each row of vectors"""
+        return self._incident_ids[self._start:self._end]
+
+    def _allocate(self, capacity: int, dimension: int):
+        self._vectors = np.empty((capacity, dimension), dtype=np.float32)
+        self._incident_ids = np.empty(capacity, dtype=np.int64)
+        self._added_at = np.empty(capacity, dtype=np.float64)
+
+    def _expire(self, now: float):
+        """Drop entries older than the window or beyond max_size (oldest first)"""
+        cutoff = now - self.window_hours * 3600
+        expired = int(np.searchsorted(self._added_at[self._start:self._end], cutoff))
+        self._start += max(expired, self._end - self._start - self.max_size)
+        if self._start == self._end:
+            self._start = self._end = 0
+
+    def _append(self, vector: np.ndarray, incident_id: int, now: float):
+        """Add a row after the window, making room if the buffers are full"""
+        if self._vectors is None:
+            self._allocate(min(self.INITIAL_CAPACITY, self.max_size + 1), len(vector))
+        elif self._end == len(self._vectors):
+            size = self._end - self._start
+            # Leave at least as many free rows as the window holds, so copies stay amortized O(1)
+            capacity = max(len(self._vectors), 2 * size)
+            window = (self._vectors[self._start:self._end], self._incident_ids[self._start:self._end],
+                      self._added_at[self._start:self._end])
+            if capacity > len(self._vectors):
+                self._allocate(capacity, self._vectors.shape[1])
+            # Source and destination may overlap; numpy copies through a buffer then
+            self._vectors[:size], self._incident_ids[:size], self._added_at[:size] = window
+            self._start, self._end = 0, size
+
+        self._vectors[self._end] = vector
+        self._incident_ids[self._end] = incident_id
+        self._added_at[self._end] = now
+        self._end += 1
+
+    def assign(self, alert_id: int, embedding: List[float], urgency: str) -> Tuple[int, bool]:
+        """
+        Attach an alert to the most similar recent incident or open a new one
+
+        Args:
+            alert_id: The newly created alert
+            embedding: L2-normalized sentence embedding of its content
+            urgency: The alert's urgency level
+
+        Returns:
+            tuple: (incident_id, created) where created is True for a new incident
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        now = time.time()
+
+        with self._lock:
+            self._expire(now)
+
+            incident_id = None
+            if self.vectors is not None:
+                similarities = self.vectors @ vector
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    incident_id = int(self.incident_ids[best])
+                    logger.info(
+                        f"Alert {alert_id} matches incident {incident_id} "
+                        f"(similarity {similarities[best]:.3f})"
+                    )
+
+            created = incident_id is None
+            if created:
+                incident_id = self.db.create_incident(alert_id, urgency)
+            else:
+                self.db.attach_to_incident(incident_id, alert_id, urgency)
+            self.db.add_alert_embedding(alert_id, vector.tobytes())
+
+            self._append(vector, incident_id, now)
+
+        return incident_id, created
+
+    def should_notify(self, incident_id: int, urgency: str) -> bool:
+        """Notify once per incident, and again only if its urgency escalates"""
+        incident = self.db.get_incident(incident_id)
+        if not incident or not incident['notified_urgency']:
+            return True
+        return URGENCY_RANK.get(urgency, 99) < URGENCY_RANK.get(incident['notified_urgency'], 99)
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            return {
+                'window_size': self._end - self._start,
+                'incidents_in_window': len(np.unique(self.incident_ids)),
+                'threshold': self.threshold
+            }
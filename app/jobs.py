@@ -0,0 +1,132 @@
+"""
+Agent Saad - Monitor Job Runner
+Runs monitoring cycles in the background and coalesces overlapping
+manual and scheduled triggers into a single in-flight cycle
+"""
+
+import logging
+import threading
+import time
+from typing import Callable, Dict, Optional
+from app.components import components
+
+logger = logging.getLogger(__name__)
+
+# A running job's process renews its heartbeat this often; a job whose
+# heartbeat is older than JOB_STALE_SECONDS is treated as abandoned
+JOB_HEARTBEAT_SECONDS = 15
+JOB_STALE_SECONDS = 60
+
+class MonitorJobs:
+    """
+    Tracks monitoring cycle jobs by id in the shared database
+
+    At most one cycle per scope runs at a time, across all processes. A
+    trigger that arrives while a cycle is queued or running is attached to
+    that job instead of starting a second one, so the same work is never
+    done twice. Any web worker can report on any job, whichever process
+    runs it.
+
+    With execute_locally off (production: web workers only enqueue), queued
+    jobs are run by the scheduler process through run_queued().
+    """
+
+    def __init__(self, cycle_fn: Callable[[], Dict], scope: str = 'default', history: int = 100,
+                 execute_locally: bool = True):
+        """
+        Args:
+            cycle_fn: Function running one monitoring cycle and returning its results
+            scope: Jobs coalesce within a scope (sharded workers each use their own)
+            history: Number of finished jobs to keep for status lookups
+            execute_locally: Run submitted jobs in a thread of this process
+        """
+        self.cycle_fn = cycle_fn
+        self.scope = scope
+        self.history = history
+        self.execute_locally = execute_locally
+
+    def _claim(self, trigger: str):
+        return components.db.claim_monitor_job(self.scope, trigger, time.time() - JOB_STALE_SECONDS)
+
+    def _run(self, job: Dict):
+        """Run the cycle for a started job, heartbeating meanwhile, and record its outcome"""
+        db = components.db
+        done = threading.Event()
+
+        def heartbeat():
+            while not done.wait(JOB_HEARTBEAT_SECONDS):
+                db.heartbeat_monitor_job(job['id'])
+
+        threading.Thread(target=heartbeat, name=f"monitor-job-heartbeat-{job['id'][:8]}", daemon=True).start()
+        try:
+            results = self.cycle_fn()
+            db.finish_monitor_job(job['id'], 'completed', results=results, history=self.history)
+        except Exception as e:
+            logger.error(f"Monitoring job {job['id']} failed: {e}")
+            db.finish_monitor_job(job['id'], 'failed', error=str(e), history=self.history)
+        finally:
+            done.set()
+
+    def _start_and_run(self, job_id: str):
+        job = components.db.start_monitor_job(job_id)
+        if job is None:
+            logger.info(f"Monitoring job {job_id} was started by another process")
+            return
+        self._run(job)
+
+    def submit(self, trigger: str = 'manual') -> Dict:
+        """
+        Enqueue a monitoring cycle
+
+        Returns:
+            dict: The job, which is the already in-flight job if one exists
+        """
+        job, created = self._claim(trigger)
+        if not created:
+            logger.info(f"Monitoring cycle already in flight, coalesced into job {job['id']}")
+        elif self.execute_locally:
+            threading.Thread(target=self._start_and_run, args=(job['id'],),
+                             name=f"monitor-job-{job['id'][:8]}", daemon=True).start()
+        return self.snapshot(job)
+
+    def run_scheduled(self) -> Dict:
+        """
+        Run a cycle in the calling (scheduler) thread unless one is in flight
+
+        Returns:
+            dict: The job that ran, or the in-flight job the trigger joined
+        """
+        job, created = self._claim('scheduled')
+        if created:
+            self._start_and_run(job['id'])
+        else:
+            logger.info(f"Skipping scheduled cycle, job {job['id']} already in flight")
+        return self.get(job['id']) or self.snapshot(job)
+
+    def run_queued(self) -> Optional[Dict]:
+        """
+        Run the oldest job of this scope that is waiting for a process
+
+        Returns:
+            dict: The job that ran, or None if nothing was queued
+        """
+        job = components.db.start_monitor_job(scope=self.scope)
+        if job is None:
+            return None
+        logger.info(f"Running queued monitoring job {job['id']} (triggers: {job['triggers']})")
+        self._run(job)
+        return self.get(job['id'])
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """Look up a job by id, whichever process created or runs it"""
+        job = components.db.get_monitor_job(job_id)
+        if job is None:
+            return None
+        if job['status'] in ('queued', 'running') and job['heartbeat_at'] < time.time() - JOB_STALE_SECONDS:
+            job.update(status='failed', error='Abandoned: the process running it stopped')
+        return self.snapshot(job)
+
+    @staticmethod
+    def snapshot(job: Dict) -> Dict:
+        """The job as reported to API clients"""
+        return {key: value for key, value in job.items() if key != 'heartbeat_at'}
@@ -1,12 +1,16 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request
+import csv
+import io
+import json
 import logging
-from datetime import datetime
-from app.database.db import Database
-from app.models.sentiment import SentimentAnalyzer
-from app.monitors.twitter_monitor import TwitterMonitor
-from app.monitors.reddit_monitor import RedditMonitor
-from app.alerts.slack_alert import SlackAlerter
-from app.alerts.email_alert import EmailAlerter
+import os
+import sqlite3
+from datetime import datetime, timedelta, timezone
+from app.cache import ResponseCache
+from app.components import components
+from app.models.batcher import MicroBatcher
+from app.models.weights import memory_usage
+from app.web import init_web
 from config import Config
 
 # Setup logging
@@ -19,14 +23,65 @@ logger = logging.getLogger(__name__)
 # Initialize Flask app
 app = Flask(__name__, template_folder='templates', static_folder='../static')
 app.config['SECRET_KEY'] = Config.SECRET_KEY
+init_web(app)
 
-# Initialize components
-db = Database(Config.DATABASE_PATH)
-sentiment_analyzer = SentimentAnalyzer()
-twitter_monitor = TwitterMonitor()
-reddit_monitor = RedditMonitor()
-slack_alerter = SlackAlerter()
-email_alerter = EmailAlerter()
+# Components (database, model, monitors, alerters) are shared with app.agent
+# through app.components and built on first use
+sentiment_batcher = MicroBatcher(lambda texts: components.sentiment_analyzer.analyze_batch(texts))
+
+# Dashboard reads are served from here until an alert write bumps the data version
+response_cache = ResponseCache(Config.RESPONSE_CACHE_SIZE, Config.RESPONSE_CACHE_MAX_AGE)
+
+VALID_STATUSES = ['new', 'in_progress', 'resolved', 'ignored']
+VALID_URGENCIES = ['CRITICAL', 'HIGH', 'MEDIUM', 'LOW']
+
+def parse_timestamp(value: str) -> str:
+    """Normalize an ISO date/datetime to the format SQLite stores created_at in"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+def parse_alert_filters(args) -> dict:
+    """
+    Parse alert list filters from query parameters
+    
+    Supports source, urgency and status (comma-separated for several values),
+    since/until (ISO dates) and min_score/max_score. Raises ValueError on bad input.
+    """
+    filters = {}
+    
+    for key, allowed in (('source', None), ('urgency', VALID_URGENCIES), ('status', VALID_STATUSES)):
+        values = [value.strip() for value in args.get(key, '').split(',') if value.strip()]
+        invalid = [value for value in values if allowed and value not in allowed]
+        if invalid:
+            raise ValueError(f"Invalid {key}: {', '.join(invalid)}")
+        if values:
+            filters[key] = values
+    
+    for key in ('since', 'until'):
+        if args.get(key):
+            filters[key] = parse_timestamp(args[key])
+    # A bare end date includes the whole day
+    if args.get('until') and len(args['until']) == 10:
+        filters['until'] = filters['until'][:10] + ' 23:59:59'
+    
+    for key in ('min_score', 'max_score'):
+        if args.get(key):
+            filters[key] = float(args[key])
+    
+    return filters
+
+def parse_page(default_limit: int, max_limit: int):
+    """limit and offset query parameters, clamped to 1..max_limit and >= 0"""
+    limit = request.args.get('limit', default_limit, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    return max(1, min(limit, max_limit)), max(0, offset)
+
+def cached_payload(compute):
+    """Serve the payload for this endpoint and query string from response_cache"""
+    key = (request.path, tuple(sorted(request.args.items(multi=True))))
+    return response_cache.get_or_compute(key, components.db.get_data_version(), compute)
 
 @app.route('/')
 def dashboard():
@@ -35,32 +90,175 @@ def dashboard():
 
 @app.route('/api/alerts')
 def get_alerts():
-    """Get recent alerts"""
+    """
+    Get recent alerts matching the given filters, with facet counts
+    
+    Alerts are the list projection (content_preview instead of content);
+    the full record is served by /api/alert/<id>.
+    """
     try:
-        limit = request.args.get('limit', 50, type=int)
-        alerts = db.get_recent_alerts(limit=limit)
-        return jsonify({
+        limit, offset = parse_page(50, 500)
+        preview = request.args.get('preview', type=int)
+        if preview is not None:
+            preview = max(preview, 1)
+        filters = parse_alert_filters(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    def compute():
+        alerts = components.db.get_recent_alerts(
+            limit=limit, filters=filters, offset=offset, preview_chars=preview
+        )
+        facets = components.db.get_alert_facets(filters)
+        return {
             'success': True,
             'alerts': alerts,
-            'count': len(alerts)
-        })
+            'count': len(alerts),
+            'total': facets.pop('total'),
+            'facets': facets
+        }
+    
+    try:
+        return jsonify(cached_payload(compute))
     except Exception as e:
         logger.error(f"Error fetching alerts: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Column order of CSV exports
+EXPORT_COLUMNS = [
+    'id', 'created_at', 'source', 'author', 'url', 'content', 'sentiment_score', 'sentiment_label',
+    'urgency_level', 'recommended_response', 'status', 'notified', 'version', 'incident_id'
+]
+
+def export_chunks(alerts, export_format: str, rows_per_chunk: int = 500):
+    """Encode streamed alerts as NDJSON lines or CSV rows, rows_per_chunk per yielded chunk"""
+    buffer = io.StringIO()
+    writer = None
+    if export_format == 'csv':
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+    
+    count = 0
+    for alert in alerts:
+        if writer:
+            writer.writerow(alert)
+        else:
+            buffer.write(json.dumps(alert, ensure_ascii=False, default=str))
+            buffer.write('\n')
+        count += 1
+        if count % rows_per_chunk == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@app.route('/api/alerts/export')
+def export_alerts():
+    """
+    Stream every alert matching the alert list filters as NDJSON or CSV
+    
+    Rows go from the SQLite cursor to the client in chunks (chunked
+    transfer encoding), so memory use does not depend on the export size.
+    Query parameters: the /api/alerts filters, format (ndjson or csv) and
+    an optional limit.
+    """
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in ('ndjson', 'csv'):
+            raise ValueError(f"Invalid format: {export_format} (use ndjson or csv)")
+        limit = request.args.get('limit', type=int)
+        if limit is not None and limit < 0:
+            raise ValueError("limit must not be negative")
+        filters = parse_alert_filters(request.args)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    
+    alerts = components.db.iter_alerts(filters=filters, limit=limit)
+    filename = f"alerts-{datetime.now(timezone.utc).strftime('%Y%m%d-%H%M%S')}.{export_format}"
+    mimetype = 'text/csv' if export_format == 'csv' else 'application/x-ndjson'
+    
+    def generate():
+        try:
+            yield from export_chunks(alerts, export_format)
+        except Exception as e:
+            # Headers are already sent; aborting the transfer tells the client the export is incomplete
+            logger.error(f"Error exporting alerts: {e}")
+            raise
+    
+    return Response(
+        generate(),
+        mimetype=mimetype,
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@app.route('/api/alerts/search')
+def search_alerts():
+    """Full-text search over alerts with ranked, paginated results"""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'success': False, 'error': 'No search query provided'}), 400
+        
+        limit, offset = parse_page(20, 100)
+        raw = request.args.get('syntax') == 'fts'
+        
+        found = components.db.search_alerts(query, limit=limit, offset=offset, raw=raw)
+        return jsonify({
+            'success': True,
+            'alerts': found['results'],
+            'count': len(found['results']),
+            'total': found['total'],
+            'limit': limit,
+            'offset': offset
+        })
+    except sqlite3.OperationalError as e:
+        return jsonify({'success': False, 'error': f'Invalid search query: {e}'}), 400
+    except Exception as e:
+        logger.error(f"Error searching alerts: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+@app.route('/api/incidents')
+def get_incidents():
+    """Get recent incidents (groups of similar alerts)"""
+    try:
+        limit, _ = parse_page(50, 500)
+        incidents = components.db.get_incidents(limit=limit)
+        return jsonify({
+            'success': True,
+            'incidents': incidents,
+            'count': len(incidents)
+        })
+    except Exception as e:
+        logger.error(f"Error fetching incidents: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/stats')
 def get_stats():
     """Get dashboard statistics"""
     try:
-        stats = db.get_stats()
-        return jsonify({
+        return jsonify(cached_payload(lambda: {
             'success': True,
-            'stats': stats
-        })
+            'stats': components.db.get_stats()
+        }))
     except Exception as e:
         logger.error(f"Error fetching stats: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/alert/<int:alert_id>')
+def get_alert(alert_id):
+    """Get the full record of one alert"""
+    try:
+        alert = components.db.get_alert(alert_id)
+        if not alert:
+            return jsonify({'success': False, 'error': 'Alert not found'}), 404
+        
+        return jsonify({'success': True, 'alert': alert})
+    except Exception as e:
+        logger.error(f"Error fetching alert {alert_id}: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/alert/<int:alert_id>/status', methods=['PUT'])
 def update_alert_status(alert_id):
     """Update alert status"""
@@ -68,15 +266,77 @@ def update_alert_status(alert_id):
         data = request.get_json()
         status = data.get('status')
         
-        if status not in ['new', 'in_progress', 'resolved', 'ignored']:
+        if status not in VALID_STATUSES:
             return jsonify({'success': False, 'error': 'Invalid status'}), 400
         
-        db.update_alert_status(alert_id, status)
+        if not components.db.update_alert_status(alert_id, status, version=data.get('version')):
+            return jsonify({'success': False, 'error': 'Alert not found or modified by someone else'}), 409
         return jsonify({'success': True})
     except Exception as e:
         logger.error(f"Error updating alert status: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+# Keys accepted in the filter of a bulk status update
+BULK_FILTER_KEYS = {'source', 'urgency', 'status', 'since', 'until', 'min_score', 'max_score', 'older_than_days'}
+
+@app.route('/api/alerts/status', methods=['POST'])
+def bulk_update_alert_status():
+    """
+    Change the status of many alerts in one transaction
+    
+    Body: {"status": "ignored", "alerts": [{"id": 1, "version": 0}, ...]}
+      or: {"status": "ignored", "ids": [1, 2, 3]}
+      or: {"status": "ignored", "filter": {"urgency": "LOW", "source": "Reddit", "older_than_days": 3}}
+    """
+    try:
+        data = request.get_json() or {}
+        status = data.get('status')
+        
+        if status not in VALID_STATUSES:
+            return jsonify({'success': False, 'error': 'Invalid status'}), 400
+        
+        items = filters = None
+        if 'alerts' in data:
+            items = [(int(alert['id']), alert.get('version')) for alert in data['alerts']]
+        elif 'ids' in data:
+            items = [(int(alert_id), None) for alert_id in data['ids']]
+        elif 'filter' in data:
+            if not isinstance(data['filter'], dict):
+                return jsonify({'success': False, 'error': 'Filter must be an object'}), 400
+            # An ignored (e.g. misspelled) key would silently widen the update
+            unknown = sorted(set(data['filter']) - BULK_FILTER_KEYS)
+            if unknown:
+                return jsonify({'success': False, 'error': f"Unknown filter keys: {', '.join(unknown)}"}), 400
+            filter_args = {
+                key: ','.join(value) if isinstance(value, list) else str(value)
+                for key, value in data['filter'].items() if key != 'older_than_days'
+            }
+            filters = parse_alert_filters(filter_args)
+            if data['filter'].get('older_than_days') is not None:
+                cutoff = datetime.now(timezone.utc) - timedelta(days=float(data['filter']['older_than_days']))
+                filters['until'] = cutoff.strftime('%Y-%m-%d %H:%M:%S')
+            if not filters:
+                return jsonify({'success': False, 'error': 'Filter must not be empty'}), 400
+        else:
+            return jsonify({'success': False, 'error': 'Provide alerts, ids or filter'}), 400
+        
+        if items is not None and not items:
+            return jsonify({'success': False, 'error': 'No alerts given'}), 400
+        
+        result = components.db.bulk_update_alert_status(status, items=items, filters=filters)
+        return jsonify({
+            'success': True,
+            'updated': result['updated'],
+            'conflicts': result['conflicts'],
+            'updated_count': len(result['updated']),
+            'conflict_count': len(result['conflicts'])
+        })
+    except (ValueError, TypeError, KeyError) as e:
+        return jsonify({'success': False, 'error': f'Invalid request: {e}'}), 400
+    except Exception as e:
+        logger.error(f"Error bulk updating alert status: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/test/sentiment', methods=['POST'])
 def test_sentiment():
     """Test sentiment analysis"""
@@ -87,9 +347,11 @@ def test_sentiment():
         if not text:
             return jsonify({'success': False, 'error': 'No text provided'}), 400
         
-        result = sentiment_analyzer.analyze(text)
-        urgency = sentiment_analyzer.determine_urgency(result['normalized_score'])
-        recommendation = sentiment_analyzer.generate_response_recommendation(text, result['label'])
+        # Concurrent callers share one forward pass through the micro-batcher
+        result = sentiment_batcher.analyze(text)
+        urgency = components.sentiment_analyzer.determine_urgency(result['normalized_score'])
+        category = result.get('heads', {}).get('issue_category', {}).get('label')
+        recommendation = components.sentiment_analyzer.generate_response_recommendation(text, result['label'], category)
         
         return jsonify({
             'success': True,
@@ -101,6 +363,43 @@ def test_sentiment():
         logger.error(f"Error testing sentiment: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/sentiment/batch', methods=['POST'])
+def batch_sentiment():
+    """Analyze many texts in one request"""
+    try:
+        data = request.get_json() or {}
+        texts = data.get('texts')
+        
+        if not isinstance(texts, list) or not texts:
+            return jsonify({'success': False, 'error': 'No texts provided'}), 400
+        if len(texts) > Config.SENTIMENT_BATCH_API_LIMIT:
+            return jsonify({
+                'success': False,
+                'error': f'At most {Config.SENTIMENT_BATCH_API_LIMIT} texts per request'
+            }), 400
+        if not all(isinstance(text, str) for text in texts):
+            return jsonify({'success': False, 'error': 'Texts must be strings'}), 400
+        
+        results = []
+        for text, sentiment in zip(texts, components.sentiment_analyzer.analyze_batch(texts)):
+            category = sentiment.get('heads', {}).get('issue_category', {}).get('label')
+            results.append({
+                'sentiment': sentiment,
+                'urgency': components.sentiment_analyzer.determine_urgency(sentiment['normalized_score']),
+                'recommendation': components.sentiment_analyzer.generate_response_recommendation(
+                    text, sentiment['label'], category
+                )
+            })
+        
+        return jsonify({
+            'success': True,
+            'results': results,
+            'count': len(results)
+        })
+    except Exception as e:
+        logger.error(f"Error in batch sentiment: {e}")
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/test/alerts', methods=['POST'])
 def test_alerts():
     """Test alert system - sends a test alert via Slack and Email"""
@@ -120,15 +419,15 @@ def test_alerts():
         }
         
         # Save to database
-        alert_id = db.add_alert(test_alert)
+        alert_id = components.db.add_alert(test_alert)
         
         # Send alerts
-        slack_sent = slack_alerter.send_test_alert()
-        email_sent = email_alerter.send_test_alert()
+        slack_sent = components.slack_alerter.send_test_alert()
+        email_sent = components.email_alerter.send_test_alert()
         
         # Mark as notified
         if slack_sent or email_sent:
-            db.mark_as_notified(alert_id)
+            components.db.mark_as_notified(alert_id)
         
         return jsonify({
             'success': True,
@@ -143,25 +442,63 @@ def test_alerts():
 
 @app.route('/api/monitor/run', methods=['POST'])
 def run_monitor():
-    """Manually trigger a monitoring check"""
+    """Enqueue a monitoring check and return its job id immediately"""
     try:
-        from app.agent import process_monitoring_cycle
-        results = process_monitoring_cycle()
+        from app.agent import monitor_jobs
+        job = monitor_jobs.submit(trigger='manual')
         return jsonify({
             'success': True,
-            'results': results
-        })
+            'job_id': job['id'],
+            'job': job
+        }), 202
     except Exception as e:
         logger.error(f"Error running monitor: {e}")
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/monitor/jobs/<job_id>')
+def get_monitor_job(job_id):
+    """Get the status of a monitoring job"""
+    from app.agent import monitor_jobs
+    job = monitor_jobs.get(job_id)
+    if not job:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    
+    return jsonify({'success': True, 'job': job})
+
+@app.route('/api/monitor/schedule')
+def get_monitor_schedule():
+    """Get adaptive polling state per keyword and source, as saved by the scheduler process"""
+    if not Config.ADAPTIVE_SCHEDULING:
+        return jsonify({'success': True, 'adaptive': False, 'schedule': []})
+    
+    from app.scheduler import stored_status
+    return jsonify(dict(stored_status(components.db), success=True, adaptive=True))
+
+@app.route('/api/monitor/rate-limits')
+def get_rate_limits():
+    """Get the last known API quota per platform endpoint"""
+    from app.monitors.rate_limits import RateLimitManager
+    return jsonify({
+        'success': True,
+        'rate_limits': RateLimitManager().get_status()
+    })
+
 @app.route('/health')
 def health_check():
     """Health check endpoint"""
+    from app.agent import scheduler_status
+    # Web workers stay up when the scheduler dies, but monitoring has stopped
+    scheduler = scheduler_status()
     return jsonify({
-        'status': 'healthy',
+        'status': 'degraded' if scheduler and not scheduler['alive'] else 'healthy',
+        'scheduler': scheduler,
         'timestamp': datetime.now().isoformat(),
-        'service': 'Agent Saad'
+        'service': 'Agent Saad',
+        # Per-worker memory: each gunicorn worker answers with its own pid
+        'pid': os.getpid(),
+        'memory_kb': memory_usage(),
+        'components': components.get_status(),
+        'response_cache': response_cache.get_status()
     })
 
 if __name__ == '__main__':
@@ -0,0 +1,84 @@
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    """
+    Coalesces concurrent single-text requests into one model batch
+
+    Each caller's text is queued with a Future. A background thread takes
+    the first waiting request, keeps collecting for up to max_wait_ms or
+    until max_batch_size requests are queued, then runs them as one batch
+    and resolves every Future with its own result.
+    """
+
+    def __init__(self, batch_fn: Callable[[List[str]], List[dict]], max_wait_ms: float = None,
+                 max_batch_size: int = None):
+        """
+        Args:
+            batch_fn: Function analyzing a list of texts, returning results in order
+            max_wait_ms: Longest time the first request in a batch waits for company
+            max_batch_size: Largest batch handed to batch_fn
+        """
+        self.batch_fn = batch_fn
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else Config.SENTIMENT_BATCH_MAX_WAIT_MS) / 1000
+        self.max_batch_size = max_batch_size or Config.SENTIMENT_BATCH_MAX_SIZE
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker_pid = None
+
+    def _ensure_worker(self):
+        """Start the batching thread on first use (and again in a forked child)"""
+        if self._worker_pid == os.getpid():
+            return
+        with self._lock:
+            if self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, name='sentiment-micro-batcher', daemon=True).start()
+                self._worker_pid = os.getpid()
+
+    def submit(self, text: str) -> Future:
+        """Queue a text for analysis and return a Future for its result"""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def analyze(self, text: str, timeout: float = 30) -> dict:
+        """Analyze one text through the shared batch, blocking until done"""
+        return self.submit(text).result(timeout=timeout)
+
+    def _run(self):
+        work = self._queue
+        while True:
+            batch = [work.get()]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(work.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                results = self.batch_fn(texts)
+                # A short result list would leave the unmatched callers waiting forever
+                if len(results) != len(batch):
+                    raise ValueError(f"Batch function returned {len(results)} results for {len(batch)} texts")
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+            except Exception as e:
+                logger.error(f"Error in micro-batch of {len(batch)} texts: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
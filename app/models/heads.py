@@ -0,0 +1,82 @@
+import json
+import logging
+import os
+from typing import Dict, List
+import torch
+
+logger = logging.getLogger(__name__)
+
+class ClassificationHead:
+    """
+    A lightweight linear classifier over the encoder's [CLS] hidden state
+
+    Heads are stored as a directory containing:
+        head.json   {"labels": [...], "multi_label": false}
+        head.pt     torch.save({'weight': Tensor[n_labels, hidden], 'bias': Tensor[n_labels]})
+
+    Because heads reuse the hidden state of the sentiment forward pass,
+    each extra signal costs one small matrix product per batch.
+    """
+
+    def __init__(self, name: str, labels: List[str], weight: torch.Tensor, bias: torch.Tensor,
+                 multi_label: bool = False):
+        if weight.shape[0] != len(labels):
+            raise ValueError(f"Head '{name}' has {weight.shape[0]} outputs but {len(labels)} labels")
+        self.name = name
+        self.labels = labels
+        self.weight = weight.float()
+        self.bias = bias.float()
+        self.multi_label = multi_label
+
+    @classmethod
+    def load(cls, directory: str) -> 'ClassificationHead':
+        with open(os.path.join(directory, 'head.json')) as f:
+            spec = json.load(f)
+        state = torch.load(os.path.join(directory, 'head.pt'), map_location='cpu', weights_only=True)
+        return cls(
+            spec.get('name', os.path.basename(os.path.normpath(directory))),
+            spec['labels'],
+            state['weight'],
+            state['bias'],
+            spec.get('multi_label', False)
+        )
+
+    def probabilities(self, hidden: torch.Tensor) -> torch.Tensor:
+        """Class probabilities for a batch of [CLS] hidden states"""
+        logits = hidden @ self.weight.T + self.bias
+        return torch.sigmoid(logits) if self.multi_label else torch.softmax(logits, dim=-1)
+
+    def decode(self, probabilities: List[float]) -> Dict:
+        """Turn one row of probabilities into a result dict"""
+        best = max(range(len(probabilities)), key=lambda i: probabilities[i])
+        return {
+            'label': self.labels[best],
+            'score': probabilities[best],
+            'scores': dict(zip(self.labels, probabilities))
+        }
+
+def load_heads(heads_dir: str, hidden_size: int) -> Dict[str, ClassificationHead]:
+    """
+    Load every head found in subdirectories of heads_dir
+
+    Heads that fail to load or do not match the encoder's hidden size are
+    skipped with a warning so a bad head never blocks sentiment analysis.
+    """
+    heads = {}
+    if not heads_dir or not os.path.isdir(heads_dir):
+        return heads
+
+    for entry in sorted(os.listdir(heads_dir)):
+        directory = os.path.join(heads_dir, entry)
+        if not os.path.isfile(os.path.join(directory, 'head.json')):
+            continue
+        try:
+            head = ClassificationHead.load(directory)
+            if head.weight.shape[1] != hidden_size:
+                raise ValueError(f"expects hidden size {head.weight.shape[1]}, encoder has {hidden_size}")
+            heads[head.name] = head
+            logger.info(f"Loaded classification head '{head.name}' ({len(head.labels)} labels)")
+        except Exception as e:
+            logger.warning(f"Skipping classification head in {directory}: {e}")
+
+    return heads
@@ -0,0 +1,198 @@
+"""
+Agent Saad - Lexicon Sentiment Pre-filter
+A VADER-style rule scorer (word valences, negation, intensifiers, "but",
+capitals and exclamation marks) that costs microseconds per text, used to
+keep clearly non-negative mentions away from the transformer
+"""
+
+import logging
+import re
+from typing import Dict, List
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Word valences on VADER's -4..4 scale, tuned toward product and service complaints
+LEXICON = {
+    # Negative
+    'abysmal': -3.2, 'angry': -2.3, 'annoyed': -1.8, 'annoying': -1.9, 'appalling': -3.0, 'awful': -3.1,
+    'bad': -2.5, 'broke': -1.8, 'broken': -2.2, 'bug': -1.5, 'buggy': -2.1, 'bugs': -1.5, 'cancel': -1.2,
+    'cancelled': -1.4, 'charged': -1.0, 'complaint': -1.8, 'confusing': -1.4, 'crap': -2.6, 'crash': -2.0,
+    'crashed': -2.0, 'crashes': -2.0, 'crashing': -2.0, 'dead': -2.2, 'disappointed': -2.1,
+    'disappointing': -2.2, 'disaster': -3.1, 'disgusting': -3.0, 'down': -1.0, 'error': -1.6,
+    'errors': -1.6, 'fail': -2.3, 'failed': -2.3, 'failing': -2.3, 'fails': -2.3, 'failure': -2.4,
+    'fraud': -3.0, 'frustrated': -2.1, 'frustrating': -2.2, 'furious': -3.0, 'garbage': -2.8,
+    'glitch': -1.5, 'hacked': -2.6, 'hate': -2.7, 'hated': -2.7, 'horrible': -3.0, 'ignored': -1.8,
+    'issue': -1.0, 'issues': -1.0, 'lag': -1.3, 'laggy': -1.6, 'lawsuit': -2.2, 'leak': -1.8,
+    'lost': -1.5, 'mess': -2.0, 'misleading': -2.2, 'nightmare': -3.0, 'outage': -2.3, 'overcharged': -2.5,
+    'pathetic': -2.9, 'poor': -2.1, 'problem': -1.7, 'problems': -1.7, 'refund': -1.3, 'ridiculous': -2.1,
+    'rip-off': -2.8, 'ripoff': -2.8, 'rude': -2.2, 'sad': -2.1, 'scam': -3.0, 'slow': -1.4, 'stuck': -1.6,
+    'stupid': -2.4, 'sucks': -2.6, 'terrible': -3.1, 'trash': -2.6, 'ugh': -1.8, 'unacceptable': -2.8,
+    'unhappy': -2.2, 'unreliable': -2.2, 'unusable': -2.8, 'upset': -2.0, 'useless': -2.6, 'waste': -2.2,
+    'wasted': -2.2, 'worse': -2.4, 'worst': -3.1, 'wrong': -2.1,
+    # Positive
+    'amazing': 2.8, 'awesome': 3.1, 'best': 3.2, 'better': 1.9, 'brilliant': 2.8, 'easy': 1.9,
+    'excellent': 3.2, 'fantastic': 2.6, 'fast': 1.3, 'fine': 0.8, 'fixed': 1.5, 'glad': 2.0, 'good': 1.9,
+    'great': 3.1, 'happy': 2.7, 'helpful': 1.8, 'impressed': 2.1, 'impressive': 2.3, 'love': 3.2,
+    'loved': 2.9, 'loving': 2.9, 'nice': 1.8, 'perfect': 2.7, 'pleased': 2.1, 'quick': 1.2,
+    'recommend': 1.5, 'reliable': 1.8, 'resolved': 1.6, 'smooth': 1.7, 'solid': 1.6, 'sorted': 1.3,
+    'thank': 1.5, 'thanks': 1.9, 'useful': 1.9, 'win': 2.8, 'wonderful': 2.7, 'works': 1.0,
+    'working': 0.8, 'wow': 2.8,
+}
+
+# Multi-word expressions scored as one token
+PHRASES = {
+    'not working': -2.5, "doesn't work": -2.5, 'does not work': -2.5, "won't load": -2.3,
+    'charged twice': -2.6, 'money back': -1.6, 'no response': -1.9, 'still waiting': -1.6,
+    'waste of time': -2.6, 'waste of money': -2.8, 'customer service': 0.0, 'thank you': 1.9,
+    'works great': 3.0, 'well done': 2.4,
+}
+
+NEGATIONS = {
+    'not', 'no', 'never', 'nothing', 'nobody', 'none', 'neither', 'nor', 'nowhere', 'cannot', 'without',
+    "isn't", "aren't", "wasn't", "weren't", "don't", "doesn't", "didn't", "can't", "couldn't", "won't",
+    "wouldn't", "shouldn't", "hasn't", "haven't", "hadn't", 'isnt', 'dont', 'doesnt', 'didnt', 'cant', 'wont'
+}
+BOOSTERS = {
+    'very': 0.293, 'really': 0.293, 'so': 0.293, 'extremely': 0.293, 'totally': 0.293, 'absolutely': 0.293,
+    'completely': 0.293, 'super': 0.293, 'incredibly': 0.293, 'utterly': 0.293, 'always': 0.2,
+    'slightly': -0.293, 'somewhat': -0.293, 'kinda': -0.293, 'barely': -0.293, 'little': -0.293
+}
+
+NEGATION_SCALE = -0.74
+CAPS_BOOST = 0.733
+EXCLAMATION_BOOST = 0.292
+NORMALIZATION_ALPHA = 15
+
+_TOKEN = re.compile(r"[A-Za-z][A-Za-z'\-]*|!")
+
+class LexiconScorer:
+    """
+    Rule-based sentiment score in [-1, 1] for a batch of texts
+
+    Phrases and tokens are found with one regex pass per text; the tokens of
+    the whole batch are then scored together with numpy (sorted-vocabulary
+    lookup, negation and booster windows, "but" clauses, emphasis and
+    normalization), with no per-token Python code.
+    """
+
+    def __init__(self, lexicon_path: str = None):
+        """
+        Args:
+            lexicon_path: Optional VADER-format lexicon (token<TAB>valence...)
+                whose entries are added to or override the built-in ones
+        """
+        self.lexicon = dict(LEXICON)
+        if lexicon_path:
+            self.lexicon.update(self._load_lexicon(lexicon_path))
+        self.phrase_pattern = re.compile(
+            '|'.join(re.escape(phrase) for phrase in sorted(PHRASES, key=len, reverse=True)), re.IGNORECASE
+        )
+
+        # One sorted vocabulary with parallel valence, booster and negation columns
+        vocabulary = sorted(set(self.lexicon) | set(BOOSTERS) | NEGATIONS)
+        self.vocabulary = np.array(vocabulary, dtype=str)
+        self.in_lexicon = np.array([word in self.lexicon for word in vocabulary])
+        self.valences = np.array([self.lexicon.get(word, 0.0) for word in vocabulary])
+        self.boosts = np.array([BOOSTERS.get(word, 0.0) for word in vocabulary])
+        self.negations = np.array([word in NEGATIONS for word in vocabulary])
+
+    @staticmethod
+    def _load_lexicon(path: str) -> Dict[str, float]:
+        entries = {}
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                if len(fields) >= 2:
+                    try:
+                        entries[fields[0].lower()] = float(fields[1])
+                    except ValueError:
+                        continue
+        logger.info(f"Loaded {len(entries)} lexicon entries from {path}")
+        return entries
+
+    def _tokenize(self, text: str):
+        """(words, exclamation count, summed phrase valence) of one text"""
+        phrase_total = 0.0
+        if self.phrase_pattern.search(text):
+            def replace(match):
+                nonlocal phrase_total
+                phrase_total += PHRASES[match.group(0).lower()]
+                return ' , '
+            text = self.phrase_pattern.sub(replace, text)
+        tokens = _TOKEN.findall(text)
+        exclamations = tokens.count('!')
+        if exclamations:
+            tokens = [token for token in tokens if token != '!']
+        return tokens, exclamations, phrase_total
+
+    def _lookup(self, lowered: np.ndarray) -> np.ndarray:
+        """Vocabulary index of each token, or -1 if it is not in the vocabulary"""
+        index = np.searchsorted(self.vocabulary, lowered)
+        index[index == len(self.vocabulary)] = 0
+        return np.where(self.vocabulary[index] == lowered, index, -1)
+
+    def _valence_sums(self, tokenized) -> np.ndarray:
+        """Summed word valence of each text, scoring all tokens of the batch at once"""
+        n = len(tokenized)
+        counts = np.array([len(tokens) for tokens, _, _ in tokenized])
+        words = np.array([token for tokens, _, _ in tokenized for token in tokens], dtype=str)
+        if not len(words):
+            return np.zeros(n)
+        doc = np.repeat(np.arange(n), counts)
+        position = np.arange(len(words)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        lowered = np.char.lower(words)
+        index = self._lookup(lowered)
+        known = index >= 0
+        valence = np.where(known, self.valences[index], 0.0)
+        boost = np.where(known, self.boosts[index], 0.0)
+        negation = np.where(known, self.negations[index], False) | np.char.endswith(lowered, "n't")
+        scored = known & self.in_lexicon[index]
+        sign = np.where(valence > 0, 1.0, -1.0)
+
+        # Capitalized words stand out only when the rest of the text is not shouting
+        upper = np.char.isupper(words)
+        shouting = np.bincount(doc, weights=upper & (np.char.str_len(words) > 1), minlength=n)
+        mixed_case = (shouting > 0) & (shouting < counts)
+        valence = valence + np.where(scored & upper & mixed_case[doc], sign * CAPS_BOOST, 0.0)
+
+        # Boosters and negations up to three words back, within the same text
+        negated = np.zeros(len(words), dtype=bool)
+        for distance in range(1, 4):
+            before = np.zeros(len(words), dtype=bool)
+            before[distance:] = position[distance:] >= distance
+            previous = np.roll(np.arange(len(words)), distance)
+            valence = valence + np.where(
+                before & scored, sign * boost[previous] * (1 - 0.05 * (distance - 1)), 0.0
+            )
+            negated |= before & negation[previous]
+        valence = np.where(scored & negated, valence * NEGATION_SCALE, valence)
+
+        # The clause after the first "but" carries the sentiment
+        pivot = np.full(n, np.iinfo(np.int64).max)
+        is_but = lowered == 'but'
+        np.minimum.at(pivot, doc[is_but], position[is_but])
+        has_but = pivot[doc] != np.iinfo(np.int64).max
+        valence = np.where(has_but, np.where(position < pivot[doc], valence * 0.5, valence * 1.5), valence)
+
+        return np.bincount(doc, weights=valence, minlength=n)
+
+    def score_batch(self, texts: List[str]) -> np.ndarray:
+        """
+        Score many texts
+
+        Returns:
+            Array of compound scores in [-1, 1], one per text (0 for empty
+            text or text without sentiment words)
+        """
+        if not texts:
+            return np.zeros(0)
+        tokenized = [self._tokenize(text or '') for text in texts]
+        sums = self._valence_sums(tokenized) + np.array([phrase_total for _, _, phrase_total in tokenized])
+        emphasis = np.minimum(np.array([exclamations for _, exclamations, _ in tokenized]), 4) * EXCLAMATION_BOOST
+        sums = sums + np.sign(sums) * emphasis
+        return sums / np.sqrt(sums * sums + NORMALIZATION_ALPHA)
+
+    def score(self, text: str) -> float:
+        return float(self.score_batch([text])[0])
@@ -1,8 +1,34 @@
+from config import Config  # first: sets the hub offline flags before transformers loads
 from transformers import pipeline
+import torch
 import logging
+from typing import List, Dict
+from app.models.heads import load_heads
+from app.models.weights import load_snapshot
 
 logger = logging.getLogger(__name__)
 
+NEUTRAL_RESULT = {
+    'label': 'NEUTRAL',
+    'score': 0.5,
+    'normalized_score': 0.0
+}
+
+ERROR_RESULT = {
+    'label': 'ERROR',
+    'score': 0.0,
+    'normalized_score': 0.0
+}
+
+# Response strategy per issue category (also the label set of an issue_category head)
+RESPONSE_TEMPLATES = {
+    'technical': "Technical Issue: Acknowledge the bug, provide workaround if available, and escalate to engineering team.",
+    'billing': "Billing Concern: Review account, offer resolution options, escalate to billing department if needed.",
+    'performance': "Performance Issue: Check system status, provide troubleshooting steps, escalate if widespread.",
+    'support': "Support Request: Respond promptly with helpful resources, offer direct assistance.",
+    'strong_negative': "Strong Negative: Respond empathetically, offer to discuss privately, involve senior support."
+}
+
 class SentimentAnalyzer:
     _instance = None
     
@@ -17,13 +43,26 @@ class SentimentAnalyzer:
         try:
             # Using distilbert-base-uncased-finetuned-sst-2-english (free and fast)
             logger.info("Loading sentiment analysis model...")
-            import torch
+            if Config.MODEL_SNAPSHOT_DIR:
+                # Memory-mapped weights, shared by every process using the snapshot
+                model, tokenizer = load_snapshot(Config.MODEL_SNAPSHOT_DIR)
+            else:
+                model, tokenizer = Config.SENTIMENT_MODEL, None
             self.classifier = pipeline(
                 "sentiment-analysis",
-                model="distilbert-base-uncased-finetuned-sst-2-english",
+                model=model,
+                tokenizer=tokenizer,
                 framework="pt",  # Explicitly use PyTorch
                 device=-1  # Use CPU (-1), for GPU use 0
             )
+            self.tokenizer = self.classifier.tokenizer
+            self.model = self.classifier.model
+            self.model.eval()
+            # Extra classification heads sharing the encoder's forward pass
+            self.heads = load_heads(Config.CLASSIFIER_HEADS_DIR, self.model.config.hidden_size)
+            self.max_tokens = min(Config.SENTIMENT_MAX_TOKENS, self.tokenizer.model_max_length)
+            # Room left for the [CLS]/[SEP] tokens the pipeline adds
+            self.window_tokens = self.max_tokens - self.tokenizer.num_special_tokens_to_add()
             logger.info("Sentiment analysis model loaded successfully")
         except Exception as e:
             logger.error(f"Failed to load sentiment model: {e}")
@@ -40,37 +79,196 @@ class SentimentAnalyzer:
                 'normalized_score': float between -1 and 1
             }
         """
+        return self.analyze_batch([text])[0]
+    
+    def analyze_batch(self, texts: List[str], chunking: bool = None, with_embeddings: bool = False) -> List[dict]:
+        """
+        Analyze sentiment of many texts in length-bucketed batches
+        
+        Texts are truncated by the tokenizer rather than by character count.
+        With chunking enabled, texts longer than the model window are split
+        into overlapping windows whose scores are aggregated per text.
+        
+        Args:
+            texts: Texts to analyze
+            chunking: Override Config.SENTIMENT_CHUNKING
+            with_embeddings: Also return an L2-normalized sentence 'embedding'
+                (list of floats) per text, for incident grouping
+        
+        Returns:
+            List of sentiment dicts in the same order as texts
+        """
+        if chunking is None:
+            chunking = Config.SENTIMENT_CHUNKING
+        
         try:
+            return self._analyze_texts(texts, chunking, with_embeddings)
+        except Exception as e:
+            if len(texts) == 1:
+                logger.error(f"Error analyzing sentiment: {e}")
+                return [dict(ERROR_RESULT)]
+            # Retry one by one so a single bad text does not blank the whole batch
+            logger.warning(f"Error analyzing batch of {len(texts)} texts, retrying individually: {e}")
+            return [self.analyze_batch([text], chunking, with_embeddings)[0] for text in texts]
+    
+    def _analyze_texts(self, texts: List[str], chunking: bool, with_embeddings: bool) -> List[dict]:
+        """analyze_batch without error handling; raises if any text fails"""
+        results = [dict(NEUTRAL_RESULT) for _ in texts]
+        
+        # Expand each non-empty text into one or more model inputs
+        inputs = []
+        for index, text in enumerate(texts):
             if not text or len(text.strip()) == 0:
-                return {
-                    'label': 'NEUTRAL',
-                    'score': 0.5,
-                    'normalized_score': 0.0
+                continue
+            token_ids = self.tokenizer.encode(text, add_special_tokens=False)
+            for chunk_ids in self._split_tokens(token_ids, chunking):
+                inputs.append((index, chunk_ids))
+        
+        if not inputs:
+            return results
+        
+        # Embeddings come from the sentiment encoder unless a dedicated model is configured
+        pooled = with_embeddings and not Config.EMBEDDING_MODEL
+        raw_results = self._classify_bucketed([chunk_ids for _, chunk_ids in inputs], pooled)
+        
+        # Aggregate chunk scores per text, weighted by chunk length
+        totals = {}
+        head_totals = {}
+        embedding_totals = {}
+        for (index, chunk_ids), raw in zip(inputs, raw_results):
+            weight = max(len(chunk_ids), 1)
+            score_sum, weight_sum = totals.get(index, (0.0, 0))
+            totals[index] = (score_sum + self._normalize(raw) * weight, weight_sum + weight)
+            if 'embedding' in raw:
+                embedding_totals[index] = embedding_totals.get(index, 0) + raw['embedding'] * weight
+            for name, probabilities in raw.get('heads', {}).items():
+                summed = head_totals.setdefault(index, {}).setdefault(name, [0.0] * len(probabilities))
+                for i, probability in enumerate(probabilities):
+                    summed[i] += probability * weight
+        
+        for index, (score_sum, weight_sum) in totals.items():
+            normalized_score = score_sum / weight_sum
+            results[index] = {
+                'label': 'NEGATIVE' if normalized_score < 0 else 'POSITIVE',
+                'score': abs(normalized_score),
+                'normalized_score': normalized_score
+            }
+            if index in head_totals:
+                results[index]['heads'] = {
+                    name: self.heads[name].decode([value / weight_sum for value in summed])
+                    for name, summed in head_totals[index].items()
                 }
+        
+        if with_embeddings and Config.EMBEDDING_MODEL:
+            indices = list(totals)
+            embedding_totals = dict(zip(indices, self.embed([texts[i] for i in indices])))
+        for index, embedding in embedding_totals.items():
+            results[index]['embedding'] = torch.nn.functional.normalize(embedding, dim=-1).tolist()
+        
+        return results
+    
+    def _split_tokens(self, token_ids: List[int], chunking: bool) -> List[List[int]]:
+        """Split token ids into model-sized windows (or truncate to one)"""
+        window = self.window_tokens
+        if len(token_ids) <= window or not chunking:
+            return [token_ids[:window]]
+        
+        step = max(window - Config.SENTIMENT_CHUNK_STRIDE, 1)
+        chunks = []
+        for start in range(0, len(token_ids), step):
+            chunks.append(token_ids[start:start + window])
+            if start + window >= len(token_ids) or len(chunks) >= Config.SENTIMENT_MAX_CHUNKS:
+                break
+        return chunks
+    
+    def _classify_bucketed(self, token_chunks: List[List[int]], with_embeddings: bool = False) -> List[Dict]:
+        """
+        Run the model over token chunks, batching inputs of similar length
+        
+        Sorting by token length before batching means short tweets are not
+        padded to the length of the longest Reddit post in the same batch.
+        The encoder runs once per batch: sentiment comes from the model's own
+        classifier and every extra head reuses the same [CLS] hidden state.
+        With with_embeddings, each result also carries the mean-pooled final
+        hidden state as 'embedding' (a tensor).
+        """
+        batch_size = max(Config.SENTIMENT_BATCH_SIZE, 1)
+        order = sorted(range(len(token_chunks)), key=lambda i: len(token_chunks[i]))
+        raw_results = [None] * len(token_chunks)
+        id2label = self.model.config.id2label
+        
+        for start in range(0, len(order), batch_size):
+            bucket = order[start:start + batch_size]
+            encoded = self.tokenizer.pad(
+                {'input_ids': [self.tokenizer.build_inputs_with_special_tokens(token_chunks[i]) for i in bucket]},
+                return_tensors='pt'
+            )
             
-            # Truncate text if too long (model limit is 512 tokens)
-            text = text[:500]
-            
-            result = self.classifier(text)[0]
-            
-            # Normalize score to -1 (very negative) to 1 (very positive)
-            if result['label'] == 'NEGATIVE':
-                normalized_score = -(result['score'])
-            else:
-                normalized_score = result['score']
+            with torch.inference_mode():
+                output = self.model(**encoded, output_hidden_states=bool(self.heads) or with_embeddings)
+                probabilities = torch.softmax(output.logits, dim=-1)
+                head_probabilities = {}
+                embeddings = None
+                if with_embeddings:
+                    embeddings = self._mean_pool(output.hidden_states[-1], encoded['attention_mask'])
+                if self.heads:
+                    cls_hidden = output.hidden_states[-1][:, 0]
+                    head_probabilities = {
+                        name: head.probabilities(cls_hidden).tolist()
+                        for name, head in self.heads.items()
+                    }
             
-            return {
-                'label': result['label'],
-                'score': result['score'],
-                'normalized_score': normalized_score
-            }
-        except Exception as e:
-            logger.error(f"Error analyzing sentiment: {e}")
-            return {
-                'label': 'ERROR',
-                'score': 0.0,
-                'normalized_score': 0.0
-            }
+            scores, labels = probabilities.max(dim=-1)
+            for row, i in enumerate(bucket):
+                raw_results[i] = {
+                    'label': id2label[labels[row].item()],
+                    'score': scores[row].item(),
+                    'heads': {name: values[row] for name, values in head_probabilities.items()}
+                }
+                if embeddings is not None:
+                    raw_results[i]['embedding'] = embeddings[row]
+        
+        return raw_results
+    
+    @staticmethod
+    def _mean_pool(hidden: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """Average hidden states over real (non-padding) tokens"""
+        mask = attention_mask.unsqueeze(-1).to(hidden.dtype)
+        return (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1)
+    
+    def embed(self, texts: List[str]) -> List[torch.Tensor]:
+        """
+        Sentence embeddings from the dedicated Config.EMBEDDING_MODEL
+        
+        The model is loaded on first use. Returns one (unnormalized) tensor per text.
+        """
+        if getattr(self, 'embedding_model', None) is None:
+            from transformers import AutoModel, AutoTokenizer
+            logger.info(f"Loading embedding model {Config.EMBEDDING_MODEL}...")
+            self.embedding_tokenizer = AutoTokenizer.from_pretrained(Config.EMBEDDING_MODEL)
+            self.embedding_model = AutoModel.from_pretrained(Config.EMBEDDING_MODEL)
+            self.embedding_model.eval()
+        
+        embeddings = []
+        batch_size = max(Config.SENTIMENT_BATCH_SIZE, 1)
+        for start in range(0, len(texts), batch_size):
+            encoded = self.embedding_tokenizer(
+                texts[start:start + batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors='pt'
+            )
+            with torch.inference_mode():
+                output = self.embedding_model(**encoded)
+            embeddings.extend(self._mean_pool(output.last_hidden_state, encoded['attention_mask']))
+        return embeddings
+    
+    @staticmethod
+    def _normalize(result: Dict) -> float:
+        """Normalize score to -1 (very negative) to 1 (very positive)"""
+        if result['label'] == 'NEGATIVE':
+            return -(result['score'])
+        return result['score']
     
     def determine_urgency(self, sentiment_score: float, engagement: int = 0) -> str:
         """
@@ -98,38 +296,48 @@ class SentimentAnalyzer:
         else:
             return 'LOW'
     
-    def generate_response_recommendation(self, text: str, sentiment_label: str) -> str:
+    def categorize_issue(self, text: str) -> str:
         """
-        Generate a recommended response based on the content and sentiment
-        
-        Args:
-            text: The original text/complaint
-            sentiment_label: POSITIVE or NEGATIVE
+        Keyword heuristic for the issue category (used when no issue_category head is loaded)
         
         Returns:
-            str: Recommended response strategy
+            str: One of the RESPONSE_TEMPLATES keys, or None
         """
         text_lower = text.lower()
         
         # Detect specific issues
         if 'bug' in text_lower or 'error' in text_lower or 'crash' in text_lower:
-            return "Technical Issue: Acknowledge the bug, provide workaround if available, and escalate to engineering team."
-        
+            return 'technical'
         elif 'refund' in text_lower or 'money back' in text_lower or 'cancel' in text_lower:
-            return "Billing Concern: Review account, offer resolution options, escalate to billing department if needed."
-        
+            return 'billing'
         elif 'slow' in text_lower or 'down' in text_lower or 'not working' in text_lower:
-            return "Performance Issue: Check system status, provide troubleshooting steps, escalate if widespread."
-        
+            return 'performance'
         elif 'support' in text_lower or 'help' in text_lower or 'customer service' in text_lower:
-            return "Support Request: Respond promptly with helpful resources, offer direct assistance."
-        
+            return 'support'
         elif 'hate' in text_lower or 'terrible' in text_lower or 'worst' in text_lower:
-            return "Strong Negative: Respond empathetically, offer to discuss privately, involve senior support."
+            return 'strong_negative'
+        return None
+    
+    def generate_response_recommendation(self, text: str, sentiment_label: str, category: str = None) -> str:
+        """
+        Generate a recommended response based on the content and sentiment
+        
+        Args:
+            text: The original text/complaint
+            sentiment_label: POSITIVE or NEGATIVE
+            category: Issue category predicted by the issue_category head;
+                falls back to keyword heuristics when None or unknown
         
+        Returns:
+            str: Recommended response strategy
+        """
+        if category not in RESPONSE_TEMPLATES:
+            category = self.categorize_issue(text)
+        
+        if category in RESPONSE_TEMPLATES:
+            return RESPONSE_TEMPLATES[category]
+        
+        if sentiment_label == 'NEGATIVE':
+            return "General Negative Feedback: Thank for feedback, apologize for experience, offer to help resolve."
         else:
-            if sentiment_label == 'NEGATIVE':
-                return "General Negative Feedback: Thank for feedback, apologize for experience, offer to help resolve."
-            else:
-                return "Monitor: No immediate action required, but track for trends."
-
+            return "Monitor: No immediate action required, but track for trends."
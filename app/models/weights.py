@@ -0,0 +1,176 @@
+"""
+Agent Saad - Shared Model Weights
+Loads the sentiment model from a local safetensors snapshot with its
+weights memory-mapped, so every process using the snapshot (and every
+worker forked after preloading) shares one read-only copy of the weights
+"""
+
+import argparse
+import json
+import logging
+import os
+import struct
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+# torch is imported inside the loaders so memory_usage() stays cheap to import
+SAFETENSORS_DTYPES = {
+    'F64': 'float64',
+    'F32': 'float32',
+    'F16': 'float16',
+    'BF16': 'bfloat16',
+    'I64': 'int64',
+    'I32': 'int32',
+    'I16': 'int16',
+    'I8': 'int8',
+    'U8': 'uint8',
+    'BOOL': 'bool'
+}
+
+def load_safetensors_mmap(path: str) -> Dict:
+    """
+    Map a .safetensors file into memory without copying it
+
+    The whole file is mapped privately (copy-on-write) and each tensor is a
+    view into that mapping. Inference never writes to the weights, so the
+    pages stay shared with the OS page cache and with other processes.
+    """
+    import torch
+
+    with open(path, 'rb') as f:
+        header_size = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_size))
+    header.pop('__metadata__', None)
+
+    data_start = 8 + header_size
+    file_size = os.path.getsize(path)
+    buffer = torch.from_file(path, shared=False, size=file_size, dtype=torch.uint8)
+
+    tensors = {}
+    for name, spec in header.items():
+        begin, end = spec['data_offsets']
+        dtype = getattr(torch, SAFETENSORS_DTYPES[spec['dtype']])
+        raw = buffer[data_start + begin:data_start + end]
+        tensors[name] = raw.view(dtype).reshape(spec['shape'])
+    return tensors
+
+def load_snapshot(snapshot_dir: str):
+    """
+    Load tokenizer and sequence-classification model from a local snapshot
+
+    Never contacts the model hub. Weights must be in model.safetensors
+    (see `python -m app.models.weights snapshot`).
+
+    Returns:
+        tuple: (model, tokenizer)
+    """
+    from transformers import AutoConfig, AutoModelForSequenceClassification, AutoTokenizer
+
+    weights_path = os.path.join(snapshot_dir, 'model.safetensors')
+    if not os.path.exists(weights_path):
+        raise FileNotFoundError(f"No model.safetensors in {snapshot_dir}")
+
+    tokenizer = AutoTokenizer.from_pretrained(snapshot_dir, local_files_only=True)
+    config = AutoConfig.from_pretrained(snapshot_dir, local_files_only=True)
+    model = AutoModelForSequenceClassification.from_config(config)
+
+    # assign=True (torch 2.1+) makes the parameters the mmap-backed tensors themselves
+    state = load_safetensors_mmap(weights_path)
+    missing, unexpected = model.load_state_dict(state, strict=False, assign=True)
+    missing = [key for key in missing if key not in dict(model.named_buffers())]
+    if missing or unexpected:
+        raise ValueError(f"Snapshot does not match model (missing {missing}, unexpected {unexpected})")
+    model.tie_weights()
+    model.eval()
+
+    logger.info(f"Loaded memory-mapped model snapshot from {snapshot_dir}")
+    return model, tokenizer
+
+def save_snapshot(model_name: str, snapshot_dir: str):
+    """Download a model once and save it as a local safetensors snapshot"""
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(snapshot_dir)
+    AutoModelForSequenceClassification.from_pretrained(model_name).save_pretrained(
+        snapshot_dir, safe_serialization=True, max_shard_size='10GB'
+    )
+    logger.info(f"Saved {model_name} snapshot to {snapshot_dir}")
+
+def memory_usage(pid: int = None) -> Dict[str, int]:
+    """
+    RSS, PSS and shared memory of a process in kB (Linux /proc)
+
+    PSS splits shared pages between the processes mapping them, so summing
+    PSS over workers gives their true combined footprint.
+    """
+    usage = {}
+    try:
+        with open(f"/proc/{pid or 'self'}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('Rss', 'Pss', 'Shared_Clean', 'Shared_Dirty', 'Private_Clean', 'Private_Dirty'):
+                    usage[key.lower()] = int(value.split()[0])
+    except OSError:
+        pass
+    return usage
+
+def _benchmark(snapshot_dir: str, workers: int):
+    """Fork workers after loading the model one way or the other and report their memory"""
+    import multiprocessing
+    import torch
+    from transformers import AutoModelForSequenceClassification
+
+    def report(label, load):
+        context = multiprocessing.get_context('fork')
+        model = load()
+        results = context.Queue()
+
+        def worker():
+            # Touch every weight the way inference would (reads only)
+            with torch.inference_mode():
+                sum(parameter.sum().item() for parameter in model.parameters())
+            results.put((os.getpid(), memory_usage()))
+
+        processes = [context.Process(target=worker) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        usages = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        print(f"\n{label}")
+        print(f"{'pid':>8} {'rss kB':>10} {'pss kB':>10} {'private kB':>11}")
+        for pid, usage in usages:
+            private = usage.get('private_clean', 0) + usage.get('private_dirty', 0)
+            print(f"{pid:>8} {usage.get('rss', 0):>10} {usage.get('pss', 0):>10} {private:>11}")
+        print(f"{'total':>8} {sum(u.get('rss', 0) for _, u in usages):>10} "
+              f"{sum(u.get('pss', 0) for _, u in usages):>10}")
+
+    report("Private load in every worker (before)", lambda: AutoModelForSequenceClassification.from_pretrained(
+        snapshot_dir, local_files_only=True))
+    report("Memory-mapped snapshot, preloaded before fork (after)", lambda: load_snapshot(snapshot_dir)[0])
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the local model snapshot")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    snapshot = subparsers.add_parser('snapshot', help="Download the model into a local safetensors snapshot")
+    snapshot.add_argument('directory')
+    snapshot.add_argument('--model', default='distilbert-base-uncased-finetuned-sst-2-english')
+
+    benchmark = subparsers.add_parser('benchmark', help="Report per-worker memory before/after sharing")
+    benchmark.add_argument('directory')
+    benchmark.add_argument('--workers', type=int, default=4)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    if args.command == 'snapshot':
+        save_snapshot(args.model, args.directory)
+    else:
+        _benchmark(args.directory, args.workers)
+
+if __name__ == '__main__':
+    main()
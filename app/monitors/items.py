@@ -0,0 +1,52 @@
+import sys
+from datetime import datetime, timezone
+from typing import Optional
+
+class MentionItem:
+    """
+    One fetched post, tweet or comment
+
+    Only the raw fields are stored: the URL and ISO timestamp are derived
+    on access instead of being kept as extra strings per item, and author
+    and subreddit names are interned so repeat posters share one string.
+    """
+
+    __slots__ = ('source', 'id', 'text', 'author', 'created_utc', 'engagement', 'path', 'subreddit', 'reach')
+
+    def __init__(self, source: str, id: str, text: str, author: str, created_utc: Optional[float] = None,
+                 engagement: int = 0, path: str = '', subreddit: str = None, reach: int = 0):
+        """
+        Args:
+            source: 'Twitter' or 'Reddit'
+            id: Platform id of the item
+            text: Item text
+            author: '@username' on Twitter, the redditor name on Reddit
+            created_utc: Creation time as a Unix timestamp
+            engagement: Likes/retweets/replies or score/comments
+            path: Reddit permalink (unused for Twitter)
+            subreddit: Subreddit name (Reddit only)
+            reach: Audience size: author followers on Twitter, subreddit
+                subscribers on Reddit (0 if unknown)
+        """
+        self.source = source
+        self.id = id
+        self.text = text
+        self.author = sys.intern(author)
+        self.created_utc = created_utc
+        self.engagement = engagement
+        self.path = path
+        self.subreddit = sys.intern(subreddit) if subreddit else None
+        self.reach = reach
+
+    @property
+    def url(self) -> str:
+        if self.source == 'Reddit':
+            return f"https://reddit.com{self.path}"
+        return f"https://twitter.com/{self.author.lstrip('@')}/status/{self.id}"
+
+    @property
+    def created_at(self) -> Optional[str]:
+        if self.created_utc is None:
+            return None
+        return datetime.fromtimestamp(self.created_utc, tz=timezone.utc).isoformat()
+
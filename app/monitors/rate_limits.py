@@ -0,0 +1,150 @@
+import logging
+import threading
+import time
+from typing import Dict, Mapping, Optional, Tuple
+from app.components import components
+
+logger = logging.getLogger(__name__)
+
+class RateLimitManager:
+    """
+    Shared, non-blocking view of API quota across all platform clients
+
+    Quotas are kept in the shared database, so every process using the same
+    credentials (gunicorn workers, the scheduler process, sharded workers)
+    sees and spends one quota. Monitors and alerters reserve quota with
+    consume() before every call and report rate-limit response headers here
+    after it. Work that would exceed the remaining quota is skipped
+    (deferred) instead of sleeping, so one throttled source never stalls
+    the scheduler thread.
+    """
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super(RateLimitManager, cls).__new__(cls)
+        return cls._instance
+
+    def update(self, source: str, endpoint: str, remaining: Optional[int] = None,
+               reset_at: Optional[float] = None, limit: Optional[int] = None):
+        """Record the latest known quota for an endpoint"""
+        def change(quota):
+            quota = dict(quota or {'remaining': None, 'quota_limit': None, 'reset_at': None})
+            if remaining is not None:
+                quota['remaining'] = remaining
+            if limit is not None:
+                quota['quota_limit'] = limit
+            if reset_at is not None:
+                quota['reset_at'] = reset_at
+            return quota, None
+
+        components.db.modify_rate_limit(source, endpoint, change)
+
+    def update_from_headers(self, source: str, endpoint: str, headers: Mapping[str, str],
+                            throttled: bool = False):
+        """
+        Parse rate-limit headers from an HTTP response
+
+        Understands Twitter (x-rate-limit-*, reset as epoch seconds),
+        Reddit (x-ratelimit-*, reset as seconds from now) and the generic
+        Retry-After header sent by Slack on HTTP 429.
+
+        Args:
+            source: Platform name (Twitter/Reddit/Slack)
+            endpoint: Endpoint or route the quota applies to
+            headers: Response headers
+            throttled: True if the response was a 429
+        """
+        if headers is None:
+            return
+
+        headers = {key.lower(): value for key, value in headers.items()}
+        now = time.time()
+        remaining = limit = reset_at = None
+
+        try:
+            if 'x-rate-limit-remaining' in headers:
+                remaining = int(headers['x-rate-limit-remaining'])
+                limit = int(headers.get('x-rate-limit-limit', 0)) or None
+                if 'x-rate-limit-reset' in headers:
+                    reset_at = float(headers['x-rate-limit-reset'])
+            elif 'x-ratelimit-remaining' in headers:
+                remaining = int(float(headers['x-ratelimit-remaining']))
+                if 'x-ratelimit-reset' in headers:
+                    reset_at = now + float(headers['x-ratelimit-reset'])
+            if 'retry-after' in headers:
+                reset_at = now + float(headers['retry-after'])
+                remaining = 0
+        except ValueError as e:
+            logger.warning(f"Could not parse {source} rate-limit headers: {e}")
+            return
+
+        if throttled:
+            remaining = 0
+            if reset_at is None:
+                reset_at = now + 60
+
+        self.update(source, endpoint, remaining=remaining, reset_at=reset_at, limit=limit)
+
+    def can_call(self, source: str, endpoint: str, cost: int = 1) -> bool:
+        """
+        Check whether a call fits in the known remaining quota
+
+        Unknown endpoints and endpoints whose reset time has passed are
+        assumed to be available.
+        """
+        return self._fits(components.db.get_rate_limit(source, endpoint), cost)[0]
+
+    def consume(self, source: str, endpoint: str, cost: int = 1) -> bool:
+        """
+        Reserve quota for calls about to be made
+
+        The stored estimate is decremented until the response headers of the
+        call replace it, so concurrent callers (in any process) cannot all
+        spend the last of the quota.
+
+        Returns:
+            bool: False (and nothing reserved) if the calls do not fit
+        """
+        def change(quota):
+            fits, quota = self._fits(quota, cost)
+            if not fits:
+                return None, False
+            if quota is not None and quota['remaining'] is not None:
+                quota['remaining'] = max(quota['remaining'] - cost, 0)
+            return quota, True
+
+        return components.db.modify_rate_limit(source, endpoint, change)
+
+    @staticmethod
+    def _fits(quota: Optional[Dict], cost: int) -> Tuple[bool, Optional[Dict]]:
+        """Whether cost calls fit the quota, and the quota refilled if its reset time has passed"""
+        if quota is None or quota['remaining'] is None:
+            return True, quota
+        quota = dict(quota)
+        if quota['reset_at'] is not None and quota['reset_at'] <= time.time():
+            quota['remaining'] = quota['quota_limit']
+            quota['reset_at'] = None
+            return True, quota
+        return quota['remaining'] >= cost, quota
+
+    def retry_after(self, source: str, endpoint: str) -> float:
+        """Seconds until the endpoint's quota resets (0 if available now)"""
+        quota = components.db.get_rate_limit(source, endpoint)
+        if self._fits(quota, 1)[0] or quota['reset_at'] is None:
+            return 0.0
+        return max(quota['reset_at'] - time.time(), 0.0)
+
+    def get_status(self) -> Dict:
+        """Snapshot of all tracked quotas"""
+        return {
+            f"{quota['source']}:{quota['endpoint']}": {
+                'remaining': quota['remaining'],
+                'limit': quota['quota_limit'],
+                'resets_in_seconds': max(round(quota['reset_at'] - time.time()), 0) if quota['reset_at'] else None
+            }
+            for quota in components.db.get_rate_limits()
+        }
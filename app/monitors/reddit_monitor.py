@@ -1,54 +1,120 @@
 import praw
 import logging
-from typing import List, Dict
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from prawcore.exceptions import TooManyRequests
+from typing import Dict, Iterator, List, Optional, Tuple
 from config import Config
-from datetime import datetime, timezone
+from app.monitors.items import MentionItem
+from app.monitors.rate_limits import RateLimitManager
 
 logger = logging.getLogger(__name__)
 
+# praw shares one OAuth quota across all endpoints
+API_ENDPOINT = 'api'
+
+# Items per listing (and info) request
+PAGE_SIZE = 100
+
+def page_count(limit: int) -> int:
+    """API calls needed to fetch limit items from a listing"""
+    return max((limit + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+
 class RedditMonitor:
     def __init__(self):
         self.reddit = None
+        self._local = threading.local()
         self.setup_client()
     
+    @staticmethod
+    def _create_client() -> praw.Reddit:
+        hosts = {}
+        if Config.REDDIT_API_BASE_URL:
+            # Token and API requests both go to the override host
+            hosts = {'oauth_url': Config.REDDIT_API_BASE_URL, 'reddit_url': Config.REDDIT_API_BASE_URL}
+        return praw.Reddit(
+            client_id=Config.REDDIT_CLIENT_ID,
+            client_secret=Config.REDDIT_CLIENT_SECRET,
+            user_agent=Config.REDDIT_USER_AGENT,
+            **hosts
+        )
+    
+    def _thread_client(self) -> praw.Reddit:
+        """praw is not thread-safe, so each scanning thread gets its own client"""
+        client = getattr(self._local, 'reddit', None)
+        if client is None:
+            client = self._local.reddit = self._create_client()
+        return client
+    
     def setup_client(self):
         """Setup Reddit API client"""
         try:
             if Config.REDDIT_CLIENT_ID and Config.REDDIT_CLIENT_SECRET:
-                self.reddit = praw.Reddit(
-                    client_id=Config.REDDIT_CLIENT_ID,
-                    client_secret=Config.REDDIT_CLIENT_SECRET,
-                    user_agent=Config.REDDIT_USER_AGENT
-                )
+                self.reddit = self._create_client()
                 logger.info("Reddit client initialized successfully")
             else:
                 logger.warning("Reddit API credentials not configured")
         except Exception as e:
             logger.error(f"Failed to initialize Reddit client: {e}")
     
-    def search_mentions(self, keywords: List[str], subreddits: List[str] = None, limit: int = 10) -> List[Dict]:
+    def _record_limits(self, reddit: praw.Reddit = None):
+        """Copy praw's view of the OAuth quota into the shared rate-limit manager"""
+        limits = (reddit or self.reddit).auth.limits
+        if limits.get('remaining') is None:
+            return
+        RateLimitManager().update(
+            'Reddit',
+            API_ENDPOINT,
+            remaining=int(limits['remaining']),
+            reset_at=limits.get('reset_timestamp')
+        )
+    
+    def reserve_requests(self, count: int = 1) -> bool:
+        """
+        Reserve quota for the next count API calls before praw makes them
+        
+        praw would sleep on an exhausted limit; deferring instead keeps the
+        scheduler moving. _record_limits replaces the estimate afterwards.
+        """
+        rate_limits = RateLimitManager()
+        if rate_limits.consume('Reddit', API_ENDPOINT, count):
+            return True
+        logger.warning(
+            f"Reddit rate limited, deferring for "
+            f"{rate_limits.retry_after('Reddit', API_ENDPOINT):.0f}s"
+        )
+        return False
+    
+    def search_mentions(self, keywords: List[str], subreddits: List[str] = None,
+                        limit: int = 10) -> Iterator[MentionItem]:
         """
         Search for Reddit posts and comments mentioning keywords
         
+        praw listings are lazy, so posts are yielded as each page arrives.
+        
         Args:
             keywords: List of keywords to search for
             subreddits: List of subreddit names (if None, searches all)
             limit: Maximum number of results per keyword
         
-        Returns:
-            List of post/comment data dictionaries
+        Yields:
+            MentionItem per post
         """
         if not self.reddit:
             logger.warning("Reddit client not initialized")
-            return []
+            return
         
-        results = []
+        found = 0
         
         try:
             for keyword in keywords:
                 if not keyword.strip():
                     continue
                 
+                if not self.reserve_requests(page_count(limit)):
+                    break
+                
                 # Search posts
                 if subreddits:
                     search_target = '+'.join(subreddits)
@@ -56,27 +122,35 @@ class RedditMonitor:
                 else:
                     subreddit = self.reddit.subreddit('all')
                 
-                posts = subreddit.search(keyword, limit=limit, sort='new')
+                for post in subreddit.search(keyword, limit=limit, sort='new'):
+                    found += 1
+                    yield self._post_item(post)
                 
-                for post in posts:
-                    results.append({
-                        'id': post.id,
-                        'text': f"{post.title}\n{post.selftext}",
-                        'author': str(post.author) if post.author else '[deleted]',
-                        'created_at': datetime.fromtimestamp(post.created_utc, tz=timezone.utc).isoformat(),
-                        'url': f"https://reddit.com{post.permalink}",
-                        'engagement': post.score + post.num_comments,
-                        'subreddit': str(post.subreddit)
-                    })
+                self._record_limits()
             
-            logger.info(f"Found {len(results)} Reddit posts")
-            return results
+            logger.info(f"Found {found} Reddit posts")
             
+        except TooManyRequests as e:
+            RateLimitManager().update_from_headers('Reddit', API_ENDPOINT, e.response.headers, throttled=True)
+            logger.warning(f"Reddit rate limited, deferring remaining keywords ({found} posts kept)")
         except Exception as e:
             logger.error(f"Error searching Reddit: {e}")
-            return []
     
-    def get_subreddit_posts(self, subreddit_name: str, limit: int = 10) -> List[Dict]:
+    @staticmethod
+    def _post_item(post) -> MentionItem:
+        return MentionItem(
+            'Reddit',
+            post.id,
+            f"{post.title}\n{post.selftext}",
+            str(post.author) if post.author else '[deleted]',
+            created_utc=post.created_utc,
+            engagement=post.score + post.num_comments,
+            path=post.permalink,
+            subreddit=str(post.subreddit),
+            reach=getattr(post, 'subreddit_subscribers', 0) or 0
+        )
+    
+    def get_subreddit_posts(self, subreddit_name: str, limit: int = 10) -> Iterator[MentionItem]:
         """
         Get recent posts from a specific subreddit
         
@@ -84,35 +158,26 @@ class RedditMonitor:
             subreddit_name: Name of the subreddit
             limit: Maximum number of posts
         
-        Returns:
-            List of post data dictionaries
+        Yields:
+            MentionItem per post
         """
         if not self.reddit:
-            return []
+            return
+        
+        if not self.reserve_requests(page_count(limit)):
+            return
         
         try:
             subreddit = self.reddit.subreddit(subreddit_name)
-            posts = subreddit.new(limit=limit)
-            
-            results = []
-            for post in posts:
-                results.append({
-                    'id': post.id,
-                    'text': f"{post.title}\n{post.selftext}",
-                    'author': str(post.author) if post.author else '[deleted]',
-                    'created_at': datetime.fromtimestamp(post.created_utc, tz=timezone.utc).isoformat(),
-                    'url': f"https://reddit.com{post.permalink}",
-                    'engagement': post.score + post.num_comments,
-                    'subreddit': str(post.subreddit)
-                })
+            for post in subreddit.new(limit=limit):
+                yield self._post_item(post)
             
-            return results
+            self._record_limits()
             
         except Exception as e:
             logger.error(f"Error getting subreddit posts: {e}")
-            return []
     
-    def monitor_comments(self, subreddit_name: str, keywords: List[str], limit: int = 20) -> List[Dict]:
+    def monitor_comments(self, subreddit_name: str, keywords: List[str], limit: int = 20) -> Iterator[MentionItem]:
         """
         Monitor recent comments in a subreddit for keywords
         
@@ -121,37 +186,153 @@ class RedditMonitor:
             keywords: Keywords to look for
             limit: Maximum number of comments to check
         
-        Returns:
-            List of matching comment data
+        Yields:
+            MentionItem per matching comment
         """
         if not self.reddit:
-            return []
+            return
+        
+        if not self.reserve_requests(page_count(limit)):
+            return
         
         try:
             subreddit = self.reddit.subreddit(subreddit_name)
-            comments = subreddit.comments(limit=limit)
-            
-            results = []
             keywords_lower = [k.lower() for k in keywords if k.strip()]
             
-            for comment in comments:
+            for comment in subreddit.comments(limit=limit):
                 comment_text_lower = comment.body.lower()
                 
                 # Check if any keyword is in the comment
                 if any(keyword in comment_text_lower for keyword in keywords_lower):
-                    results.append({
-                        'id': comment.id,
-                        'text': comment.body,
-                        'author': str(comment.author) if comment.author else '[deleted]',
-                        'created_at': datetime.fromtimestamp(comment.created_utc, tz=timezone.utc).isoformat(),
-                        'url': f"https://reddit.com{comment.permalink}",
-                        'engagement': comment.score,
-                        'subreddit': str(comment.subreddit)
-                    })
+                    yield MentionItem(
+                        'Reddit',
+                        comment.id,
+                        comment.body,
+                        str(comment.author) if comment.author else '[deleted]',
+                        created_utc=comment.created_utc,
+                        engagement=comment.score,
+                        path=comment.permalink,
+                        subreddit=str(comment.subreddit)
+                    )
             
-            return results
+            self._record_limits()
             
         except Exception as e:
             logger.error(f"Error monitoring comments: {e}")
-            return []
+    
+    def scan_comments(self, threads: List[Dict], keywords: List[str]) -> Iterator[Tuple[str, Dict, List[MentionItem]]]:
+        """
+        Walk the comment forests of several threads concurrently
+        
+        Thread metadata for all submissions is fetched in one request and
+        threads whose comment count has not changed since the last scan are
+        skipped. Changed threads are expanded with at most
+        REDDIT_REPLACE_MORE_LIMIT "load more" calls each; only comments newer
+        than the thread's high-water mark that mention a keyword are kept.
+        
+        Args:
+            threads: Dicts with submission_id, num_comments and last_comment_utc
+                (the marks from the previous scan, None for new threads)
+            keywords: Keywords a comment must contain to be returned
+        
+        Yields:
+            (submission_id, new mark, matching comments) per thread; skipped
+            threads come first with their old mark, scanned ones follow in
+            completion order
+        """
+        if not self.reddit or not threads:
+            return
+        
+        pattern = keyword_pattern(keywords)
+        if pattern is None:
+            return
+        
+        marks = {thread['submission_id']: thread for thread in threads}
+        try:
+            if not self.reserve_requests(page_count(len(marks))):
+                return
+            changed = []
+            fullnames = [f"t3_{submission_id}" for submission_id in marks]
+            for submission in self.reddit.info(fullnames=fullnames):
+                if submission.num_comments != marks[submission.id].get('num_comments'):
+                    changed.append((submission.id, submission.num_comments))
+            self._record_limits()
+        except TooManyRequests as e:
+            RateLimitManager().update_from_headers('Reddit', API_ENDPOINT, e.response.headers, throttled=True)
+            logger.warning("Reddit rate limited, skipping comment scan")
+            return
+        except Exception as e:
+            logger.error(f"Error fetching Reddit thread metadata: {e}")
+            return
+        
+        # Unchanged threads still count as scanned so they rotate to the back
+        changed_ids = {submission_id for submission_id, _ in changed}
+        for submission_id, thread in marks.items():
+            if submission_id not in changed_ids:
+                yield submission_id, {
+                    'num_comments': thread.get('num_comments'),
+                    'last_comment_utc': thread.get('last_comment_utc')
+                }, []
+        
+        logger.info(f"Scanning comments of {len(changed)} of {len(marks)} Reddit threads")
+        with ThreadPoolExecutor(max_workers=max(Config.REDDIT_COMMENT_WORKERS, 1),
+                                thread_name_prefix='reddit-comments') as executor:
+            futures = {
+                executor.submit(
+                    self._scan_thread, submission_id, num_comments,
+                    marks[submission_id].get('last_comment_utc'), pattern
+                ): submission_id
+                for submission_id, num_comments in changed
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    yield (futures[future],) + result
+    
+    def _scan_thread(self, submission_id: str, num_comments: int, last_comment_utc: Optional[float],
+                     pattern) -> Optional[Tuple[Dict, List[MentionItem]]]:
+        """Fetch one thread's new comments; None if it could not be scanned"""
+        # The submission itself plus at most REDDIT_REPLACE_MORE_LIMIT "load more" calls
+        if not self.reserve_requests(1 + max(Config.REDDIT_REPLACE_MORE_LIMIT, 0)):
+            return None
+        
+        reddit = self._thread_client()
+        try:
+            submission = reddit.submission(id=submission_id)
+            submission.comment_sort = 'new'
+            submission.comments.replace_more(limit=Config.REDDIT_REPLACE_MORE_LIMIT)
+            
+            newest = last_comment_utc or 0
+            matches = []
+            for comment in submission.comments.list():
+                if last_comment_utc is not None and comment.created_utc <= last_comment_utc:
+                    continue
+                newest = max(newest, comment.created_utc)
+                if pattern.search(comment.body):
+                    matches.append(MentionItem(
+                        'Reddit',
+                        comment.id,
+                        comment.body,
+                        str(comment.author) if comment.author else '[deleted]',
+                        created_utc=comment.created_utc,
+                        engagement=comment.score,
+                        path=comment.permalink,
+                        subreddit=str(submission.subreddit)
+                    ))
+            
+            self._record_limits(reddit)
+            return {'num_comments': num_comments, 'last_comment_utc': newest or None}, matches
+            
+        except TooManyRequests as e:
+            RateLimitManager().update_from_headers('Reddit', API_ENDPOINT, e.response.headers, throttled=True)
+            logger.warning(f"Reddit rate limited while scanning thread {submission_id}")
+        except Exception as e:
+            logger.error(f"Error scanning comments of thread {submission_id}: {e}")
+        return None
 
+def keyword_pattern(keywords: List[str]):
+    """Case-insensitive regex matching any keyword, or None if there are none"""
+    terms = [re.escape(keyword.strip()) for keyword in keywords if keyword.strip()]
+    if not terms:
+        return None
+    return re.compile('|'.join(sorted(terms, key=len, reverse=True)), re.IGNORECASE)
@@ -1,10 +1,49 @@
 import tweepy
 import logging
-from typing import List, Dict
+import requests
+from typing import Iterator, List
 from config import Config
+from app.monitors.items import MentionItem
+from app.monitors.rate_limits import RateLimitManager
 
 logger = logging.getLogger(__name__)
 
+SEARCH_ENDPOINT = '/2/tweets/search/recent'
+TWITTER_API_HOST = 'https://api.twitter.com'
+
+class QuotaExhausted(tweepy.TweepyException):
+    """The shared rate-limit budget has no room for this request; it was not sent"""
+
+class RebasedSession(requests.Session):
+    """requests Session that sends Twitter API calls to another host (Config.TWITTER_API_BASE_URL)"""
+    
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip('/')
+    
+    def request(self, method, url, *args, **kwargs):
+        if url.startswith(TWITTER_API_HOST):
+            url = self.base_url + url[len(TWITTER_API_HOST):]
+        return super().request(method, url, *args, **kwargs)
+
+class RateLimitedClient(tweepy.Client):
+    """tweepy Client that reserves quota before each call and records rate-limit headers instead of sleeping"""
+    
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        rate_limits = RateLimitManager()
+        # Reserve the call in the quota shared by every process; the response headers replace the estimate
+        if not rate_limits.consume('Twitter', route):
+            raise QuotaExhausted(
+                f"Twitter quota for {route} spent, retry in {rate_limits.retry_after('Twitter', route):.0f}s"
+            )
+        try:
+            response = super().request(method, route, params=params, json=json, user_auth=user_auth)
+        except tweepy.TooManyRequests as e:
+            rate_limits.update_from_headers('Twitter', route, e.response.headers, throttled=True)
+            raise
+        rate_limits.update_from_headers('Twitter', route, response.headers)
+        return response
+
 class TwitterMonitor:
     def __init__(self):
         self.client = None
@@ -14,36 +53,41 @@ class TwitterMonitor:
         """Setup Twitter API client"""
         try:
             if Config.TWITTER_BEARER_TOKEN:
-                self.client = tweepy.Client(
+                self.client = RateLimitedClient(
                     bearer_token=Config.TWITTER_BEARER_TOKEN,
                     consumer_key=Config.TWITTER_API_KEY,
                     consumer_secret=Config.TWITTER_API_SECRET,
                     access_token=Config.TWITTER_ACCESS_TOKEN,
                     access_token_secret=Config.TWITTER_ACCESS_SECRET,
-                    wait_on_rate_limit=True
+                    wait_on_rate_limit=False  # Throttling is deferred via RateLimitManager
                 )
+                if Config.TWITTER_API_BASE_URL:
+                    self.client.session = RebasedSession(Config.TWITTER_API_BASE_URL)
                 logger.info("Twitter client initialized successfully")
             else:
                 logger.warning("Twitter API credentials not configured")
         except Exception as e:
             logger.error(f"Failed to initialize Twitter client: {e}")
     
-    def search_mentions(self, keywords: List[str], max_results: int = 10) -> List[Dict]:
+    def search_mentions(self, keywords: List[str], max_results: int = 10) -> Iterator[MentionItem]:
         """
         Search for tweets mentioning keywords
         
+        Tweets are yielded as each page arrives; further pages (100 tweets
+        each) are only requested while the caller keeps consuming.
+        
         Args:
             keywords: List of keywords to search for
             max_results: Maximum number of results to return
         
-        Returns:
-            List of tweet data dictionaries
+        Yields:
+            MentionItem per tweet
         """
         if not self.client:
             logger.warning("Twitter client not initialized")
-            return []
+            return
         
-        tweets_data = []
+        found = 0
         
         try:
             # Build search query
@@ -52,53 +96,77 @@ class TwitterMonitor:
             
             if not query or query == ' -is:retweet':
                 logger.warning("No valid keywords for Twitter search")
-                return []
-            
-            # Search recent tweets
-            response = self.client.search_recent_tweets(
-                query=query,
-                max_results=min(max_results, 100),
-                tweet_fields=['created_at', 'public_metrics', 'author_id'],
-                expansions=['author_id'],
-                user_fields=['username']
-            )
-            
-            if not response.data:
-                logger.info("No tweets found")
-                return []
+                return
             
-            # Create user mapping
-            users = {}
-            if response.includes and 'users' in response.includes:
-                users = {user.id: user.username for user in response.includes['users']}
+            rate_limits = RateLimitManager()
+            next_token = None
             
-            for tweet in response.data:
-                author_username = users.get(tweet.author_id, 'unknown')
+            while found < max_results:
+                if not rate_limits.can_call('Twitter', SEARCH_ENDPOINT):
+                    logger.warning(
+                        f"Twitter search rate limited, deferring for "
+                        f"{rate_limits.retry_after('Twitter', SEARCH_ENDPOINT):.0f}s"
+                    )
+                    break
+                
+                # Search recent tweets (the API accepts 10-100 per page)
+                response = self.client.search_recent_tweets(
+                    query=query,
+                    max_results=max(10, min(max_results - found, 100)),
+                    next_token=next_token,
+                    tweet_fields=['created_at', 'public_metrics', 'author_id'],
+                    expansions=['author_id'],
+                    user_fields=['username', 'public_metrics']
+                )
+                
+                if not response.data:
+                    break
+                
+                # Create user mapping
+                users = {}
+                if response.includes and 'users' in response.includes:
+                    users = {user.id: user for user in response.includes['users']}
                 
-                tweets_data.append({
-                    'id': str(tweet.id),
-                    'text': tweet.text,
-                    'author': f"@{author_username}",
-                    'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                    'url': f"https://twitter.com/{author_username}/status/{tweet.id}",
-                    'engagement': (
-                        tweet.public_metrics.get('like_count', 0) +
-                        tweet.public_metrics.get('retweet_count', 0) +
-                        tweet.public_metrics.get('reply_count', 0)
-                    ) if tweet.public_metrics else 0
-                })
+                for tweet in response.data[:max_results - found]:
+                    found += 1
+                    user = users.get(tweet.author_id)
+                    yield self._to_item(
+                        tweet,
+                        user.username if user else 'unknown',
+                        include_replies=True,
+                        followers=(user.public_metrics or {}).get('followers_count', 0) if user else 0
+                    )
+                
+                next_token = (response.meta or {}).get('next_token')
+                if not next_token:
+                    break
             
-            logger.info(f"Found {len(tweets_data)} tweets")
-            return tweets_data
+            logger.info(f"Found {found} tweets")
             
+        except (tweepy.TooManyRequests, QuotaExhausted):
+            logger.warning(f"Twitter search rate limited, deferring until quota resets ({found} tweets kept)")
         except tweepy.TweepyException as e:
             logger.error(f"Twitter API error: {e}")
-            return []
         except Exception as e:
             logger.error(f"Error searching tweets: {e}")
-            return []
     
-    def get_user_tweets(self, username: str, max_results: int = 10) -> List[Dict]:
+    @staticmethod
+    def _to_item(tweet, username: str, include_replies: bool, followers: int = 0) -> MentionItem:
+        metrics = tweet.public_metrics or {}
+        engagement = metrics.get('like_count', 0) + metrics.get('retweet_count', 0)
+        if include_replies:
+            engagement += metrics.get('reply_count', 0)
+        return MentionItem(
+            'Twitter',
+            str(tweet.id),
+            tweet.text,
+            f"@{username}",
+            created_utc=tweet.created_at.timestamp() if tweet.created_at else None,
+            engagement=engagement,
+            reach=followers
+        )
+    
+    def get_user_tweets(self, username: str, max_results: int = 10) -> Iterator[MentionItem]:
         """
         Get recent tweets from a specific user
         
@@ -106,17 +174,17 @@ class TwitterMonitor:
             username: Twitter username (without @)
             max_results: Maximum number of results
         
-        Returns:
-            List of tweet data dictionaries
+        Yields:
+            MentionItem per tweet
         """
         if not self.client:
-            return []
+            return
         
         try:
             # Get user ID
             user = self.client.get_user(username=username)
             if not user.data:
-                return []
+                return
             
             user_id = user.data.id
             
@@ -127,26 +195,8 @@ class TwitterMonitor:
                 tweet_fields=['created_at', 'public_metrics']
             )
             
-            if not response.data:
-                return []
-            
-            tweets_data = []
-            for tweet in response.data:
-                tweets_data.append({
-                    'id': str(tweet.id),
-                    'text': tweet.text,
-                    'author': f"@{username}",
-                    'created_at': tweet.created_at.isoformat() if tweet.created_at else None,
-                    'url': f"https://twitter.com/{username}/status/{tweet.id}",
-                    'engagement': (
-                        tweet.public_metrics.get('like_count', 0) +
-                        tweet.public_metrics.get('retweet_count', 0)
-                    ) if tweet.public_metrics else 0
-                })
-            
-            return tweets_data
+            for tweet in response.data or []:
+                yield self._to_item(tweet, username, include_replies=False)
             
         except Exception as e:
             logger.error(f"Error getting user tweets: {e}")
-            return []
-
@@ -0,0 +1,140 @@
+"""
+Agent Saad - Streaming Pipeline Helpers
+Monitors yield items one at a time; these helpers chunk the stream into
+model-sized batches and let fetching run one step ahead of processing,
+so a cycle holds a bounded number of items however many are fetched
+"""
+
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar('T')
+
+_DONE = object()
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group a stream into lists of at most size items"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def prefetch(items: Iterable[T], depth: int = 2) -> Iterator[T]:
+    """
+    Consume items on a background thread, at most depth items ahead
+
+    Lets the next API page download while the current batch is being
+    analyzed. Exceptions raised by the producer are re-raised to the
+    consumer; a consumer that stops early unblocks the producer.
+    """
+    buffer = queue.Queue(maxsize=depth)
+    stopped = threading.Event()
+
+    def put(value) -> bool:
+        while not stopped.is_set():
+            try:
+                buffer.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in items:
+                if not put((item, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+
+    threading.Thread(target=produce, name='pipeline-prefetch', daemon=True).start()
+    try:
+        while True:
+            item, error = buffer.get()
+            if item is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stopped.set()
+
+def prioritized(streams: List[Iterable[T]], key: Callable[[T], float], batch_size: int,
+                max_pending: int = 1000, linger: float = 0.05) -> Iterator[List[T]]:
+    """
+    Merge several streams, yielding batches of the highest-key items available
+
+    Every stream is consumed on its own thread into a shared heap, so all
+    sources fetch at once and the consumer always takes the most important
+    items seen so far instead of processing sources one after the other.
+    A batch is yielded once batch_size items are pending, the streams are
+    exhausted, or linger seconds have passed since the first pending item.
+    Producers pause while max_pending items are waiting. Exceptions raised
+    by a stream are re-raised to the consumer.
+    """
+    heap = []
+    order = itertools.count()
+    changed = threading.Condition()
+    stopped = threading.Event()
+    state = {'live': len(streams), 'error': None}
+
+    def produce(stream):
+        try:
+            for item in stream:
+                priority = key(item)
+                with changed:
+                    while len(heap) >= max_pending and not stopped.is_set():
+                        changed.wait(0.1)
+                    if stopped.is_set():
+                        return
+                    # Ties keep arrival order
+                    heapq.heappush(heap, (-priority, next(order), item))
+                    changed.notify_all()
+        except BaseException as e:
+            with changed:
+                state['error'] = state['error'] or e
+        finally:
+            with changed:
+                state['live'] -= 1
+                changed.notify_all()
+
+    for stream in streams:
+        threading.Thread(target=produce, args=(stream,), name='pipeline-priority', daemon=True).start()
+
+    try:
+        while True:
+            with changed:
+                deadline = None
+                while True:
+                    if state['error'] is not None:
+                        raise state['error']
+                    if len(heap) >= batch_size or (heap and not state['live']):
+                        break
+                    if not heap:
+                        if not state['live']:
+                            return
+                        changed.wait()
+                        continue
+                    if deadline is None:
+                        deadline = time.monotonic() + linger
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    changed.wait(remaining)
+
+                batch = [heapq.heappop(heap)[2] for _ in range(min(batch_size, len(heap)))]
+                changed.notify_all()
+            yield batch
+    finally:
+        stopped.set()
+        with changed:
+            changed.notify_all()
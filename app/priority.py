@@ -0,0 +1,41 @@
+"""
+Agent Saad - Processing Priority
+Cheap pre-score computed before sentiment analysis so that items likely to
+end up CRITICAL or HIGH are classified and notified first
+"""
+
+import math
+import re
+from app.monitors.items import MentionItem
+
+# Words that make a mention more likely to be urgent, with their weight
+SEVERITY_TERMS = {
+    'outage': 3, 'down': 2, 'hacked': 3, 'breach': 3, 'scam': 3, 'fraud': 3, 'lawsuit': 3,
+    'charged twice': 3, 'refund': 2, 'not working': 2, 'broken': 2, 'crash': 2, 'crashes': 2,
+    'unacceptable': 2, 'worst': 2, 'terrible': 2, 'furious': 2, 'cancel': 1, 'error': 1,
+    'bug': 1, 'slow': 1, 'disappointed': 1, 'support': 1
+}
+
+_SEVERITY_PATTERN = re.compile(
+    r'\b(' + '|'.join(re.escape(term) for term in sorted(SEVERITY_TERMS, key=len, reverse=True)) + r')\b',
+    re.IGNORECASE
+)
+
+def severity(text: str) -> int:
+    """Sum of the weights of the distinct severity terms in text"""
+    return sum(SEVERITY_TERMS[term] for term in {match.lower() for match in _SEVERITY_PATTERN.findall(text or '')})
+
+def pre_score(item: MentionItem) -> float:
+    """
+    Estimate how urgent an item will be, without running the model
+
+    determine_urgency escalates on engagement (50/100) once an item is
+    negative, so engagement weighs most; audience size and severe wording
+    decide the order among items with similar engagement.
+
+    Returns:
+        float: Higher means process sooner
+    """
+    engagement = math.log10(1 + max(item.engagement or 0, 0))
+    reach = math.log10(1 + max(item.reach or 0, 0))
+    return 2 * engagement + 0.5 * reach + severity(item.text)
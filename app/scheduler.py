@@ -0,0 +1,212 @@
+"""
+Agent Saad - Adaptive Polling Scheduler
+Tracks mention velocity per keyword and source and decides which
+keywords are due for polling within a global API-call budget
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Tuple
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+class KeywordState:
+    """Polling state for a single (keyword, source) pair"""
+
+    __slots__ = ('keyword', 'source', 'interval', 'next_due', 'last_polled', 'velocity')
+
+    def __init__(self, keyword: str, source: str, interval: float, next_due: float):
+        self.keyword = keyword
+        self.source = source
+        self.interval = interval
+        self.next_due = next_due
+        self.last_polled = None
+        self.velocity = 0.0  # New mentions per minute (EWMA)
+
+    def to_row(self) -> Dict:
+        """Fields saved in the poll_schedule table"""
+        return {
+            'keyword': self.keyword,
+            'source': self.source,
+            'interval': self.interval,
+            'next_due': self.next_due,
+            'last_polled': self.last_polled,
+            'velocity': self.velocity
+        }
+
+    @classmethod
+    def from_row(cls, row: Dict) -> 'KeywordState':
+        state = cls(row['keyword'], row['source'], row['interval'], row['next_due'])
+        state.last_polled = row['last_polled']
+        state.velocity = row['velocity']
+        return state
+
+    def to_dict(self) -> Dict:
+        return {
+            'keyword': self.keyword,
+            'source': self.source,
+            'interval_minutes': round(self.interval / 60, 2),
+            'velocity_per_minute': round(self.velocity, 3),
+            'next_due_in_seconds': max(round(self.next_due - time.time()), 0)
+        }
+
+class AdaptiveScheduler:
+    """
+    Polls hot keywords more often and backs off on cold ones
+
+    Each (keyword, source) pair keeps an exponentially weighted mention
+    velocity. The poll interval is the time expected to collect
+    POLL_TARGET_MENTIONS new mentions, clamped between the configured
+    minimum and maximum. Quiet keywords double their interval each poll.
+    All polls share one API-call budget per hour; when the budget is
+    exhausted, due pairs wait for the next tick, hottest first.
+
+    With a store (the Database), every poll's state and API call is saved,
+    so the schedule survives restarts and other processes (the web
+    workers) can report it with stored_status().
+    """
+
+    def __init__(self, poll_fn: Callable[[str, str], int], keywords: List[str], sources: List[str],
+                 min_interval_minutes: float = None, max_interval_minutes: float = None,
+                 calls_per_hour: int = None, target_mentions: float = None, smoothing: float = 0.5,
+                 is_available: Callable[[str], bool] = None, store=None):
+        """
+        Args:
+            poll_fn: Callable(keyword, source) returning the number of new mentions
+            keywords: Keywords to track
+            sources: Source platforms to poll for each keyword
+            min_interval_minutes: Fastest allowed poll interval
+            max_interval_minutes: Slowest allowed poll interval
+            calls_per_hour: Global API-call budget
+            target_mentions: New mentions we aim to collect per poll
+            smoothing: EWMA weight given to the newest velocity sample
+            is_available: Callable(source) returning False while a source is
+                rate limited; its due keywords are skipped without using budget
+            store: Database to save and restore polling state in
+        """
+        self.poll_fn = poll_fn
+        self.min_interval = 60 * (min_interval_minutes or Config.POLL_MIN_INTERVAL_MINUTES)
+        self.max_interval = 60 * (max_interval_minutes or Config.POLL_MAX_INTERVAL_MINUTES)
+        self.calls_per_hour = calls_per_hour or Config.API_CALL_BUDGET_PER_HOUR
+        self.target_mentions = target_mentions or Config.POLL_TARGET_MENTIONS
+        self.smoothing = smoothing
+        self.is_available = is_available or (lambda source: True)
+        self.store = store
+        self._calls = deque()
+        self._lock = threading.Lock()
+
+        now = time.time()
+        saved = {}
+        if store is not None:
+            saved = {(row['keyword'], row['source']): row for row in store.get_poll_schedule()}
+            self._calls.extend(store.get_poll_calls(now - 3600))
+
+        start_interval = min(max(60 * Config.CHECK_INTERVAL_MINUTES, self.min_interval), self.max_interval)
+        self.states: Dict[Tuple[str, str], KeywordState] = {}
+        for keyword in keywords:
+            if not keyword.strip():
+                continue
+            for source in sources:
+                if (keyword, source) in saved:
+                    state = KeywordState.from_row(saved[(keyword, source)])
+                    state.interval = min(max(state.interval, self.min_interval), self.max_interval)
+                else:
+                    state = KeywordState(keyword, source, start_interval, now)
+                    if store is not None:
+                        store.save_poll_state(state.to_row())
+                self.states[(keyword, source)] = state
+
+    def remaining_budget(self, now: float = None) -> int:
+        """Number of API calls still available in the current hour"""
+        now = now or time.time()
+        with self._lock:
+            while self._calls and self._calls[0] <= now - 3600:
+                self._calls.popleft()
+            return max(self.calls_per_hour - len(self._calls), 0)
+
+    def due_states(self, now: float = None) -> List[KeywordState]:
+        """Due pairs that fit in the budget, hottest and most overdue first"""
+        now = now or time.time()
+        available = {}
+        due = []
+        for state in self.states.values():
+            if state.next_due > now:
+                continue
+            if state.source not in available:
+                available[state.source] = self.is_available(state.source)
+            if available[state.source]:
+                due.append(state)
+        due.sort(key=lambda state: (-state.velocity, state.next_due))
+        return due[:self.remaining_budget(now)]
+
+    def record_poll(self, state: KeywordState, new_mentions: int, now: float = None):
+        """Update velocity and the next poll time after a poll"""
+        now = now or time.time()
+        elapsed_minutes = (now - (state.last_polled or now - state.interval)) / 60
+        sample = new_mentions / max(elapsed_minutes, 1e-6)
+        state.velocity = self.smoothing * sample + (1 - self.smoothing) * state.velocity
+
+        if new_mentions == 0:
+            interval = state.interval * 2
+        else:
+            interval = 60 * self.target_mentions / max(state.velocity, 1e-6)
+        state.interval = min(max(interval, self.min_interval), self.max_interval)
+        state.last_polled = now
+        state.next_due = now + state.interval
+
+    def tick(self) -> Dict:
+        """
+        Poll every due keyword that fits in the budget
+
+        Returns:
+            dict: Summary of polls made and mentions found
+        """
+        results = {'polled': 0, 'new_mentions': 0, 'deferred': 0}
+        now = time.time()
+        due_count = sum(1 for state in self.states.values() if state.next_due <= now)
+
+        for state in self.due_states(now):
+            called_at = time.time()
+            with self._lock:
+                self._calls.append(called_at)
+            try:
+                new_mentions = self.poll_fn(state.keyword, state.source)
+            except Exception as e:
+                logger.error(f"Error polling {state.source} for '{state.keyword}': {e}")
+                new_mentions = 0
+            self.record_poll(state, new_mentions)
+            if self.store is not None:
+                self.store.save_poll_state(state.to_row(), called_at=called_at)
+            results['polled'] += 1
+            results['new_mentions'] += new_mentions
+
+        results['deferred'] = due_count - results['polled']
+        if results['polled']:
+            logger.info(f"Adaptive polling tick completed: {results}")
+        if results['deferred']:
+            logger.warning(f"Deferred {results['deferred']} keyword polls (API budget or rate limits)")
+        return results
+
+    def get_status(self) -> List[Dict]:
+        """Current schedule for every tracked keyword and source"""
+        return [state.to_dict() for state in self.states.values()]
+
+def stored_status(store, calls_per_hour: int = None) -> Dict:
+    """
+    Schedule and remaining budget as last saved by the scheduler's process
+
+    Returns:
+        dict: {'remaining_budget': int, 'schedule': [per-pair dicts as get_status]}
+    """
+    calls_per_hour = calls_per_hour or Config.API_CALL_BUDGET_PER_HOUR
+    calls = store.get_poll_calls(time.time() - 3600)
+    keywords = {keyword for keyword in Config.KEYWORDS if keyword.strip()}
+    return {
+        'remaining_budget': max(calls_per_hour - len(calls), 0),
+        'schedule': [
+            KeywordState.from_row(row).to_dict() for row in store.get_poll_schedule() if row['keyword'] in keywords
+        ]
+    }
@@ -0,0 +1,178 @@
+"""
+Agent Saad - Production Server
+Serves the dashboard from a multi-worker gunicorn server while the
+monitoring scheduler runs exactly once, in a single dedicated process
+"""
+
+import gc
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import threading
+import time
+from gunicorn.app.base import BaseApplication
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+def flush_database_writes(*args):
+    """Commit writes still queued in this process's database writer"""
+    from app.components import components
+    if components.get_status()['db']['built']:
+        components.db.close()
+
+def run_scheduler_process():
+    """Run the monitoring scheduler until the process is terminated"""
+    from app.agent import start_scheduled_monitoring
+    # terminate() sends SIGTERM; exit through the finally block so queued writes are committed
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    scheduler = start_scheduled_monitoring()
+    try:
+        while True:
+            time.sleep(1)
+    finally:
+        scheduler.shutdown()
+        flush_database_writes()
+
+def process_alive(process) -> bool:
+    """
+    is_alive() that also notices a child reaped by someone else
+
+    gunicorn's SIGCHLD handler waits on every child of the master, which
+    consumes the scheduler's exit status; multiprocessing then keeps
+    reporting the process as running.
+    """
+    if process is None or not process.is_alive():
+        return False
+    try:
+        os.kill(process.pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+class SchedulerSupervisor:
+    """
+    Runs the scheduler in a forked child and restarts it whenever it dies
+
+    A daemon thread checks the child every check_interval seconds. A
+    scheduler that dies within CRASH_LOOP_SECONDS of starting is restarted
+    after a doubling delay (up to MAX_RESTART_DELAY) so a persistent
+    failure does not fork in a tight loop.
+    """
+
+    CRASH_LOOP_SECONDS = 60
+    MAX_RESTART_DELAY = 300
+
+    def __init__(self, target=run_scheduler_process, check_interval: float = None):
+        """
+        Args:
+            target: Function run in the child process
+            check_interval: Seconds between liveness checks (Config.SCHEDULER_CHECK_SECONDS)
+        """
+        self.target = target
+        self.check_interval = check_interval if check_interval is not None else Config.SCHEDULER_CHECK_SECONDS
+        self.process = None
+        self.started_at = None
+        self.restarts = 0
+        self._quick_failures = 0
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._spawn()
+        self._thread = threading.Thread(target=self._supervise, name='scheduler-supervisor', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        """Stop supervising, then terminate the scheduler and wait for it to flush"""
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if process_alive(self.process):
+            self.process.terminate()
+            self.process.join(timeout)
+
+    def _spawn(self):
+        context = multiprocessing.get_context('fork')
+        self.process = context.Process(target=self.target, name='agent-saad-scheduler')
+        self.process.start()
+        self.started_at = time.monotonic()
+        logger.info(f"Scheduler process started (pid {self.process.pid})")
+
+    def _supervise(self):
+        while not self._stopping.wait(self.check_interval):
+            if process_alive(self.process):
+                continue
+            uptime = time.monotonic() - self.started_at
+            logger.error(
+                f"Scheduler process (pid {self.process.pid}, exit code {self.process.exitcode}) "
+                f"died after {uptime:.0f}s, restarting"
+            )
+            if uptime < self.CRASH_LOOP_SECONDS:
+                delay = min(self.check_interval * 2 ** self._quick_failures, self.MAX_RESTART_DELAY)
+                self._quick_failures += 1
+                if self._stopping.wait(delay):
+                    return
+            else:
+                self._quick_failures = 0
+            if self._stopping.is_set():
+                return
+            self._spawn()
+            self.restarts += 1
+
+class ProductionServer(BaseApplication):
+    """
+    gunicorn application wrapping the Flask app
+
+    The app and the sentiment model are loaded once in the gunicorn master
+    and shared copy-on-write with the forked web workers.
+    When the master is ready it forks one extra process for the scheduler,
+    so scheduled monitoring never runs once per web worker. Manual runs
+    are queued in the database by the web workers and run there too. The
+    master restarts the scheduler process if it dies.
+    """
+
+    def __init__(self, application, options: dict = None):
+        self.application = application
+        self.options = options or {}
+        self.scheduler = SchedulerSupervisor()
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            if key in self.cfg.settings and value is not None:
+                self.cfg.set(key, value)
+        self.cfg.set('when_ready', self.start_scheduler)
+        self.cfg.set('on_exit', self.stop_scheduler)
+        self.cfg.set('worker_exit', flush_database_writes)
+
+    def load(self):
+        return self.application
+
+    def start_scheduler(self, server):
+        # Move everything loaded so far out of the collector's reach, so GC
+        # passes in the children never write to (and un-share) those pages
+        gc.freeze()
+        self.scheduler.start()
+
+    def stop_scheduler(self, server):
+        self.scheduler.stop()
+        logger.info("Scheduler process stopped")
+
+def serve_production(application):
+    """Run the Flask app under gunicorn with Config.WEB_WORKERS workers"""
+    from app.agent import monitor_jobs
+    from app.components import components
+    # Build the model in the master so workers inherit it instead of loading their own
+    components.preload(['db', 'sentiment_analyzer'])
+    # Web workers only queue manual runs; the scheduler process runs them
+    monitor_jobs.execute_locally = False
+    ProductionServer(application, {
+        'bind': f"0.0.0.0:{Config.PORT}",
+        'workers': Config.WEB_WORKERS,
+        'threads': Config.WEB_THREADS,
+        'timeout': 120,
+        'accesslog': '-'
+    }).run()
@@ -0,0 +1,122 @@
+"""
+Agent Saad - Web Delivery
+Response compression and fingerprinted, long-lived caching of static assets
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from flask import Flask, request
+from flask_compress import Compress
+
+# Fingerprinted static URLs never change content, so caches may keep them for a year
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+# Compressed static bodies kept in process (one per file version and encoding)
+STATIC_CACHE_ENTRIES = 64
+
+_fingerprints = {}
+
+def static_fingerprint(static_folder: str, filename: str) -> str:
+    """Short content hash of a static file, recomputed only when its mtime changes"""
+    path = os.path.join(static_folder, filename)
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return ''
+
+    cached = _fingerprints.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'rb') as f:
+        digest = hashlib.md5(f.read()).hexdigest()[:12]
+    _fingerprints[path] = (mtime, digest)
+    return digest
+
+def init_web(app: Flask):
+    """
+    Enable gzip/brotli compression and static asset fingerprinting
+
+    url_for('static', ...) gains a ?v=<content hash> parameter. Requests
+    carrying it are served with a one-year immutable Cache-Control header;
+    the hash changes whenever the file does, so clients never see stale
+    CSS or JS.
+    """
+    app.config.setdefault('COMPRESS_ALGORITHM', ['br', 'gzip'])
+    app.config.setdefault('COMPRESS_MIMETYPES', [
+        'text/html', 'text/css', 'text/javascript', 'application/javascript', 'application/json'
+    ])
+    app.config.setdefault('COMPRESS_MIN_SIZE', 500)
+    # Fingerprinted static files are compressed once per version and encoding
+    app.config.setdefault('COMPRESS_CACHE_KEY', lambda req: f"{req.full_path}:{req.headers.get('Accept-Encoding', '')}")
+    app.config.setdefault('COMPRESS_CACHE_BACKEND', _static_cache_backend)
+    Compress(app)
+
+    @app.url_defaults
+    def add_static_fingerprint(endpoint, values):
+        if endpoint == 'static' and 'filename' in values and 'v' not in values:
+            fingerprint = static_fingerprint(app.static_folder, values['filename'])
+            if fingerprint:
+                values['v'] = fingerprint
+
+    # Registered after Compress, so it runs before Compress sees the response
+    @app.after_request
+    def set_cache_headers(response):
+        if request.endpoint == 'static' and request.args.get('v'):
+            # send_file marks every file no-cache, which would force revalidation
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+            if response.status_code == 200 and response.is_streamed:
+                # Compress only caches buffered bodies; send_file streams the file
+                response.direct_passthrough = False
+                response.make_sequence()
+        elif request.endpoint == 'static':
+            response.cache_control.no_cache = True
+        return response
+
+class _StaticCache:
+    """
+    In-process LRU cache of compressed bodies, limited to fingerprinted static files
+
+    flask-compress keys entries as "<algorithm>;<COMPRESS_CACHE_KEY>".
+    """
+
+    def __init__(self, max_entries: int = STATIC_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def set(self, key, value):
+        path = key.split(';', 1)[-1]
+        if not (path.startswith('/static/') and '?v=' in path):
+            return
+        with self._lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+def _static_cache_backend():
+    return _static_cache
+
+_static_cache = _StaticCache()
@@ -0,0 +1,61 @@
+"""
+Agent Saad - Keyword Sharding
+Lets several agent processes split the keyword set through a
+lease/heartbeat table in the shared database
+"""
+
+import logging
+import os
+import socket
+import threading
+from typing import List
+from app.database.db import Database
+
+logger = logging.getLogger(__name__)
+
+def default_worker_id() -> str:
+    """Worker id unique per host and process"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class KeywordShard:
+    """
+    The subset of keywords leased to this worker
+
+    heartbeat() must be called more often than the lease TTL. Each call
+    renews this worker's liveness and rebalances leases, so keywords of a
+    worker that stopped heartbeating are picked up by the survivors and a
+    newly started worker receives its share from the others.
+    """
+
+    def __init__(self, db: Database, worker_id: str, keywords: List[str], ttl: float):
+        self.db = db
+        self.worker_id = worker_id
+        self.all_keywords = [keyword for keyword in keywords if keyword.strip()]
+        self.ttl = ttl
+        self.keywords: List[str] = []
+        self._lock = threading.Lock()
+
+    def heartbeat(self) -> List[str]:
+        """Renew leases and return the keywords this worker now owns"""
+        try:
+            keywords = self.db.acquire_keyword_leases(self.worker_id, self.all_keywords, self.ttl)
+        except Exception as e:
+            logger.error(f"Keyword lease heartbeat failed for worker {self.worker_id}: {e}")
+            return self.get_keywords()
+
+        with self._lock:
+            if set(keywords) != set(self.keywords):
+                logger.info(f"Worker {self.worker_id} now owns keywords: {keywords}")
+            self.keywords = keywords
+        return keywords
+
+    def get_keywords(self) -> List[str]:
+        with self._lock:
+            return list(self.keywords)
+
+    def release(self):
+        """Give up all leases so other workers can take them immediately"""
+        self.db.release_worker(self.worker_id)
+        with self._lock:
+            self.keywords = []
+        logger.info(f"Worker {self.worker_id} released its keyword leases")
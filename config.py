@@ -3,6 +3,12 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# A local model snapshot means the app must start without the model hub;
+# set before transformers/huggingface_hub read their environment
+if os.getenv('MODEL_SNAPSHOT_DIR'):
+    os.environ.setdefault('HF_HUB_OFFLINE', '1')
+    os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+
 class Config:
     # Twitter/X Configuration
     TWITTER_API_KEY = os.getenv('TWITTER_API_KEY')
@@ -10,15 +16,30 @@ class Config:
     TWITTER_ACCESS_TOKEN = os.getenv('TWITTER_ACCESS_TOKEN')
     TWITTER_ACCESS_SECRET = os.getenv('TWITTER_ACCESS_SECRET')
     TWITTER_BEARER_TOKEN = os.getenv('TWITTER_BEARER_TOKEN')
+    # Override API hosts (e.g. local stand-ins for soak testing); empty means the real services
+    TWITTER_API_BASE_URL = os.getenv('TWITTER_API_BASE_URL', '')
     
     # Reddit Configuration
     REDDIT_CLIENT_ID = os.getenv('REDDIT_CLIENT_ID')
     REDDIT_CLIENT_SECRET = os.getenv('REDDIT_CLIENT_SECRET')
     REDDIT_USER_AGENT = os.getenv('REDDIT_USER_AGENT', 'Agent-Saad/1.0')
+    REDDIT_API_BASE_URL = os.getenv('REDDIT_API_BASE_URL', '')
+    # Comment scanning of matched and watched threads
+    REDDIT_COMMENT_SCAN = os.getenv('REDDIT_COMMENT_SCAN', 'False').lower() == 'true'
+    REDDIT_WATCHED_SUBMISSIONS = [
+        submission.strip() for submission in os.getenv('REDDIT_WATCHED_SUBMISSIONS', '').split(',')
+        if submission.strip()
+    ]
+    REDDIT_COMMENT_WORKERS = int(os.getenv('REDDIT_COMMENT_WORKERS', 4))
+    REDDIT_COMMENT_THREADS_PER_CYCLE = int(os.getenv('REDDIT_COMMENT_THREADS_PER_CYCLE', 20))
+    REDDIT_THREAD_FOLLOW_HOURS = float(os.getenv('REDDIT_THREAD_FOLLOW_HOURS', 48))
+    # "Load more comments" expansions per thread and scan (each one is an API call)
+    REDDIT_REPLACE_MORE_LIMIT = int(os.getenv('REDDIT_REPLACE_MORE_LIMIT', 8))
     
     # Email Configuration
     SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
     SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
+    SMTP_STARTTLS = os.getenv('SMTP_STARTTLS', 'True').lower() == 'true'
     SMTP_USERNAME = os.getenv('SMTP_USERNAME')
     SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
     ALERT_EMAIL_TO = os.getenv('ALERT_EMAIL_TO')
@@ -26,17 +47,100 @@ class Config:
     # Slack Configuration
     SLACK_BOT_TOKEN = os.getenv('SLACK_BOT_TOKEN')
     SLACK_CHANNEL = os.getenv('SLACK_CHANNEL', '#alerts')
+    SLACK_API_BASE_URL = os.getenv('SLACK_API_BASE_URL', '')
+    
+    # Alerts no channel accepted (e.g. Slack quota spent) are retried this often,
+    # up to NOTIFY_RETRY_BATCH per pass, while younger than NOTIFY_RETRY_HOURS
+    NOTIFY_RETRY_SECONDS = int(os.getenv('NOTIFY_RETRY_SECONDS', 60))
+    NOTIFY_RETRY_BATCH = int(os.getenv('NOTIFY_RETRY_BATCH', 50))
+    NOTIFY_RETRY_HOURS = float(os.getenv('NOTIFY_RETRY_HOURS', 24))
     
     # Monitoring Configuration
     KEYWORDS = os.getenv('KEYWORDS', '').split(',')
     CHECK_INTERVAL_MINUTES = int(os.getenv('CHECK_INTERVAL_MINUTES', 15))
     SENTIMENT_THRESHOLD = float(os.getenv('SENTIMENT_THRESHOLD', -0.3))
+    # Mentions fetched per source per check (Twitter: in total, Reddit: per keyword)
+    MONITOR_MAX_RESULTS = int(os.getenv('MONITOR_MAX_RESULTS', 20))
+    # Merge all sources into one queue ordered by a cheap urgency pre-score
+    PRIORITY_PROCESSING = os.getenv('PRIORITY_PROCESSING', 'True').lower() == 'true'
+    PRIORITY_MAX_PENDING = int(os.getenv('PRIORITY_MAX_PENDING', 1000))
+    
+    # Incident Grouping Configuration
+    INCIDENT_GROUPING = os.getenv('INCIDENT_GROUPING', 'False').lower() == 'true'
+    INCIDENT_SIMILARITY_THRESHOLD = float(os.getenv('INCIDENT_SIMILARITY_THRESHOLD', 0.9))
+    INCIDENT_WINDOW_HOURS = float(os.getenv('INCIDENT_WINDOW_HOURS', 24))
+    INCIDENT_INDEX_MAX_SIZE = int(os.getenv('INCIDENT_INDEX_MAX_SIZE', 5000))
+    # Optional dedicated sentence-embedding model (e.g. sentence-transformers/all-MiniLM-L6-v2);
+    # when empty, embeddings are pooled from the sentiment model's forward pass
+    EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', '')
+    
+    # Adaptive Polling Configuration
+    ADAPTIVE_SCHEDULING = os.getenv('ADAPTIVE_SCHEDULING', 'False').lower() == 'true'
+    POLL_MIN_INTERVAL_MINUTES = float(os.getenv('POLL_MIN_INTERVAL_MINUTES', 2))
+    POLL_MAX_INTERVAL_MINUTES = float(os.getenv('POLL_MAX_INTERVAL_MINUTES', 60))
+    POLL_TARGET_MENTIONS = float(os.getenv('POLL_TARGET_MENTIONS', 5))
+    API_CALL_BUDGET_PER_HOUR = int(os.getenv('API_CALL_BUDGET_PER_HOUR', 120))
+    SCHEDULER_TICK_SECONDS = int(os.getenv('SCHEDULER_TICK_SECONDS', 30))
+    # How often the scheduler picks up monitoring jobs queued from the dashboard
+    MONITOR_JOB_POLL_SECONDS = float(os.getenv('MONITOR_JOB_POLL_SECONDS', 2))
+    
+    # Sentiment Model Configuration
+    SENTIMENT_MODEL = os.getenv('SENTIMENT_MODEL', 'distilbert-base-uncased-finetuned-sst-2-english')
+    # Local safetensors snapshot (python -m app.models.weights snapshot <dir>); when set,
+    # the model is memory-mapped from it and the model hub is never contacted
+    MODEL_SNAPSHOT_DIR = os.getenv('MODEL_SNAPSHOT_DIR', '')
+    SENTIMENT_MAX_TOKENS = int(os.getenv('SENTIMENT_MAX_TOKENS', 512))
+    SENTIMENT_CHUNKING = os.getenv('SENTIMENT_CHUNKING', 'False').lower() == 'true'
+    SENTIMENT_CHUNK_STRIDE = int(os.getenv('SENTIMENT_CHUNK_STRIDE', 128))
+    SENTIMENT_MAX_CHUNKS = int(os.getenv('SENTIMENT_MAX_CHUNKS', 8))
+    SENTIMENT_BATCH_SIZE = int(os.getenv('SENTIMENT_BATCH_SIZE', 16))
+    # Lexicon pre-filter: monitored items scoring above the margin (-1..1) skip the transformer.
+    # A higher margin escalates more items (less recall lost, less CPU saved)
+    SENTIMENT_PREFILTER = os.getenv('SENTIMENT_PREFILTER', 'False').lower() == 'true'
+    SENTIMENT_PREFILTER_MARGIN = float(os.getenv('SENTIMENT_PREFILTER_MARGIN', 0.05))
+    SENTIMENT_PREFILTER_LEXICON = os.getenv('SENTIMENT_PREFILTER_LEXICON', '')
+    # Micro-batching of concurrent API requests
+    SENTIMENT_BATCH_MAX_WAIT_MS = float(os.getenv('SENTIMENT_BATCH_MAX_WAIT_MS', 5))
+    SENTIMENT_BATCH_MAX_SIZE = int(os.getenv('SENTIMENT_BATCH_MAX_SIZE', 32))
+    SENTIMENT_BATCH_API_LIMIT = int(os.getenv('SENTIMENT_BATCH_API_LIMIT', 256))
+    # Directory of extra classification heads (issue_category, toxicity, ...)
+    CLASSIFIER_HEADS_DIR = os.getenv('CLASSIFIER_HEADS_DIR', 'models/heads')
+    
+    # Worker (keyword sharding) Configuration
+    WORKER_ID = os.getenv('WORKER_ID')
+    LEASE_TTL_SECONDS = int(os.getenv('LEASE_TTL_SECONDS', 90))
+    LEASE_HEARTBEAT_SECONDS = int(os.getenv('LEASE_HEARTBEAT_SECONDS', 30))
     
     # Flask Configuration
     SECRET_KEY = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
     PORT = int(os.getenv('FLASK_PORT', 5000))
     DEBUG = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
     
+    # Serving mode: 'development' (Flask dev server) or 'production' (gunicorn)
+    SERVER_MODE = os.getenv('SERVER_MODE', 'development').lower()
+    WEB_WORKERS = int(os.getenv('WEB_WORKERS', 4))
+    WEB_THREADS = int(os.getenv('WEB_THREADS', 2))
+    # The scheduler records a heartbeat this often; /health reports it dead once the
+    # heartbeat is older than SCHEDULER_STALE_SECONDS. In production the gunicorn
+    # master checks the scheduler process every SCHEDULER_CHECK_SECONDS and restarts it.
+    SCHEDULER_HEARTBEAT_SECONDS = int(os.getenv('SCHEDULER_HEARTBEAT_SECONDS', 10))
+    SCHEDULER_STALE_SECONDS = int(os.getenv('SCHEDULER_STALE_SECONDS', 60))
+    SCHEDULER_CHECK_SECONDS = int(os.getenv('SCHEDULER_CHECK_SECONDS', 5))
+    
     # Database
-    DATABASE_PATH = 'agent_saad.db'
+    DATABASE_PATH = os.getenv('DATABASE_PATH', 'agent_saad.db')
+    # Writes are group-committed by one writer thread: at most this many per
+    # transaction, waiting up to this many milliseconds for more to arrive
+    DB_WRITE_BATCH_SIZE = int(os.getenv('DB_WRITE_BATCH_SIZE', 100))
+    DB_WRITE_BATCH_MS = float(os.getenv('DB_WRITE_BATCH_MS', 2))
+    # Alert content of at least this many bytes is stored zlib-compressed (0 disables)
+    ALERT_CONTENT_COMPRESS_MIN_BYTES = int(os.getenv('ALERT_CONTENT_COMPRESS_MIN_BYTES', 0))
+    # Length of the content preview in the alert list
+    ALERT_PREVIEW_CHARS = int(os.getenv('ALERT_PREVIEW_CHARS', 280))
+    # Cached /api/stats and /api/alerts responses per process (0 disables) and their max age
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 256))
+    RESPONSE_CACHE_MAX_AGE = float(os.getenv('RESPONSE_CACHE_MAX_AGE', 30))
+    
+    # Analytics
+    ANALYTICS_EXPORT_DIR = os.getenv('ANALYTICS_EXPORT_DIR', 'exports')
 
@@ -3,10 +3,10 @@ Agent Saad - Customer Sentiment Alert System
 Main entry point for running the application
 """
 
+import argparse
 import logging
 import sys
-from app.main import app
-from app.agent import start_scheduled_monitoring
+import time
 from config import Config
 
 # Setup logging
@@ -21,8 +21,62 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Agent Saad - Customer Sentiment Alert System")
+    parser.add_argument(
+        '--worker',
+        action='store_true',
+        help="Run as a headless monitoring worker sharing keywords with other workers"
+    )
+    parser.add_argument(
+        '--worker-id',
+        default=Config.WORKER_ID,
+        help="Unique worker id (defaults to hostname-pid)"
+    )
+    parser.add_argument(
+        '--production',
+        action='store_true',
+        default=Config.SERVER_MODE == 'production',
+        help="Serve with a multi-worker gunicorn server (also set by SERVER_MODE=production)"
+    )
+    return parser.parse_args()
+
+def run_worker(worker_id: str):
+    """Run a headless worker that monitors only its leased keywords"""
+    from app import agent
+    
+    logger.info(f"Starting Agent Saad worker {worker_id}")
+    scheduler = agent.start_scheduled_monitoring(worker_id=worker_id)
+    
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        logger.info(f"Shutting down worker {worker_id}...")
+        scheduler.shutdown()
+        agent.keyword_shard.release()
+        sys.exit(0)
+
 def main():
     """Main entry point"""
+    args = parse_args()
+    
+    if args.worker:
+        from app.worker import default_worker_id
+        run_worker(args.worker_id or default_worker_id())
+        return
+    
+    from app.main import app
+    
+    if args.production:
+        from app.server import serve_production
+        logger.info(f"Starting Agent Saad in production mode ({Config.WEB_WORKERS} web workers)")
+        serve_production(app)
+        return
+    
+    from app.agent import start_scheduled_monitoring
+    
     logger.info("="*60)
     logger.info("Starting Agent Saad - Customer Sentiment Alert System")
     logger.info("="*60)
@@ -42,7 +42,6 @@ document.addEventListener('DOMContentLoaded', function() {
     loadStats();
     loadAlerts();
     setupEventListeners();
-    animateOnScroll();
     
     // Auto-refresh every 30 seconds
     setInterval(() => {
@@ -75,16 +74,20 @@ function setupEventListeners() {
     // Filter listeners
     document.getElementById('urgencyFilter').addEventListener('change', function(e) {
         currentFilters.urgency = e.target.value;
-        loadAlerts();
+        loadAlerts(true);
         animateFilterChange();
     });
     
     document.getElementById('sourceFilter').addEventListener('change', function(e) {
         currentFilters.source = e.target.value;
-        loadAlerts();
+        loadAlerts(true);
         animateFilterChange();
     });
     
+    // Only the cards near the viewport are rendered; update them as the list scrolls
+    document.getElementById('alertsList').addEventListener('scroll', scheduleAlertsRender, { passive: true });
+    window.addEventListener('resize', scheduleAlertsRender);
+    
     // Add ripple effect to all buttons
     document.querySelectorAll('.btn').forEach(btn => {
         btn.addEventListener('click', function(e) {
@@ -121,25 +124,6 @@ function animateFilterChange() {
     }, 200);
 }
 
-// Scroll animations
-function animateOnScroll() {
-    const observer = new IntersectionObserver((entries) => {
-        entries.forEach(entry => {
-            if (entry.isIntersecting) {
-                entry.target.style.opacity = '1';
-                entry.target.style.transform = 'translateY(0)';
-            }
-        });
-    });
-    
-    document.querySelectorAll('.alert-card').forEach(card => {
-        card.style.opacity = '0';
-        card.style.transform = 'translateY(20px)';
-        card.style.transition = 'all 0.5s ease';
-        observer.observe(card);
-    });
-}
-
 // Load Statistics
 async function loadStats() {
     try {
@@ -177,61 +161,284 @@ function animateNumber(elementId, target) {
     }, 50);
 }
 
-// Load Alerts
-async function loadAlerts() {
+// Alert list state. Every loaded alert is kept here, but only the cards in
+// or near the viewport exist in the DOM (see renderAlerts)
+const ALERT_PAGE_SIZE = 200;
+const ESTIMATED_CARD_HEIGHT = 190;
+const OVERSCAN_PX = 800;
+
+const alertList = {
+    alerts: [],          // Loaded alerts, newest first
+    rows: [],            // Alerts grouped by incident: one card each
+    total: 0,            // Alerts matching the filters on the server
+    heights: new Map(),  // Measured card height (with gap) per alert id
+    offsets: [0],        // Top of each row; the last entry is the full height
+    cards: new Map(),    // Rendered cards: alert id -> { signature, element }
+    fresh: new Set(),    // Ids that arrived with a refresh and should animate in
+    loadingMore: false,
+    frame: null
+};
+
+// Build the /api/alerts query string from the active filters
+function buildAlertsQuery(offset = 0) {
+    const params = new URLSearchParams({ limit: ALERT_PAGE_SIZE, offset });
+    if (currentFilters.urgency) params.set('urgency', currentFilters.urgency);
+    if (currentFilters.source) params.set('source', currentFilters.source);
+    return params.toString();
+}
+
+// Load (or refresh) the newest page of alerts; reset after a filter change
+async function loadAlerts(reset = false) {
+    const query = buildAlertsQuery();
     try {
-        const response = await fetch('/api/alerts?limit=100');
+        const response = await fetch(`/api/alerts?${query}`);
         const data = await response.json();
         
+        // Ignore responses for filters that have since changed
+        if (query !== buildAlertsQuery()) return;
+        
         if (data.success) {
-            displayAlerts(data.alerts);
+            mergeAlerts(data.alerts, data.total, reset);
+            updateFacetCounts(data.facets);
         }
     } catch (error) {
         console.error('Error loading alerts:', error);
-        document.getElementById('alertsList').innerHTML = `
+        showAlertsMessage(`
             <div class="loading">
                 <div class="loader"></div>
                 <p>Error loading alerts</p>
             </div>
-        `;
+        `);
     }
 }
 
-// Display Alerts
-function displayAlerts(alerts) {
-    const alertsList = document.getElementById('alertsList');
+// Fetch the next page when the list is scrolled near the end of what is loaded
+async function loadMoreAlerts() {
+    if (alertList.loadingMore || alertList.alerts.length >= alertList.total) return;
+    alertList.loadingMore = true;
+    const query = buildAlertsQuery(alertList.alerts.length);
+    try {
+        const response = await fetch(`/api/alerts?${query}`);
+        const data = await response.json();
+        if (!data.success || buildAlertsQuery(alertList.alerts.length) !== query) return;
+        
+        // New alerts shift the offsets, so a page can overlap what is loaded
+        const loaded = new Set(alertList.alerts.map(alert => alert.id));
+        alertList.alerts = alertList.alerts.concat(data.alerts.filter(alert => !loaded.has(alert.id)));
+        alertList.total = data.alerts.length ? data.total : alertList.alerts.length;
+        setAlertRows();
+    } catch (error) {
+        console.error('Error loading more alerts:', error);
+    } finally {
+        alertList.loadingMore = false;
+    }
+}
+
+// Merge a fresh first page into the loaded alerts, keeping older pages
+function mergeAlerts(page, total, reset) {
+    const loaded = new Set(alertList.alerts.map(alert => alert.id));
+    const pageIds = new Set(page.map(alert => alert.id));
+    const overlaps = page.some(alert => loaded.has(alert.id));
+    
+    if (reset || !overlaps) {
+        // New filters, or so many new alerts that the page no longer reaches the loaded ones
+        if (reset) document.getElementById('alertsList').scrollTop = 0;
+        alertList.alerts = page;
+    } else {
+        page.forEach(alert => {
+            if (!loaded.has(alert.id)) alertList.fresh.add(alert.id);
+        });
+        alertList.alerts = page.concat(alertList.alerts.filter(alert => !pageIds.has(alert.id)));
+    }
+    alertList.total = total;
+    setAlertRows();
+}
+
+// Show server-side facet counts next to each filter option
+function updateFacetCounts(facets) {
+    if (!facets) return;
+    
+    const selects = {
+        urgencyFilter: facets.urgency || {},
+        sourceFilter: facets.source || {}
+    };
+    
+    Object.entries(selects).forEach(([selectId, counts]) => {
+        document.querySelectorAll(`#${selectId} option`).forEach(option => {
+            if (!option.dataset.label) option.dataset.label = option.textContent;
+            if (!option.value) return;
+            option.textContent = `${option.dataset.label} (${counts[option.value] || 0})`;
+        });
+    });
+}
+
+// Rebuild the rows from the loaded alerts and re-render the visible window
+function setAlertRows() {
+    alertList.rows = groupByIncident(alertList.alerts);
     
-    if (!alerts || alerts.length === 0) {
-        alertsList.innerHTML = `
+    if (alertList.rows.length === 0) {
+        const filtered = currentFilters.urgency || currentFilters.source;
+        showAlertsMessage(`
             <div class="loading">
-                <p style="color: var(--text-secondary);">No alerts found. Click "Run Monitor" to start scanning.</p>
+                <p style="color: var(--text-secondary);">${filtered
+                    ? 'No alerts match your filters'
+                    : 'No alerts found. Click "Run Monitor" to start scanning.'}</p>
             </div>
-        `;
+        `);
         return;
     }
     
-    // Apply filters
-    let filteredAlerts = alerts;
-    if (currentFilters.urgency) {
-        filteredAlerts = filteredAlerts.filter(a => a.urgency_level === currentFilters.urgency);
+    computeAlertOffsets();
+    renderAlerts();
+}
+
+// Replace the list with a message (loading, empty, error)
+function showAlertsMessage(html) {
+    document.getElementById('alertsList').innerHTML = html;
+    alertList.cards.clear();
+}
+
+function computeAlertOffsets() {
+    const offsets = new Array(alertList.rows.length + 1);
+    offsets[0] = 0;
+    alertList.rows.forEach((alert, index) => {
+        offsets[index + 1] = offsets[index] + (alertList.heights.get(alert.id) || ESTIMATED_CARD_HEIGHT);
+    });
+    alertList.offsets = offsets;
+}
+
+// Index of the row containing vertical position y (binary search over offsets)
+function findAlertRow(y) {
+    const offsets = alertList.offsets;
+    let low = 0;
+    let high = alertList.rows.length - 1;
+    while (low < high) {
+        const mid = (low + high + 1) >> 1;
+        if (offsets[mid] <= y) low = mid;
+        else high = mid - 1;
     }
-    if (currentFilters.source) {
-        filteredAlerts = filteredAlerts.filter(a => a.source === currentFilters.source);
+    return low;
+}
+
+function scheduleAlertsRender() {
+    if (alertList.frame !== null) return;
+    alertList.frame = requestAnimationFrame(() => {
+        alertList.frame = null;
+        renderAlerts();
+    });
+}
+
+// Render only the rows near the viewport, reusing unchanged cards
+function renderAlerts() {
+    const rows = alertList.rows;
+    if (rows.length === 0) return;
+    
+    const container = document.getElementById('alertsList');
+    let windowEl = container.querySelector(':scope > .alerts-window');
+    if (!windowEl) {
+        container.innerHTML = '<div class="alerts-window"></div>';
+        windowEl = container.firstElementChild;
+        alertList.cards.clear();
     }
     
-    if (filteredAlerts.length === 0) {
-        alertsList.innerHTML = `
-            <div class="loading">
-                <p style="color: var(--text-secondary);">No alerts match your filters</p>
-            </div>
-        `;
-        return;
-    }
+    const top = container.scrollTop;
+    const start = findAlertRow(Math.max(top - OVERSCAN_PX, 0));
+    const end = findAlertRow(top + container.clientHeight + OVERSCAN_PX) + 1;
+    const visible = rows.slice(start, end);
+    
+    // Keyed diff: drop cards that left the window, patch changed ones, insert new ones
+    const wanted = new Set(visible.map(alert => alert.id));
+    alertList.cards.forEach((card, id) => {
+        if (!wanted.has(id)) {
+            card.element.remove();
+            alertList.cards.delete(id);
+        }
+    });
     
-    alertsList.innerHTML = filteredAlerts.map(alert => createAlertCard(alert)).join('');
+    const built = [];
+    let cursor = windowEl.firstElementChild;
+    visible.forEach(alert => {
+        const signature = alertSignature(alert);
+        let card = alertList.cards.get(alert.id);
+        if (!card || card.signature !== signature) {
+            const element = buildAlertCard(alert);
+            if (card) {
+                if (cursor === card.element) cursor = element;
+                card.element.replaceWith(element);
+            }
+            card = { signature, element };
+            alertList.cards.set(alert.id, card);
+            built.push(alert.id);
+        }
+        if (card.element === cursor) {
+            cursor = cursor.nextElementSibling;
+        } else {
+            windowEl.insertBefore(card.element, cursor);
+        }
+    });
+    
+    built.forEach(id => {
+        if (expandedAlerts.has(id)) showAlertDetail(id);
+    });
+    
+    // Measure in one pass (a single layout), then size the spacers
+    let resized = false;
+    visible.forEach(alert => {
+        const element = alertList.cards.get(alert.id).element;
+        if (alertList.gap === undefined) alertList.gap = parseFloat(getComputedStyle(element).marginBottom) || 0;
+        const height = element.offsetHeight + alertList.gap;
+        if (alertList.heights.get(alert.id) !== height) {
+            alertList.heights.set(alert.id, height);
+            resized = true;
+        }
+    });
+    if (resized) computeAlertOffsets();
+    
+    const offsets = alertList.offsets;
+    windowEl.style.paddingTop = `${offsets[start]}px`;
+    windowEl.style.paddingBottom = `${offsets[rows.length] - offsets[Math.min(end, rows.length)]}px`;
+    
+    if (end >= rows.length - 20) loadMoreAlerts();
+}
+
+// Everything a card displays; a card is rebuilt only when this changes
+function alertSignature(alert) {
+    return [
+        alert.urgency_level, alert.source, alert.related_count || 0, alert.sentiment_label,
+        alert.sentiment_score, alert.status, alert.version, alert.content_preview,
+        alert.author, alert.url, getTimeAgo(alert.created_at)
+    ].join('\u0000');
+}
+
+function buildAlertCard(alert) {
+    const template = document.createElement('template');
+    template.innerHTML = createAlertCard(alert).trim();
+    const element = template.content.firstElementChild;
+    element.dataset.alertId = alert.id;
+    if (alertList.fresh.delete(alert.id)) element.classList.add('alert-new');
+    return element;
+}
+
+// Collapse alerts of the same incident into one card (the newest alert)
+function groupByIncident(alerts) {
+    const grouped = [];
+    const byIncident = {};
+    
+    alerts.forEach(alert => {
+        if (!alert.incident_id) {
+            grouped.push(alert);
+            return;
+        }
+        const lead = byIncident[alert.incident_id];
+        if (lead) {
+            lead.related_count += 1;
+        } else {
+            byIncident[alert.incident_id] = { ...alert, related_count: 0 };
+            grouped.push(byIncident[alert.incident_id]);
+        }
+    });
     
-    // Re-observe for animations
-    setTimeout(animateOnScroll, 100);
+    return grouped;
 }
 
 // Create Alert Card
@@ -254,6 +461,9 @@ function createAlertCard(alert) {
                         ${urgencyEmoji} ${alert.urgency_level}
                     </span>
                     <span class="badge source">📍 ${alert.source}</span>
+                    ${alert.related_count ? `
+                        <span class="badge source">🔗 +${alert.related_count} related</span>
+                    ` : ''}
                     <span class="badge sentiment">
                         ${sentimentEmoji} ${alert.sentiment_label} 
                         <span style="opacity: 0.8;">(${(alert.sentiment_score || 0).toFixed(2)})</span>
@@ -262,21 +472,19 @@ function createAlertCard(alert) {
                 <div class="alert-time">⏱️ ${timeAgo}</div>
             </div>
             
-            <div class="alert-content">
-                ${escapeHtml(alert.content)}
+            <div class="alert-content" id="alert-content-${alert.id}">
+                ${escapeHtml(alert.content_preview)}
             </div>
             
-            ${alert.recommended_response ? `
-                <div class="alert-recommendation">
-                    <strong>💡 Recommended Response:</strong>
-                    ${escapeHtml(alert.recommended_response)}
-                </div>
-            ` : ''}
+            <div class="alert-detail" id="alert-detail-${alert.id}" hidden></div>
             
             <div class="alert-footer">
                 <div class="alert-author">
                     👤 ${escapeHtml(alert.author || 'Unknown')}
                 </div>
+                <button class="alert-expand" id="alert-expand-${alert.id}" onclick="toggleAlertDetail(${alert.id})">
+                    ${alert.content_truncated ? 'Full post &amp; response' : 'Recommended response'}
+                </button>
                 ${alert.url ? `
                     <a href="${escapeHtml(alert.url)}" target="_blank" class="alert-link">
                         View Post →
@@ -287,6 +495,62 @@ function createAlertCard(alert) {
     `;
 }
 
+// Full alert records, fetched when a card is first expanded
+const alertDetails = new Map();
+
+// Cards the user expanded; kept expanded when re-rendered after scrolling
+const expandedAlerts = new Set();
+
+// Expand/collapse a card's full content and recommended response
+async function toggleAlertDetail(alertId) {
+    const detail = document.getElementById(`alert-detail-${alertId}`);
+    const button = document.getElementById(`alert-expand-${alertId}`);
+    if (!detail) return;
+    
+    if (!detail.hidden) {
+        detail.hidden = true;
+        button.classList.remove('expanded');
+        expandedAlerts.delete(alertId);
+        scheduleAlertsRender();
+        return;
+    }
+    
+    try {
+        if (!alertDetails.has(alertId)) {
+            button.disabled = true;
+            const response = await fetch(`/api/alert/${alertId}`);
+            const data = await response.json();
+            if (!data.success) throw new Error(data.error);
+            alertDetails.set(alertId, data.alert);
+        }
+        expandedAlerts.add(alertId);
+        showAlertDetail(alertId);
+        scheduleAlertsRender();
+    } catch (error) {
+        console.error('Error loading alert:', error);
+        showToast('Failed to load alert details', 'error');
+    } finally {
+        button.disabled = false;
+    }
+}
+
+// Fill a rendered card with its full content and recommended response
+function showAlertDetail(alertId) {
+    const alert = alertDetails.get(alertId);
+    const detail = document.getElementById(`alert-detail-${alertId}`);
+    if (!alert || !detail) return;
+    
+    document.getElementById(`alert-content-${alertId}`).innerHTML = escapeHtml(alert.content);
+    detail.innerHTML = alert.recommended_response ? `
+        <div class="alert-recommendation">
+            <strong>💡 Recommended Response:</strong>
+            ${escapeHtml(alert.recommended_response)}
+        </div>
+    ` : '';
+    detail.hidden = false;
+    document.getElementById(`alert-expand-${alertId}`).classList.add('expanded');
+}
+
 // Time ago helper
 function getTimeAgo(timestamp) {
     if (!timestamp) return 'Unknown time';
@@ -324,8 +588,15 @@ async function runMonitor() {
         });
         const data = await response.json();
         
-        if (data.success) {
-            const results = data.results;
+        if (!data.success) {
+            showToast(`❌ Error: ${data.error}`, 'error');
+            return;
+        }
+        
+        const job = await waitForJob(data.job_id);
+        
+        if (job.status === 'completed') {
+            const results = job.results;
             showToast(
                 `✅ Monitor completed! Found ${results.total_processed} items, created ${results.alerts_created} new alerts.`,
                 'success'
@@ -337,7 +608,7 @@ async function runMonitor() {
                 loadAlerts();
             }, 1000);
         } else {
-            showToast(`❌ Error: ${data.error}`, 'error');
+            showToast(`❌ Error: ${job.error || 'Monitoring job failed'}`, 'error');
         }
     } catch (error) {
         console.error('Error running monitor:', error);
@@ -348,6 +619,23 @@ async function runMonitor() {
     }
 }
 
+// Poll a monitoring job until it finishes
+async function waitForJob(jobId, intervalMs = 2000) {
+    while (true) {
+        const response = await fetch(`/api/monitor/jobs/${jobId}`);
+        const data = await response.json();
+        
+        if (!data.success) {
+            return { status: 'failed', error: data.error };
+        }
+        if (data.job.status === 'completed' || data.job.status === 'failed') {
+            return data.job;
+        }
+        
+        await new Promise(resolve => setTimeout(resolve, intervalMs));
+    }
+}
+
 // Test Alerts
 async function testAlerts() {
     const btn = document.getElementById('testAlerts');
@@ -0,0 +1,50 @@
+"""
+Shared fixtures: every test gets its own SQLite database
+"""
+
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.db import Database
+
+@pytest.fixture
+def db(tmp_path):
+    """A fresh Database singleton backed by a temporary file"""
+    Database._instance = None
+    database = Database(str(tmp_path / 'agent_saad.db'))
+    yield database
+    database.close()
+    Database._instance = None
+
+@pytest.fixture
+def components_db(db, monkeypatch):
+    """Route the shared component registry's database to the test database"""
+    from app.components import components
+    monkeypatch.setitem(components._instances, 'db', db)
+    return db
+
+@pytest.fixture
+def client(components_db):
+    """Flask test client of the dashboard app, on the test database"""
+    from app.main import app, response_cache
+    response_cache.clear()
+    app.config['TESTING'] = True
+    return app.test_client()
+
+def make_alert(**fields) -> dict:
+    """Alert data for Database.add_alert with overridable defaults"""
+    alert = {
+        'source': 'Twitter',
+        'content': 'The app keeps crashing on startup',
+        'author': '@someone',
+        'url': 'https://example.com/1',
+        'sentiment_score': -0.8,
+        'sentiment_label': 'NEGATIVE',
+        'urgency_level': 'HIGH',
+        'recommended_response': 'Escalate to engineering'
+    }
+    alert.update(fields)
+    return alert
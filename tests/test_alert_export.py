@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from functools import partial
+from conftest import make_alert
+from app.main import EXPORT_COLUMNS, export_chunks
+
+def test_ndjson_export_streams_full_alerts_oldest_first(client, components_db):
+    long_content = 'refund ' * 500
+    ids = [
+        components_db.add_alert(make_alert(content=long_content)),
+        components_db.add_alert(make_alert(source='Reddit')),
+        components_db.add_alert(make_alert())
+    ]
+    response = client.get('/api/alerts/export?source=Twitter')
+    assert response.is_streamed
+    assert response.mimetype == 'application/x-ndjson'
+    assert response.headers['Content-Disposition'].endswith('.ndjson"')
+
+    alerts = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [alert['id'] for alert in alerts] == [ids[0], ids[2]]
+    assert alerts[0]['content'] == long_content
+
+def test_csv_export(client, components_db):
+    for _ in range(3):
+        components_db.add_alert(make_alert(content='crash, "again"\non launch'))
+    response = client.get('/api/alerts/export?format=csv&limit=2')
+    assert response.mimetype == 'text/csv'
+
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert [row['id'] for row in rows] == ['1', '2']
+    assert rows[0]['content'] == 'crash, "again"\non launch'
+
+def test_export_rejects_bad_parameters(client, components_db):
+    assert client.get('/api/alerts/export?format=xml').status_code == 400
+    assert client.get('/api/alerts/export?limit=-1').status_code == 400
+    assert client.get('/api/alerts/export?status=open').status_code == 400
+
+def test_rows_are_yielded_in_chunks():
+    alerts = ({'id': i} for i in range(5))
+    chunks = list(export_chunks(alerts, 'ndjson', rows_per_chunk=2))
+    assert [chunk.count('\n') for chunk in chunks] == [2, 2, 1]
+
+    chunks = list(export_chunks(iter([]), 'csv'))
+    assert chunks == [','.join(EXPORT_COLUMNS) + '\r\n']
+
+def test_export_reads_the_cursor_lazily(client, components_db, monkeypatch):
+    import app.main
+    for _ in range(3):
+        components_db.add_alert(make_alert())
+    fetched = []
+    iter_alerts = components_db.iter_alerts
+
+    def counting_iter(*args, **kwargs):
+        for alert in iter_alerts(*args, batch_size=1, **kwargs):
+            fetched.append(alert['id'])
+            yield alert
+    monkeypatch.setattr(components_db, 'iter_alerts', counting_iter)
+    monkeypatch.setattr(app.main, 'export_chunks', partial(export_chunks, rows_per_chunk=1))
+
+    # The test client pulls the first chunk to start the response
+    response = client.get('/api/alerts/export', buffered=False)
+    chunks = iter(response.response)
+    assert fetched == [1]
+    next(chunks)
+    assert fetched == [1]
+    next(chunks)
+    assert fetched == [1, 2]
+    response.close()
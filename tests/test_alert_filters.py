@@ -0,0 +1,94 @@
+import pytest
+from conftest import make_alert
+from app.main import parse_alert_filters
+
+def add_alerts(db):
+    ids = [
+        db.add_alert(make_alert(source='Twitter', urgency_level='HIGH', sentiment_score=-0.9)),
+        db.add_alert(make_alert(source='Twitter', urgency_level='LOW', sentiment_score=-0.2)),
+        db.add_alert(make_alert(source='Reddit', urgency_level='HIGH', sentiment_score=-0.7)),
+        db.add_alert(make_alert(source='Reddit', urgency_level='CRITICAL', sentiment_score=-0.95)),
+    ]
+    db.update_alert_status(ids[2], 'resolved')
+    return ids
+
+def test_parse_alert_filters():
+    assert parse_alert_filters({}) == {}
+    assert parse_alert_filters({
+        'source': 'Twitter, Reddit,',
+        'urgency': 'HIGH',
+        'status': 'new,resolved',
+        'since': '2026-03-01T10:00:00+02:00',
+        'until': '2026-03-02',
+        'min_score': '-1',
+        'max_score': '-0.5'
+    }) == {
+        'source': ['Twitter', 'Reddit'],
+        'urgency': ['HIGH'],
+        'status': ['new', 'resolved'],
+        'since': '2026-03-01 08:00:00',
+        'until': '2026-03-02 23:59:59',
+        'min_score': -1.0,
+        'max_score': -0.5
+    }
+
+@pytest.mark.parametrize('args', [
+    {'urgency': 'HIGH,URGENT'},
+    {'status': 'open'},
+    {'since': 'yesterday'},
+    {'min_score': 'low'}
+])
+def test_parse_alert_filters_rejects_bad_input(args):
+    with pytest.raises(ValueError):
+        parse_alert_filters(args)
+
+def test_alerts_with_the_same_timestamp_are_paged_by_id(db):
+    # Alerts inserted in the same second share created_at
+    ids = [db.add_alert(make_alert()) for _ in range(5)]
+    pages = [db.get_recent_alerts(limit=2, offset=offset) for offset in (0, 2, 4)]
+    assert [alert['id'] for page in pages for alert in page] == ids[::-1]
+
+def test_filters_combine(db):
+    ids = add_alerts(db)
+    alerts = db.get_recent_alerts(filters={'source': ['Reddit'], 'status': ['new']})
+    assert [alert['id'] for alert in alerts] == [ids[3]]
+    alerts = db.get_recent_alerts(filters={'urgency': ['HIGH', 'CRITICAL'], 'max_score': -0.8})
+    assert [alert['id'] for alert in alerts] == [ids[3], ids[0]]
+
+def test_facets_ignore_their_own_filter(db):
+    add_alerts(db)
+    facets = db.get_alert_facets({'source': ['Reddit'], 'urgency': ['HIGH']})
+    assert facets == {
+        'total': 1,
+        'source': {'Twitter': 1, 'Reddit': 1},
+        'urgency': {'HIGH': 1, 'CRITICAL': 1},
+        'status': {'resolved': 1}
+    }
+
+def test_alert_list_endpoint(client, components_db):
+    ids = add_alerts(components_db)
+    payload = client.get('/api/alerts?source=Twitter&limit=1').get_json()
+    assert payload['total'] == 2 and payload['count'] == 1
+    assert payload['alerts'][0]['id'] == ids[1]
+    assert payload['facets']['source'] == {'Twitter': 2, 'Reddit': 2}
+    assert payload['facets']['status'] == {'new': 2}
+
+    response = client.get('/api/alerts?urgency=URGENT')
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid urgency: URGENT'
+
+def test_list_inflates_each_alert_once(db, monkeypatch):
+    import zlib
+    from config import Config
+    monkeypatch.setattr(Config, 'ALERT_CONTENT_COMPRESS_MIN_BYTES', 64)
+    for _ in range(3):
+        db.add_alert(make_alert(content='crashed again ' * 40))
+    db.add_alert(make_alert(content='short'))
+
+    decompress = zlib.decompress
+    calls = []
+    monkeypatch.setattr(zlib, 'decompress', lambda data: calls.append(1) or decompress(data))
+    alerts = db.get_recent_alerts(limit=3, preview_chars=20)
+    assert len(calls) == 2
+    assert [alert['content_truncated'] for alert in alerts] == [False, True, True]
+    assert alerts[1]['content_preview'] == 'crashed again crashe…'
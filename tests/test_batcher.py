@@ -0,0 +1,70 @@
+import threading
+import pytest
+from app.models.batcher import MicroBatcher
+
+class RecordingModel:
+    """Batch function recording the batches it was given"""
+
+    def __init__(self, fail_on=None):
+        self.batches = []
+        self.fail_on = fail_on
+
+    def __call__(self, texts):
+        self.batches.append(list(texts))
+        if self.fail_on in texts:
+            raise RuntimeError('model failed')
+        return [{'text': text, 'normalized_score': -len(text)} for text in texts]
+
+def analyze_concurrently(batcher, texts):
+    results = [None] * len(texts)
+    barrier = threading.Barrier(len(texts))
+
+    def call(index):
+        barrier.wait()
+        try:
+            results[index] = batcher.analyze(texts[index], timeout=5)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=call, args=(index,)) for index in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_concurrent_requests_share_one_batch():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_wait_ms=300, max_batch_size=64)
+    texts = [f'text number {i}' * (i + 1) for i in range(8)]
+
+    results = analyze_concurrently(batcher, texts)
+    assert len(model.batches) == 1 and sorted(model.batches[0]) == sorted(texts)
+    # Every caller gets the result for its own text
+    assert [result['text'] for result in results] == texts
+
+def test_batches_are_capped_at_max_size():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_wait_ms=300, max_batch_size=4)
+    futures = [batcher.submit(str(i)) for i in range(10)]
+
+    assert [future.result(timeout=5)['text'] for future in futures] == [str(i) for i in range(10)]
+    assert [len(batch) for batch in model.batches] == [4, 4, 2]
+
+def test_lone_request_is_not_held_past_max_wait():
+    model = RecordingModel()
+    batcher = MicroBatcher(model, max_wait_ms=20, max_batch_size=64)
+    assert batcher.analyze('alone', timeout=2)['text'] == 'alone'
+
+def test_model_error_fails_the_batch_and_batcher_recovers():
+    model = RecordingModel(fail_on='bad')
+    batcher = MicroBatcher(model, max_wait_ms=300, max_batch_size=64)
+
+    results = analyze_concurrently(batcher, ['good', 'bad', 'fine'])
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert batcher.analyze('later', timeout=5)['text'] == 'later'
+
+def test_short_result_list_fails_instead_of_hanging():
+    batcher = MicroBatcher(lambda texts: [], max_wait_ms=10, max_batch_size=64)
+    with pytest.raises(ValueError):
+        batcher.analyze('lost', timeout=5)
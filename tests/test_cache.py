@@ -0,0 +1,68 @@
+import sqlite3
+from conftest import make_alert
+from app.cache import ResponseCache
+
+def test_entry_is_reused_until_the_version_changes():
+    cache = ResponseCache(max_entries=4, max_age=60)
+    calls = []
+    compute = lambda: calls.append(1) or len(calls)
+    assert cache.get_or_compute('stats', 1, compute) == 1
+    assert cache.get_or_compute('stats', 1, compute) == 1
+    assert cache.get_or_compute('stats', 2, compute) == 2
+    assert cache.get_status() == {'entries': 1, 'hits': 1, 'misses': 2}
+
+def test_entries_expire_and_are_evicted_least_recently_used(monkeypatch):
+    import app.cache
+    now = [100.0]
+    monkeypatch.setattr(app.cache.time, 'monotonic', lambda: now[0])
+    cache = ResponseCache(max_entries=2, max_age=30)
+    for key in ('a', 'b'):
+        cache.get_or_compute(key, 1, lambda: key)
+    cache.get_or_compute('a', 1, lambda: 'recomputed')
+    cache.get_or_compute('c', 1, lambda: 'c')
+    assert list(cache.entries) == ['a', 'c']
+
+    now[0] += 31
+    assert cache.get_or_compute('a', 1, lambda: 'fresh') == 'fresh'
+
+def test_disabled_cache_always_computes():
+    cache = ResponseCache(max_entries=0)
+    assert [cache.get_or_compute('k', 1, lambda: object()) is not None for _ in range(2)] == [True, True]
+    assert cache.get_status()['entries'] == 0
+
+def count_calls(monkeypatch, db, name):
+    calls = []
+    method = getattr(db, name)
+    monkeypatch.setattr(db, name, lambda *args, **kwargs: calls.append(1) or method(*args, **kwargs))
+    return calls
+
+def test_stats_are_cached_until_an_alert_is_added(client, components_db, monkeypatch):
+    calls = count_calls(monkeypatch, components_db, 'get_stats')
+    components_db.add_alert(make_alert())
+
+    assert client.get('/api/stats').get_json()['stats']['total_alerts'] == 1
+    assert client.get('/api/stats').get_json()['stats']['total_alerts'] == 1
+    assert len(calls) == 1
+
+    # A write from any connection (another worker, the scheduler) bumps the data version
+    conn = sqlite3.connect(components_db.db_path)
+    conn.execute("INSERT INTO alerts (source, content, urgency_level) VALUES ('Reddit', 'refund please', 'LOW')")
+    conn.commit()
+    conn.close()
+    assert client.get('/api/stats').get_json()['stats']['total_alerts'] == 2
+    assert len(calls) == 2
+
+def test_alert_list_is_invalidated_by_a_status_change(client, components_db, monkeypatch):
+    calls = count_calls(monkeypatch, components_db, 'get_recent_alerts')
+    alert_id = components_db.add_alert(make_alert())
+
+    assert client.get('/api/alerts?status=new').get_json()['total'] == 1
+    assert client.get('/api/alerts?status=new').get_json()['total'] == 1
+    # A different query string is a different entry
+    assert client.get('/api/alerts?status=resolved').get_json()['total'] == 0
+    assert len(calls) == 2
+
+    client.put(f'/api/alert/{alert_id}/status', json={'status': 'resolved'})
+    assert client.get('/api/alerts?status=new').get_json()['total'] == 0
+    assert client.get('/api/alerts?status=resolved').get_json()['alerts'][0]['status'] == 'resolved'
+    assert len(calls) == 4
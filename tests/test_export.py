@@ -0,0 +1,94 @@
+import json
+import os
+import pytest
+from conftest import make_alert
+
+pa = pytest.importorskip('pyarrow')
+from app.analytics.export import AnalyticsExporter, WATERMARK_FILE, load_table
+
+def add_alert_at(db, created_at, **fields):
+    alert = make_alert(**fields)
+    alert_id = db.add_alert(alert)
+    db.writer.submit(lambda cursor: cursor.execute(
+        'UPDATE alerts SET created_at = ? WHERE id = ?', (created_at, alert_id)
+    )).result()
+    return alert_id
+
+@pytest.fixture
+def export_dir(tmp_path):
+    return str(tmp_path / 'export')
+
+def exporter(db, export_dir, **kwargs):
+    return AnalyticsExporter(db.db_path, export_dir, **kwargs)
+
+def watermarks(export_dir):
+    with open(os.path.join(export_dir, WATERMARK_FILE)) as f:
+        return json.load(f)
+
+def test_rows_are_partitioned_by_date(db, export_dir):
+    add_alert_at(db, '2026-03-01 10:00:00')
+    add_alert_at(db, '2026-03-01 23:59:59')
+    add_alert_at(db, '2026-03-02 00:00:01', source='Reddit')
+
+    assert exporter(db, export_dir).export() == {'alerts': 3, 'processed_items': 0}
+    assert sorted(os.listdir(os.path.join(export_dir, 'alerts'))) == ['date=2026-03-01', 'date=2026-03-02']
+    assert os.listdir(os.path.join(export_dir, 'alerts', 'date=2026-03-01')) == [
+        'part-000000000001-000000000002.parquet'
+    ]
+    table = load_table('alerts', export_dir)
+    assert sorted(table['id'].to_pylist()) == [1, 2, 3]
+    assert watermarks(export_dir) == {'alerts': 3}
+
+def test_compressed_content_is_exported_as_text(db, export_dir, monkeypatch):
+    from config import Config
+    monkeypatch.setattr(Config, 'ALERT_CONTENT_COMPRESS_MIN_BYTES', 16)
+    content = 'the order never arrived ' * 20
+    add_alert_at(db, '2026-03-01 10:00:00', content=content)
+    assert isinstance(db.get_connection().execute('SELECT content FROM alerts').fetchone()[0], bytes)
+
+    exporter(db, export_dir).export()
+    assert load_table('alerts', export_dir, columns=['content'])['content'].to_pylist() == [content]
+
+def test_unsettled_row_stops_the_batch_and_is_not_skipped(db, export_dir):
+    add_alert_at(db, '2026-03-01 10:00:00')
+    newest = add_alert_at(db, '2099-01-01 00:00:00')
+    add_alert_at(db, '2026-03-01 11:00:00')
+
+    # Row 3 is settled, but exporting it would move the watermark past row 2
+    assert exporter(db, export_dir).export()['alerts'] == 1
+    assert watermarks(export_dir)['alerts'] == 1
+
+    db.writer.submit(lambda cursor: cursor.execute(
+        "UPDATE alerts SET created_at = '2026-03-01 12:00:00' WHERE id = ?", (newest,)
+    )).result()
+    assert exporter(db, export_dir).export()['alerts'] == 2
+    assert sorted(load_table('alerts', export_dir)['id'].to_pylist()) == [1, 2, 3]
+    # Nothing is exported twice
+    assert exporter(db, export_dir).export()['alerts'] == 0
+
+def test_export_resumes_from_the_watermark_in_batches(db, export_dir):
+    for hour in range(5):
+        add_alert_at(db, f'2026-03-01 0{hour}:00:00')
+    assert exporter(db, export_dir, batch_size=2).export()['alerts'] == 5
+    assert len(os.listdir(os.path.join(export_dir, 'alerts', 'date=2026-03-01'))) == 3
+
+    add_alert_at(db, '2026-03-01 06:00:00')
+    assert exporter(db, export_dir, batch_size=2).export()['alerts'] == 1
+    assert watermarks(export_dir)['alerts'] == 6
+
+def test_load_table_prunes_partitions(db, export_dir):
+    for day in ('01', '02', '03'):
+        add_alert_at(db, f'2026-03-{day} 10:00:00', source='Twitter')
+        add_alert_at(db, f'2026-03-{day} 11:00:00', source='Reddit')
+    exporter(db, export_dir).export()
+
+    # A partition outside the range is never opened, so corrupting it does no harm
+    broken = os.path.join(export_dir, 'alerts', 'date=2026-03-03')
+    for name in os.listdir(broken):
+        with open(os.path.join(broken, name), 'wb') as f:
+            f.write(b'not parquet')
+
+    table = load_table('alerts', export_dir, start_date='2026-03-02', end_date='2026-03-02')
+    assert table['id'].to_pylist() == [3, 4]
+    table = load_table('alerts', export_dir, end_date='2026-03-02', source='Reddit')
+    assert sorted(table['id'].to_pylist()) == [2, 4]
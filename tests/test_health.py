@@ -0,0 +1,25 @@
+import time
+from config import Config
+
+def set_heartbeat(db, age):
+    db.writer.submit(lambda cursor: cursor.execute(
+        "INSERT OR REPLACE INTO process_heartbeats (name, pid, heartbeat_at) VALUES ('scheduler', 4242, ?)",
+        (time.time() - age,)
+    )).result()
+
+def test_health_without_a_scheduler(client):
+    data = client.get('/health').get_json()
+    assert (data['status'], data['scheduler']) == ('healthy', None)
+
+def test_health_reports_a_running_scheduler(client, components_db):
+    from app.agent import record_scheduler_heartbeat
+    record_scheduler_heartbeat()
+    components_db.writer.submit(lambda cursor: None).result()
+    data = client.get('/health').get_json()
+    assert data['status'] == 'healthy' and data['scheduler']['alive']
+
+def test_health_reports_a_dead_scheduler(client, components_db):
+    set_heartbeat(components_db, Config.SCHEDULER_STALE_SECONDS + 5)
+    data = client.get('/health').get_json()
+    assert data['status'] == 'degraded'
+    assert data['scheduler']['pid'] == 4242 and not data['scheduler']['alive']
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+from conftest import make_alert
+import app.incidents
+from app.incidents import IncidentIndex
+
+DIMENSION = 8
+
+def unit(*weights):
+    vector = np.zeros(DIMENSION, dtype=np.float32)
+    vector[:len(weights)] = weights
+    return vector / np.linalg.norm(vector)
+
+def basis(index):
+    return unit(*([0] * index + [1]))
+
+def assign(db, index, embedding, urgency='HIGH'):
+    return index.assign(db.add_alert(make_alert(urgency_level=urgency)), list(embedding), urgency)
+
+def flush(db):
+    db.writer.submit(lambda cursor: None).result()
+
+@pytest.fixture
+def index(db):
+    return IncidentIndex(db, threshold=0.9, window_hours=24, max_size=100)
+
+def test_similar_alerts_join_one_incident(db, index):
+    outage, created = assign(db, index, unit(1, 0.1))
+    assert created
+    assert assign(db, index, unit(1, 0.2), 'CRITICAL') == (outage, False)
+    billing, created = assign(db, index, unit(0.1, 1))
+    assert created and billing != outage
+    flush(db)
+
+    incident = db.get_incident(outage)
+    assert incident['alert_count'] == 2 and incident['max_urgency'] == 'CRITICAL'
+    assert index.get_status() == {'window_size': 3, 'incidents_in_window': 2, 'threshold': 0.9}
+
+def test_incident_notifies_again_only_when_it_escalates(db, index):
+    incident_id, _ = assign(db, index, basis(0))
+    assert index.should_notify(incident_id, 'HIGH')
+    db.mark_incident_notified(incident_id, 'HIGH').result()
+    assert not index.should_notify(incident_id, 'HIGH')
+    assert not index.should_notify(incident_id, 'MEDIUM')
+    assert index.should_notify(incident_id, 'CRITICAL')
+
+def test_window_drops_the_oldest_alerts(db, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(app.incidents.time, 'time', lambda: now[0])
+    index = IncidentIndex(db, threshold=0.9, window_hours=1, max_size=3)
+    first, _ = assign(db, index, basis(0))
+    for axis in (1, 2, 3):
+        assign(db, index, basis(axis))
+    # Pushed out by max_size
+    assert assign(db, index, basis(0))[0] != first
+
+    now[0] += 3601
+    recent, _ = assign(db, index, basis(4))
+    assert assign(db, index, basis(4)) == (recent, False)
+    assert index.get_status()['window_size'] == 2
+
+def test_window_buffers_are_reused(db, monkeypatch):
+    monkeypatch.setattr(IncidentIndex, 'INITIAL_CAPACITY', 4)
+    index = IncidentIndex(db, threshold=0.99, window_hours=24, max_size=6)
+    embeddings = [unit(1, step / 10) for step in range(40)]
+    for step, embedding in enumerate(embeddings):
+        # Every other alert is far from all others and opens its own incident
+        assign(db, index, embedding if step % 2 else -embedding)
+        assert len(index._vectors) <= 2 * index.max_size
+
+    # The max_size rows the last alert was compared with, plus the last alert
+    expected = [embedding if step % 2 else -embedding for step, embedding in enumerate(embeddings)][-7:]
+    np.testing.assert_array_equal(index.vectors, np.array(expected))
+    assert len(index.incident_ids) == 7
+
+def test_index_is_rebuilt_from_the_database(db, index):
+    incident_id, _ = assign(db, index, unit(1, 1))
+    assign(db, index, basis(5))
+    flush(db)
+
+    restarted = IncidentIndex(db, threshold=0.9, window_hours=24, max_size=100)
+    assert restarted.get_status()['window_size'] == 2
+    assert assign(db, restarted, unit(1, 0.9)) == (incident_id, False)
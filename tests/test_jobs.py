@@ -0,0 +1,142 @@
+import multiprocessing
+import os
+import threading
+import time
+import pytest
+from app import jobs
+from app.jobs import MonitorJobs
+
+class Cycle:
+    """Monitoring cycle that blocks until released and counts its runs"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.started = threading.Event()
+        self.runs = 0
+
+    def __call__(self):
+        self.runs += 1
+        self.started.set()
+        assert self.release.wait(5)
+        return {'total_processed': 3, 'alerts_created': 1}
+
+def wait_for(job_runner, job_id, status, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = job_runner.get(job_id)
+        if job['status'] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"Job {job_id} never reached {status}: {job_runner.get(job_id)}")
+
+def test_overlapping_triggers_coalesce_into_one_cycle(components_db):
+    cycle = Cycle()
+    runner = MonitorJobs(cycle)
+
+    first = runner.submit('manual')
+    assert cycle.started.wait(5)
+    second = runner.submit('manual')
+    scheduled = runner.run_scheduled()
+    assert second['id'] == scheduled['id'] == first['id']
+
+    cycle.release.set()
+    job = wait_for(runner, first['id'], 'completed')
+    assert cycle.runs == 1
+    assert job['triggers'] == ['manual', 'manual', 'scheduled']
+    assert job['results'] == {'total_processed': 3, 'alerts_created': 1}
+    assert 'heartbeat_at' not in job
+
+def test_any_worker_can_report_a_job(components_db):
+    cycle = Cycle()
+    cycle.release.set()
+    job = MonitorJobs(cycle).submit('manual')
+
+    # A different web worker has its own MonitorJobs but the same database
+    other_worker = MonitorJobs(cycle)
+    assert wait_for(other_worker, job['id'], 'completed')['started_at'] is not None
+    assert other_worker.get('missing') is None
+
+def test_queued_jobs_run_in_the_scheduler_process(components_db):
+    cycle = Cycle()
+    cycle.release.set()
+    web = MonitorJobs(cycle, execute_locally=False)
+    scheduler = MonitorJobs(cycle)
+
+    job = web.submit('manual')
+    assert job['status'] == 'queued'
+    assert web.submit('manual')['id'] == job['id']
+    assert cycle.runs == 0
+
+    finished = scheduler.run_queued()
+    assert finished['id'] == job['id'] and finished['status'] == 'completed'
+    assert scheduler.run_queued() is None
+    assert cycle.runs == 1
+
+def test_failed_cycle_is_reported(components_db):
+    def cycle():
+        raise RuntimeError("upstream down")
+
+    job = MonitorJobs(cycle).run_scheduled()
+    assert job['status'] == 'failed'
+    assert job['error'] == 'upstream down'
+
+def test_scopes_do_not_coalesce(components_db):
+    cycle = Cycle()
+    shard_a = MonitorJobs(cycle, scope='worker:a', execute_locally=False)
+    shard_b = MonitorJobs(cycle, scope='worker:b', execute_locally=False)
+    assert shard_a.submit()['id'] != shard_b.submit()['id']
+
+def test_abandoned_job_does_not_block_new_cycles(components_db, monkeypatch):
+    cycle = Cycle()
+    cycle.release.set()
+    runner = MonitorJobs(cycle, execute_locally=False)
+    stale = runner.submit('manual')
+
+    # The process that queued the job died and nothing renewed its heartbeat
+    monkeypatch.setattr(jobs, 'JOB_STALE_SECONDS', -1)
+    assert runner.get(stale['id'])['status'] == 'failed'
+    fresh = runner.run_scheduled()
+    assert fresh['id'] != stale['id'] and fresh['status'] == 'completed'
+    assert components_db.get_monitor_job(stale['id'])['status'] == 'failed'
+
+def _claim_in_child(path, results):
+    from app.database.db import Database
+    Database._instance = None
+    db = Database(path)
+    job, created = db.claim_monitor_job('default', f'pid-{os.getpid()}', 0)
+    db.close()
+    results.put((job['id'], created))
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="needs fork")
+def test_processes_racing_to_trigger_share_one_job(components_db):
+    context = multiprocessing.get_context('fork')
+    results = context.Queue()
+    processes = [
+        context.Process(target=_claim_in_child, args=(components_db.db_path, results)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    claims = [results.get(timeout=30) for _ in processes]
+    for process in processes:
+        process.join(10)
+
+    assert len({job_id for job_id, _ in claims}) == 1
+    assert sum(created for _, created in claims) == 1
+    assert len(components_db.get_monitor_job(claims[0][0])['triggers']) == 4
+
+def test_job_endpoints(client, monkeypatch):
+    from app import agent
+    cycle = Cycle()
+    cycle.release.set()
+    monkeypatch.setattr(agent.monitor_jobs, 'cycle_fn', cycle)
+    monkeypatch.setattr(agent.monitor_jobs, 'execute_locally', False)
+
+    response = client.post('/api/monitor/run')
+    assert response.status_code == 202
+    job_id = response.get_json()['job_id']
+    assert client.get(f'/api/monitor/jobs/{job_id}').get_json()['job']['status'] == 'queued'
+
+    MonitorJobs(cycle).run_queued()
+    job = client.get(f'/api/monitor/jobs/{job_id}').get_json()['job']
+    assert job['status'] == 'completed' and job['results']['alerts_created'] == 1
+    assert client.get('/api/monitor/jobs/unknown').status_code == 404
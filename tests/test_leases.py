@@ -0,0 +1,115 @@
+import time
+
+KEYWORDS = ['alpha', 'bravo', 'charlie', 'delta', 'echo']
+TTL = 30
+
+def acquire(db, worker_id, ttl=TTL):
+    return db.acquire_keyword_leases(worker_id, KEYWORDS, ttl)
+
+def test_single_worker_leases_every_keyword(db):
+    assert sorted(acquire(db, 'w1')) == KEYWORDS
+
+def test_joining_worker_gets_an_even_share(db):
+    acquire(db, 'w1')
+    # Everything is still leased to w1 until it heartbeats and releases its excess
+    assert acquire(db, 'w2') == []
+    first = acquire(db, 'w1')
+    second = acquire(db, 'w2')
+    assert (len(first), len(second)) == (3, 2)
+    assert sorted(first + second) == KEYWORDS
+
+def test_shares_are_stable_between_heartbeats(db):
+    for worker_id in ('w1', 'w2', 'w3', 'w1', 'w2', 'w3'):
+        acquire(db, worker_id)
+    shares = {worker_id: acquire(db, worker_id) for worker_id in ('w1', 'w2', 'w3')}
+    assert {worker_id: acquire(db, worker_id) for worker_id in ('w1', 'w2', 'w3')} == shares
+    assert sorted(sum(shares.values(), [])) == KEYWORDS
+
+def test_dead_worker_leases_are_taken_over(db):
+    acquire(db, 'w1')
+    acquire(db, 'w2')
+    acquire(db, 'w1')
+    time.sleep(0.1)
+    # w1 has been silent longer than the ttl
+    assert sorted(acquire(db, 'w2', ttl=0.05)) == KEYWORDS
+
+def test_released_worker_frees_its_keywords(db):
+    acquire(db, 'w1')
+    acquire(db, 'w2')
+    acquire(db, 'w1')
+    acquire(db, 'w2')
+    db.release_worker('w1')
+    assert sorted(acquire(db, 'w2')) == KEYWORDS
+
+MANY_KEYWORDS = [f'keyword-{i}' for i in range(10)]
+
+def lease_worker(path, worker_id, barrier, survivors, results, crash):
+    """Contend for leases from its own process, then converge and report what it holds"""
+    import os
+    from app.database.db import Database
+    try:
+        Database._instance = None
+        db = Database(path)
+        barrier.wait()
+        for _ in range(20):
+            db.acquire_keyword_leases(worker_id, MANY_KEYWORDS, TTL)
+        for _ in range(3):
+            barrier.wait()
+            held = db.acquire_keyword_leases(worker_id, MANY_KEYWORDS, TTL)
+        results.put(('converged', worker_id, sorted(held)))
+        if crash:
+            # Die without releasing, like a killed worker (after the report is flushed)
+            results.close()
+            results.join_thread()
+            os._exit(0)
+        time.sleep(1)
+        for _ in range(3):
+            survivors.wait()
+            held = db.acquire_keyword_leases(worker_id, MANY_KEYWORDS, 0.5)
+        results.put(('survived', worker_id, sorted(held)))
+        db.close()
+    except Exception as e:
+        results.put(('error', worker_id, repr(e)))
+
+def stored_leases(path):
+    import sqlite3
+    conn = sqlite3.connect(path)
+    rows = conn.execute('SELECT keyword, worker_id FROM keyword_leases').fetchall()
+    conn.close()
+    return dict(rows)
+
+def test_worker_processes_share_keywords_and_take_over_expired_leases(tmp_path):
+    import multiprocessing
+    from app.database.db import Database
+    path = str(tmp_path / 'shared.db')
+    Database._instance = None
+    Database(path).close()
+    Database._instance = None
+
+    context = multiprocessing.get_context('fork')
+    barrier, survivors, results = context.Barrier(3), context.Barrier(2), context.Queue()
+    processes = [
+        context.Process(target=lease_worker, args=(path, f'w{i}', barrier, survivors, results, i == 0))
+        for i in range(3)
+    ]
+    for process in processes:
+        process.start()
+    reports = [results.get(timeout=30) for _ in range(5)]
+    for process in processes:
+        process.join(10)
+
+    assert [report for report in reports if report[0] == 'error'] == []
+    converged = {worker_id: held for stage, worker_id, held in reports if stage == 'converged'}
+    survived = {worker_id: held for stage, worker_id, held in reports if stage == 'survived'}
+
+    # While all three ran, every keyword was leased to exactly one of them
+    assert sorted(sum(converged.values(), [])) == sorted(MANY_KEYWORDS)
+    assert sorted(len(held) for held in converged.values()) == [3, 3, 4]
+
+    # w0 died holding leases; the survivors took all of them over
+    assert set(survived) == {'w1', 'w2'}
+    assert sorted(sum(survived.values(), [])) == sorted(MANY_KEYWORDS)
+    assert sorted(len(held) for held in survived.values()) == [5, 5]
+    leases = stored_leases(path)
+    assert set(leases.values()) == {'w1', 'w2'}
+    assert {keyword: worker_id for worker_id, held in survived.items() for keyword in held} == leases
@@ -0,0 +1,92 @@
+import time
+import pytest
+from conftest import make_alert
+
+pytest.importorskip('slack_sdk')
+from app.alerts.slack_alert import SlackAlerter
+from app.monitors.rate_limits import RateLimitManager
+
+class FakeSlackClient:
+    def __init__(self):
+        self.posted = []
+
+    def chat_postMessage(self, channel, blocks, text):
+        self.posted.append(text)
+        return {'ts': str(len(self.posted))}
+
+class NoEmail:
+    def is_configured(self):
+        return False
+
+    def send_alert(self, alert_data):
+        return False
+
+@pytest.fixture
+def slack(components_db, monkeypatch):
+    from app.components import components
+    alerter = object.__new__(SlackAlerter)
+    alerter.client = FakeSlackClient()
+    alerter.channel = '#alerts'
+    monkeypatch.setitem(components._instances, 'slack_alerter', alerter)
+    monkeypatch.setitem(components._instances, 'email_alerter', NoEmail())
+    monkeypatch.setitem(components._instances, 'incident_index', None)
+    return alerter
+
+def set_slack_quota(remaining):
+    RateLimitManager().update('Slack', 'chat.postMessage', remaining=remaining, reset_at=time.time() + 600)
+
+def flush(db):
+    """Wait for the writes queued so far (notification marks are not awaited)"""
+    db.writer.submit(lambda cursor: None).result()
+
+def create_alert(db, **fields):
+    alert = make_alert(urgency_level='CRITICAL', **fields)
+    return db.add_alert(alert), alert
+
+def test_alert_is_deferred_while_slack_quota_is_spent(slack, components_db):
+    from app.agent import retry_deferred_notifications, send_notifications
+    set_slack_quota(0)
+    alert_id, alert = create_alert(components_db)
+
+    assert not send_notifications(alert_id, alert)
+    flush(components_db)
+    assert [pending['id'] for pending in components_db.get_unnotified_alerts()] == [alert_id]
+    # Still no quota: the retry keeps it pending
+    assert retry_deferred_notifications() == 0
+    flush(components_db)
+    assert [pending['id'] for pending in components_db.get_unnotified_alerts()] == [alert_id]
+    assert slack.client.posted == []
+
+def test_deferred_alert_is_sent_once_quota_returns(slack, components_db):
+    from app.agent import retry_deferred_notifications, send_notifications
+    set_slack_quota(0)
+    first_id, first = create_alert(components_db, content='Checkout is down')
+    second_id, second = create_alert(components_db, content='Payments fail')
+    send_notifications(first_id, first)
+    send_notifications(second_id, second)
+    flush(components_db)
+
+    set_slack_quota(10)
+    assert retry_deferred_notifications() == 2
+    flush(components_db)
+    assert len(slack.client.posted) == 2
+    assert components_db.get_unnotified_alerts() == []
+    assert [components_db.get_alert(alert_id)['notified'] for alert_id in (first_id, second_id)] == [1, 1]
+    assert retry_deferred_notifications() == 0
+
+def test_claimed_notification_is_sent_by_one_process_only(slack, components_db):
+    from app.agent import send_notifications
+    set_slack_quota(0)
+    alert_id, alert = create_alert(components_db)
+    send_notifications(alert_id, alert)
+    flush(components_db)
+    assert components_db.claim_notification(alert_id)
+    assert not components_db.claim_notification(alert_id)
+
+def test_nothing_is_deferred_without_a_configured_channel(slack, components_db):
+    from app.agent import send_notifications
+    slack.client = None
+    alert_id, alert = create_alert(components_db)
+    assert not send_notifications(alert_id, alert)
+    flush(components_db)
+    assert components_db.get_unnotified_alerts() == []
@@ -0,0 +1,117 @@
+import pytest
+from config import Config
+from app.models.lexicon import LexiconScorer
+from app.monitors.items import MentionItem
+
+@pytest.fixture(scope='module')
+def scorer():
+    return LexiconScorer()
+
+def test_lexicon_scores_polarity_negation_and_but(scorer):
+    assert scorer.score('The app is terrible and keeps crashing') < -0.5
+    assert scorer.score('Great support, thanks!') > 0.5
+    assert scorer.score('not bad at all') > 0
+    assert scorer.score('It was great but now it is broken') < 0
+    assert scorer.score('') == 0 and scorer.score('see you on monday') == 0
+
+def test_lexicon_batch_matches_single_texts(scorer):
+    # Negation, booster and "but" windows must not reach into the neighbouring text
+    texts = ['not', 'great', 'very', 'bad', 'but', 'good', 'TERRIBLE service', 'so so slow!!', None]
+    batch = scorer.score_batch(texts)
+    assert list(batch) == pytest.approx([scorer.score(text) for text in texts])
+    assert len(scorer.score_batch([])) == 0
+
+class FakeScorer:
+    def __init__(self, scores):
+        self.scores = scores
+
+    def score_batch(self, texts):
+        return [self.scores[text] for text in texts]
+
+class FakeAnalyzer:
+    def __init__(self):
+        self.texts = []
+
+    def analyze_batch(self, texts, with_embeddings=False):
+        self.texts.extend(texts)
+        return [{'label': 'NEGATIVE', 'score': 0.9, 'normalized_score': -0.9} for _ in texts]
+
+@pytest.fixture
+def cascade(monkeypatch):
+    from app.components import components
+    analyzer = FakeAnalyzer()
+    scores = {'clearly happy customer': 0.6, 'borderline comment here': 0.02, 'angry customer complaint': -0.7}
+    monkeypatch.setitem(components._instances, 'lexicon_scorer', FakeScorer(scores))
+    monkeypatch.setitem(components._instances, 'sentiment_analyzer', analyzer)
+    monkeypatch.setitem(components._instances, 'incident_index', None)
+    monkeypatch.setattr(Config, 'SENTIMENT_THRESHOLD', -0.5)
+    return analyzer, [MentionItem('Twitter', str(i), text, '@a') for i, text in enumerate(scores)]
+
+def test_only_items_within_margin_reach_the_model(cascade, monkeypatch):
+    from app.agent import analyze_items
+    analyzer, items = cascade
+    monkeypatch.setattr(Config, 'SENTIMENT_PREFILTER_MARGIN', 0.05)
+
+    results = analyze_items(items)
+    assert analyzer.texts == ['borderline comment here', 'angry customer complaint']
+    assert results['0'] == {'label': 'POSITIVE', 'score': 0.6, 'normalized_score': 0.6, 'stage': 'lexicon'}
+    assert results['1']['normalized_score'] == -0.9 and 'stage' not in results['1']
+
+def test_margin_never_drops_below_alert_threshold(cascade, monkeypatch):
+    from app.agent import analyze_items
+    analyzer, items = cascade
+    # A margin below the threshold would let the lexicon alone decide alert-worthy items
+    monkeypatch.setattr(Config, 'SENTIMENT_PREFILTER_MARGIN', -0.9)
+
+    results = analyze_items(items)
+    assert analyzer.texts == ['angry customer complaint']
+    assert results['1']['stage'] == 'lexicon'
+
+def test_processed_items_record_the_stage(cascade, components_db, monkeypatch):
+    from app.agent import analyze_items, process_item
+    _, items = cascade
+    monkeypatch.setattr(Config, 'SENTIMENT_PREFILTER_MARGIN', 0.05)
+    results = analyze_items(items[:2])
+    for item in items[:2]:
+        process_item(item, results[item.id])
+    components_db.writer.submit(lambda cursor: None).result()
+
+    conn = components_db.get_connection()
+    rows = conn.execute('SELECT item_id, sentiment_stage FROM processed_items ORDER BY item_id').fetchall()
+    conn.close()
+    assert [tuple(row) for row in rows] == [('0', 'lexicon'), ('1', 'model')]
+
+def test_labels_need_an_explicit_negative_value(tmp_path):
+    from app.benchmarks.prefilter import load_texts
+    path = tmp_path / 'sample.csv'
+    path.write_text('text,label\nbroken again,NEG\nlove it,pos\nmeh,0\n')
+
+    texts, labels = load_texts(str(path), 'text', 'label', ['neg'])
+    assert texts == ['broken again', 'love it', 'meh']
+    assert labels == [True, False, False]
+    assert load_texts(str(path), 'text')[1] is None
+
+def test_analytics_report_keeps_stages_apart(components_db, tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    import pyarrow.parquet as pq
+    from app.analytics.export import AnalyticsExporter, sentiment_distribution
+
+    # A file exported before processed_items had a sentiment_stage column
+    old = tmp_path / 'export' / 'processed_items' / 'date=2026-01-05'
+    old.mkdir(parents=True)
+    pq.write_table(pa.table({
+        'id': [1], 'source': ['Twitter'], 'item_id': ['old'], 'processed_at': pa.array([0], pa.timestamp('s')),
+        'sentiment_score': [-0.9], 'sentiment_label': ['NEGATIVE']
+    }), str(old / 'part-000000000001-000000000001.parquet'))
+
+    for item_id, score, stage in [('a', 0.6, 'lexicon'), ('b', -0.8, 'model'), ('c', -0.6, 'model')]:
+        components_db.claim_item('Twitter', item_id)
+        components_db.record_item_sentiment('Twitter', item_id, score, 'NEGATIVE', stage).result()
+    AnalyticsExporter(components_db.db_path, str(tmp_path / 'export'), settle_seconds=0).export()
+
+    rows = sentiment_distribution(export_dir=str(tmp_path / 'export')).to_pylist()
+    by_stage = {(row['month'], row['sentiment_stage']): row for row in rows}
+    assert by_stage[('2026-01', None)]['sentiment_score_count'] == 1
+    current = [key for key in by_stage if key[0] != '2026-01']
+    assert sorted(stage for _, stage in current) == ['lexicon', 'model']
+    assert [by_stage[key]['sentiment_score_mean'] for key in current if key[1] == 'model'] == [pytest.approx(-0.7)]
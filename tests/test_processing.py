@@ -0,0 +1,115 @@
+import pytest
+from config import Config
+from app.benchmarks.fakes import NEGATIVE_TEXTS, Traffic
+from app.monitors.items import MentionItem
+
+NEGATIVE = {text.format(kw='acme') for text in NEGATIVE_TEXTS}
+
+class FakeAnalyzer:
+    """Scores the fake upstream texts by template and records what it analyzed"""
+
+    def __init__(self):
+        self.texts = []
+
+    def analyze_batch(self, texts, with_embeddings=False):
+        self.texts.extend(texts)
+        return [
+            {'label': 'NEGATIVE', 'score': 0.9, 'normalized_score': -0.9} if text in NEGATIVE
+            else {'label': 'POSITIVE', 'score': 0.8, 'normalized_score': 0.8}
+            for text in texts
+        ]
+
+    def determine_urgency(self, score, engagement):
+        return 'MEDIUM'
+
+    def generate_response_recommendation(self, text, label, category=None):
+        return 'Reply'
+
+@pytest.fixture
+def analyzer(components_db, monkeypatch):
+    from app.components import components
+    analyzer = FakeAnalyzer()
+    monkeypatch.setitem(components._instances, 'sentiment_analyzer', analyzer)
+    monkeypatch.setitem(components._instances, 'lexicon_scorer', None)
+    monkeypatch.setitem(components._instances, 'incident_index', None)
+    monkeypatch.setattr(Config, 'SENTIMENT_BATCH_SIZE', 4)
+    return analyzer
+
+def fetch(traffic, count, source='Twitter', **fields):
+    """Items as the monitors build them from the fake upstreams' responses"""
+    return [
+        MentionItem(source, str(traffic.next_id()), text, '@someone', **fields)
+        for text in traffic.texts('acme', count)
+    ]
+
+def test_items_are_processed_in_arrival_order(analyzer, components_db):
+    from app.agent import process_items
+    items = fetch(Traffic(negative_ratio=0.5, seed=1), 10)
+
+    counts = process_items(items)
+    assert analyzer.texts == [item.text for item in items]
+    negatives = sum(item.text in NEGATIVE for item in items)
+    assert 0 < negatives < 10
+    assert counts == {'items': 10, 'new_items': 10, 'alerts_created': negatives, 'by_source': {'Twitter': 10}}
+    assert components_db.get_stats()['total_alerts'] == negatives
+
+def test_fetching_runs_at_most_a_batch_ahead(analyzer):
+    from app.agent import process_items
+    items = fetch(Traffic(seed=2), 20)
+    pulled = []
+
+    def stream():
+        for item in items:
+            pulled.append(item)
+            yield item
+
+    analyze_batch = analyzer.analyze_batch
+    seen = []
+    def recording_analyze(texts, with_embeddings=False):
+        seen.append(len(pulled))
+        return analyze_batch(texts, with_embeddings)
+    analyzer.analyze_batch = recording_analyze
+
+    assert process_items(stream())['items'] == 20
+    # Besides the batch being analyzed, at most one is queued and one being filled
+    assert all(count <= (index + 3) * Config.SENTIMENT_BATCH_SIZE for index, count in enumerate(seen))
+    assert seen[0] < len(items)
+
+def test_seen_items_are_not_analyzed_again(analyzer):
+    from app.agent import process_items
+    items = fetch(Traffic(negative_ratio=1.0, seed=3), 6)
+    process_items(items[:4])
+    analyzer.texts.clear()
+
+    # Repeats within one fetch and from an earlier cycle
+    counts = process_items(items + items[4:])
+    assert analyzer.texts == [items[4].text, items[5].text]
+    assert counts['items'] == 8 and counts['alerts_created'] == 2
+
+def test_prioritized_processing_takes_urgent_items_first(analyzer, monkeypatch):
+    from app.agent import process_prioritized
+    monkeypatch.setattr(Config, 'SENTIMENT_BATCH_SIZE', 6)
+    tweets = [
+        MentionItem('Twitter', '1', 'Loving the new release', '@a', engagement=2),
+        MentionItem('Twitter', '2', 'acme is down, I want a refund', '@b', engagement=500, reach=10000),
+        MentionItem('Twitter', '3', 'acme is slow today', '@c', engagement=5)
+    ]
+    posts = [
+        MentionItem('Reddit', 'p1', 'Has acme crashed for anyone else?', 'redditor', engagement=40,
+                    subreddit='acme', reach=25000),
+        MentionItem('Reddit', 'p2', 'Nice update', 'redditor', engagement=0, subreddit='acme')
+    ]
+
+    counts = process_prioritized([iter(tweets), iter(posts)])
+    assert analyzer.texts == [
+        'acme is down, I want a refund', 'Has acme crashed for anyone else?', 'acme is slow today', 'Loving the new release', 'Nice update'
+    ]
+    assert counts['by_source'] == {'Twitter': 3, 'Reddit': 2}
+
+def test_item_found_by_two_streams_is_processed_once(analyzer):
+    from app.agent import process_prioritized
+    items = fetch(Traffic(negative_ratio=1.0, seed=5), 3)
+
+    counts = process_prioritized([iter(items), iter(items[1:])])
+    assert sorted(analyzer.texts) == sorted(item.text for item in items)
+    assert counts['items'] == 5 and counts['alerts_created'] == 3
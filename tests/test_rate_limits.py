@@ -0,0 +1,115 @@
+import threading
+import time
+import pytest
+from app.monitors.rate_limits import RateLimitManager
+
+@pytest.fixture
+def rate_limits(components_db):
+    return RateLimitManager()
+
+def test_consume_reserves_until_quota_is_spent(rate_limits):
+    rate_limits.update('Reddit', 'api', remaining=3, reset_at=time.time() + 60, limit=100)
+    assert rate_limits.consume('Reddit', 'api', 2)
+    assert not rate_limits.consume('Reddit', 'api', 2)
+    assert rate_limits.consume('Reddit', 'api')
+    assert not rate_limits.can_call('Reddit', 'api')
+
+def test_consume_on_unknown_endpoint_is_allowed(rate_limits):
+    assert rate_limits.consume('Twitter', '/2/tweets/search/recent')
+    assert rate_limits.get_status() == {}
+
+def test_quota_refills_after_reset(rate_limits):
+    rate_limits.update('Reddit', 'api', remaining=0, reset_at=time.time() - 1, limit=100)
+    assert rate_limits.consume('Reddit', 'api')
+    assert rate_limits.get_status()['Reddit:api']['remaining'] == 99
+
+def test_quota_is_shared_through_the_database(rate_limits, components_db):
+    rate_limits.update('Twitter', '/2/tweets/search/recent', remaining=2, reset_at=time.time() + 60, limit=450)
+    rate_limits.consume('Twitter', '/2/tweets/search/recent')
+    stored = components_db.get_rate_limit('Twitter', '/2/tweets/search/recent')
+    assert (stored['remaining'], stored['quota_limit']) == (1, 450)
+
+def test_concurrent_callers_cannot_overspend(rate_limits):
+    rate_limits.update('Reddit', 'api', remaining=5, reset_at=time.time() + 60)
+    granted = []
+    barrier = threading.Barrier(20)
+
+    def call():
+        barrier.wait()
+        granted.append(rate_limits.consume('Reddit', 'api'))
+
+    threads = [threading.Thread(target=call) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert granted.count(True) == 5
+
+class FakeListing:
+    def __init__(self, posts, seen):
+        self.posts = posts
+        self.seen = seen
+
+    def search(self, keyword, limit, sort):
+        # Quota as the monitor left it right before the upstream request
+        self.seen.append(RateLimitManager().get_status()['Reddit:api']['remaining'])
+        return iter(self.posts[:limit])
+
+class FakeReddit:
+    def __init__(self, seen):
+        self.seen = seen
+        self.auth = type('Auth', (), {'limits': {}})()
+
+    def subreddit(self, name):
+        return FakeListing([], self.seen)
+
+def test_reddit_search_reserves_quota_before_each_request(rate_limits):
+    pytest.importorskip('praw')
+    from app.monitors.reddit_monitor import RedditMonitor
+
+    monitor = object.__new__(RedditMonitor)
+    seen = []
+    monitor.reddit = FakeReddit(seen)
+    rate_limits.update('Reddit', 'api', remaining=3, reset_at=time.time() + 60)
+
+    list(monitor.search_mentions(['a', 'b', 'c', 'd'], limit=150))
+    # Two pages per keyword: the first keyword reserves 2 calls, the second no longer fits
+    assert seen == [1]
+
+def test_twitter_client_reserves_quota_before_request(rate_limits, monkeypatch):
+    tweepy = pytest.importorskip('tweepy')
+    from app.monitors.twitter_monitor import RateLimitedClient
+
+    seen = []
+
+    class Response:
+        headers = {'x-rate-limit-remaining': '7', 'x-rate-limit-limit': '10'}
+
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        seen.append(RateLimitManager().get_status()[f'Twitter:{route}']['remaining'])
+        return Response()
+
+    monkeypatch.setattr(tweepy.Client, 'request', request)
+    rate_limits.update('Twitter', '/2/tweets/search/recent', remaining=9)
+
+    RateLimitedClient(bearer_token='token').request('GET', '/2/tweets/search/recent')
+    assert seen == [8]
+    assert rate_limits.get_status()['Twitter:/2/tweets/search/recent']['remaining'] == 7
+
+def test_twitter_client_does_not_call_upstream_without_quota(rate_limits, monkeypatch):
+    tweepy = pytest.importorskip('tweepy')
+    from app.monitors.twitter_monitor import QuotaExhausted, RateLimitedClient, TwitterMonitor
+
+    sent = []
+    monkeypatch.setattr(tweepy.Client, 'request', lambda self, *args, **kwargs: sent.append(args))
+    rate_limits.update('Twitter', '/2/tweets/search/recent', remaining=0, reset_at=time.time() + 600)
+
+    with pytest.raises(QuotaExhausted):
+        RateLimitedClient(bearer_token='token').request('GET', '/2/tweets/search/recent')
+
+    # Another process spent the quota between the monitor's check and the request
+    monkeypatch.setattr(RateLimitManager, 'can_call', lambda self, source, endpoint: True)
+    monitor = object.__new__(TwitterMonitor)
+    monitor.client = RateLimitedClient(bearer_token='token')
+    assert list(monitor.search_mentions(['acme'], max_results=10)) == []
+    assert sent == []
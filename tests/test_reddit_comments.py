@@ -0,0 +1,131 @@
+import time
+import pytest
+from config import Config
+from app.monitors.rate_limits import RateLimitManager
+
+pytest.importorskip('praw')
+from app.monitors.reddit_monitor import RedditMonitor
+
+class FakeComment:
+    def __init__(self, id, body, created_utc, author='redditor', score=1):
+        self.id = id
+        self.body = body
+        self.created_utc = created_utc
+        self.author = author
+        self.score = score
+        self.permalink = f"/r/acme/comments/t/{id}/"
+
+class FakeForest:
+    def __init__(self, comments):
+        self.comments = comments
+        self.replace_more_limits = []
+
+    def replace_more(self, limit):
+        self.replace_more_limits.append(limit)
+
+    def list(self):
+        return list(self.comments)
+
+class FakeSubmission:
+    def __init__(self, id, num_comments, comments=(), fails=False):
+        self.id = id
+        self.num_comments = num_comments
+        self.comments = FakeForest(comments)
+        self.subreddit = 'acme'
+        self.fails = fails
+
+class FakeReddit:
+    def __init__(self, submissions):
+        self.submissions = {submission.id: submission for submission in submissions}
+        self.fetched = []
+        self.auth = type('Auth', (), {'limits': {}})()
+
+    def info(self, fullnames):
+        return [self.submissions[name[3:]] for name in fullnames]
+
+    def submission(self, id):
+        self.fetched.append(id)
+        if self.submissions[id].fails:
+            raise RuntimeError('upstream error')
+        return self.submissions[id]
+
+@pytest.fixture
+def monitor(components_db, monkeypatch):
+    monitor = object.__new__(RedditMonitor)
+    monkeypatch.setattr(Config, 'REDDIT_REPLACE_MORE_LIMIT', 2)
+
+    def connect(*submissions):
+        monitor.reddit = FakeReddit(submissions)
+        monitor._thread_client = lambda: monitor.reddit
+        return monitor.reddit
+    monitor.connect = connect
+    return monitor
+
+def scan(monitor, threads, keywords=('acme',)):
+    return {submission_id: (mark, [item.id for item in items])
+            for submission_id, mark, items in monitor.scan_comments(threads, list(keywords))}
+
+def test_only_new_matching_comments_of_changed_threads_are_returned(monitor):
+    reddit = monitor.connect(
+        FakeSubmission('quiet', 4),
+        FakeSubmission('busy', 6, [
+            FakeComment('c1', 'acme was fine yesterday', 100.0),
+            FakeComment('c2', 'ACME is down again', 250.0),
+            FakeComment('c3', 'me too', 300.0),
+            FakeComment('c4', 'Acme support never answers', 200.0, author=None)
+        ])
+    )
+    results = scan(monitor, [
+        {'submission_id': 'quiet', 'num_comments': 4, 'last_comment_utc': 50.0},
+        {'submission_id': 'busy', 'num_comments': 3, 'last_comment_utc': 150.0}
+    ])
+
+    assert results == {
+        'quiet': ({'num_comments': 4, 'last_comment_utc': 50.0}, []),
+        'busy': ({'num_comments': 6, 'last_comment_utc': 300.0}, ['c2', 'c4'])
+    }
+    assert reddit.fetched == ['busy']
+    assert reddit.submissions['busy'].comments.replace_more_limits == [2]
+
+def test_new_thread_returns_every_matching_comment(monitor):
+    monitor.connect(FakeSubmission('fresh', 2, [
+        FakeComment('c1', 'acme charged me twice', 100.0, author=None),
+        FakeComment('c2', 'unrelated', 120.0)
+    ]))
+    results = list(monitor.scan_comments(
+        [{'submission_id': 'fresh', 'num_comments': None, 'last_comment_utc': None}], ['acme']
+    ))
+    [(submission_id, mark, items)] = results
+    assert mark == {'num_comments': 2, 'last_comment_utc': 120.0}
+    assert [(item.id, item.author, item.subreddit) for item in items] == [('c1', '[deleted]', 'acme')]
+    assert items[0].url == 'https://reddit.com/r/acme/comments/t/c1/'
+
+def test_failed_thread_does_not_stop_the_scan(monitor):
+    monitor.connect(
+        FakeSubmission('broken', 5, fails=True),
+        FakeSubmission('ok', 1, [FakeComment('c1', 'acme crashed', 10.0)])
+    )
+    results = scan(monitor, [
+        {'submission_id': 'broken', 'num_comments': 1, 'last_comment_utc': None},
+        {'submission_id': 'ok', 'num_comments': 0, 'last_comment_utc': None}
+    ])
+    # The broken thread keeps its old mark and is retried next time
+    assert results == {'ok': ({'num_comments': 1, 'last_comment_utc': 10.0}, ['c1'])}
+
+def test_threads_are_not_fetched_without_quota(monitor):
+    reddit = monitor.connect(*[FakeSubmission(f"t{i}", 1, [FakeComment(f"c{i}", 'acme', 1.0)]) for i in range(3)])
+    threads = [{'submission_id': f"t{i}", 'num_comments': 0, 'last_comment_utc': None} for i in range(3)]
+    # One call for the metadata and one thread's 1 + REDDIT_REPLACE_MORE_LIMIT calls
+    RateLimitManager().update('Reddit', 'api', remaining=4, reset_at=time.time() + 600)
+
+    assert len(scan(monitor, threads)) == 1
+    assert len(reddit.fetched) == 1
+
+    reddit.fetched.clear()
+    assert scan(monitor, threads) == {}
+    assert reddit.fetched == []
+
+def test_nothing_is_scanned_without_keywords(monitor):
+    reddit = monitor.connect(FakeSubmission('t', 1))
+    assert scan(monitor, [{'submission_id': 't', 'num_comments': 0, 'last_comment_utc': None}], ['  ']) == {}
+    assert reddit.fetched == []
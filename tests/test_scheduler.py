@@ -0,0 +1,46 @@
+from app.scheduler import AdaptiveScheduler, stored_status
+from config import Config
+
+def make_scheduler(poll_fn, store=None, **kwargs):
+    return AdaptiveScheduler(
+        poll_fn, ['outage', 'refund'], ['Twitter', 'Reddit'],
+        min_interval_minutes=1, max_interval_minutes=60, calls_per_hour=3, target_mentions=5, store=store,
+        **kwargs
+    )
+
+def test_budget_limits_polls_hottest_first():
+    polled = []
+    scheduler = make_scheduler(lambda keyword, source: polled.append((keyword, source)) or 0)
+    scheduler.states[('refund', 'Reddit')].velocity = 10
+
+    results = scheduler.tick()
+    assert results == {'polled': 3, 'new_mentions': 0, 'deferred': 1}
+    assert polled[0] == ('refund', 'Reddit')
+    assert scheduler.remaining_budget() == 0
+
+def test_rate_limited_source_is_skipped_without_budget():
+    polled = []
+    scheduler = make_scheduler(
+        lambda keyword, source: polled.append(source) or 1, is_available=lambda source: source != 'Twitter'
+    )
+    scheduler.tick()
+    assert set(polled) == {'Reddit'}
+    assert scheduler.remaining_budget() == 1
+
+def test_state_is_saved_and_restored(components_db, monkeypatch):
+    monkeypatch.setattr(Config, 'KEYWORDS', ['outage', 'refund'])
+    scheduler = make_scheduler(lambda keyword, source: 12 if keyword == 'outage' else 0, store=components_db)
+    scheduler.tick()
+    components_db.writer.submit(lambda cursor: None).result()  # wait for the queued saves
+
+    # What a web worker reports, read from the database
+    status = stored_status(components_db, calls_per_hour=3)
+    assert status['remaining_budget'] == 0
+    assert len(status['schedule']) == 4
+    assert max(row['velocity_per_minute'] for row in status['schedule']) > 0
+
+    restarted = make_scheduler(lambda keyword, source: 0, store=components_db)
+    assert restarted.remaining_budget() == 0
+    for key, state in scheduler.states.items():
+        assert restarted.states[key].velocity == state.velocity
+        assert restarted.states[key].next_due == state.next_due
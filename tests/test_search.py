@@ -0,0 +1,131 @@
+import pytest
+from conftest import make_alert
+
+@pytest.fixture
+def searchable(components_db):
+    if not components_db.fts_enabled:
+        pytest.skip("SQLite build without FTS5")
+    return components_db
+
+def test_search_ranks_and_highlights_matches(searchable):
+    searchable.add_alert(make_alert(content='Checkout is broken again, checkout fails every time'))
+    searchable.add_alert(make_alert(content='Login page is slow'))
+    searchable.add_alert(make_alert(content='Checkout was slow today'))
+
+    found = searchable.search_alerts('checkout')
+    assert found['total'] == 2
+    assert 'broken again' in found['results'][0]['content']
+    assert '<mark>' in found['results'][0]['snippet']
+
+def test_search_escapes_user_input(searchable):
+    searchable.add_alert(make_alert(content='<b>refund</b> please'))
+    found = searchable.search_alerts('refund OR NEAR(')
+    assert found['total'] == 0
+    snippet = searchable.search_alerts('refund')['results'][0]['snippet']
+    assert '&lt;b&gt;' in snippet and '<mark>refund</mark>' in snippet
+
+def test_search_sees_compressed_content(searchable, monkeypatch):
+    from config import Config
+    monkeypatch.setattr(Config, 'ALERT_CONTENT_COMPRESS_MIN_BYTES', 16)
+    alert_id = searchable.add_alert(make_alert(content='billing ' * 50 + 'overcharged twice'))
+    found = searchable.search_alerts('overcharged')
+    assert [result['id'] for result in found['results']] == [alert_id]
+
+def test_search_follows_updates_and_deletes(searchable):
+    alert_id = searchable.add_alert(make_alert(content='password reset email never arrives'))
+    searchable.writer.submit(lambda cursor: cursor.execute(
+        'UPDATE alerts SET content = ? WHERE id = ?', ('two factor codes are late', alert_id)
+    )).result()
+    assert searchable.search_alerts('password')['total'] == 0
+    assert searchable.search_alerts('codes')['total'] == 1
+
+    searchable.writer.submit(lambda cursor: cursor.execute('DELETE FROM alerts WHERE id = ?', (alert_id,))).result()
+    assert searchable.search_alerts('codes')['total'] == 0
+
+@pytest.mark.parametrize('query, expected', [
+    ('limit=-1', (1, 0)),
+    ('limit=0&offset=-5', (1, 0)),
+    ('limit=1000&offset=2', (100, 2)),
+    ('', (20, 0)),
+])
+def test_search_pagination_is_clamped(searchable, client, query, expected):
+    for i in range(3):
+        searchable.add_alert(make_alert(content=f'outage number {i}'))
+
+    data = client.get(f'/api/alerts/search?q=outage&{query}').get_json()
+    assert (data['limit'], data['offset']) == expected
+    assert data['total'] == 3
+    assert data['count'] == max(min(expected[0], 3 - expected[1]), 0)
+
+def test_alert_list_limit_is_clamped(client, components_db):
+    for i in range(3):
+        components_db.add_alert(make_alert(content=f'outage number {i}'))
+    assert client.get('/api/alerts?limit=-1').get_json()['count'] == 1
+    assert client.get('/api/alerts?offset=-10').get_json()['count'] == 3
+
+def test_plain_sqlite_connection_can_write_alerts(searchable, monkeypatch):
+    import sqlite3
+    from config import Config
+    monkeypatch.setattr(Config, 'ALERT_CONTENT_COMPRESS_MIN_BYTES', 16)
+    compressed_id = searchable.add_alert(make_alert(content='invoice ' * 50 + 'charged twice'))
+
+    # No inflate()/content_preview() registered on this connection
+    conn = sqlite3.connect(searchable.db_path)
+    conn.execute("INSERT INTO alerts (source, content) VALUES ('Reddit', 'refund request ignored')")
+    conn.execute("UPDATE alerts SET author = '@billing' WHERE id = ?", (compressed_id,))
+    conn.commit()
+    conn.close()
+
+    assert searchable.search_alerts('refund')['total'] == 1
+    assert [result['id'] for result in searchable.search_alerts('charged')['results']] == [compressed_id]
+
+    conn = sqlite3.connect(searchable.db_path)
+    conn.execute('DELETE FROM alerts WHERE id = ?', (compressed_id,))
+    conn.commit()
+    conn.close()
+    assert searchable.search_alerts('charged')['total'] == 0
+
+def test_index_built_on_inflate_is_migrated(tmp_path):
+    import sqlite3
+    import zlib
+    from app.database.db import Database, inflate
+    path = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(path)
+    conn.create_function('inflate', 1, inflate)
+    try:
+        conn.executescript('''
+            CREATE TABLE alerts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, source TEXT NOT NULL, content TEXT NOT NULL,
+                author TEXT, url TEXT, sentiment_score REAL, sentiment_label TEXT, urgency_level TEXT,
+                recommended_response TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                status TEXT DEFAULT 'new', notified BOOLEAN DEFAULT 0
+            );
+            CREATE VIEW alerts_text AS
+                SELECT id, inflate(content) AS content, author, recommended_response FROM alerts;
+            CREATE VIRTUAL TABLE alerts_fts USING fts5(
+                content, author, recommended_response, content='alerts_text', content_rowid='id'
+            );
+            CREATE TRIGGER alerts_fts_insert AFTER INSERT ON alerts BEGIN
+                INSERT INTO alerts_fts (rowid, content, author, recommended_response)
+                VALUES (new.id, inflate(new.content), new.author, new.recommended_response);
+            END;
+        ''')
+    except sqlite3.OperationalError:
+        pytest.skip("SQLite build without FTS5")
+    conn.execute('INSERT INTO alerts (source, content) VALUES (?, ?)',
+                 ('Twitter', zlib.compress(b'stock levels are wrong')))
+    conn.commit()
+    conn.close()
+
+    Database._instance = None
+    db = Database(path)
+    try:
+        assert db.search_alerts('stock')['total'] == 1
+        conn = sqlite3.connect(path)
+        conn.execute("INSERT INTO alerts (source, content) VALUES ('Reddit', 'stock page is empty')")
+        conn.commit()
+        conn.close()
+        assert db.search_alerts('stock')['total'] == 2
+    finally:
+        db.close()
+        Database._instance = None
@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+
+from app.models.sentiment import SentimentAnalyzer
+
+BAD_TOKEN = -1
+
+class FakeTokenizer:
+    def encode(self, text, add_special_tokens=False):
+        return [BAD_TOKEN if word == 'poison' else len(word) for word in text.split()]
+
+@pytest.fixture
+def analyzer(monkeypatch):
+    """Analyzer without a model: a chunk is NEGATIVE if it has an odd token, and fails on the bad token"""
+    analyzer = object.__new__(SentimentAnalyzer)
+    analyzer.tokenizer = FakeTokenizer()
+    analyzer.heads = {}
+    analyzer.window_tokens = 510
+
+    def classify(token_chunks, with_embeddings=False):
+        if any(BAD_TOKEN in chunk for chunk in token_chunks):
+            raise RuntimeError("bad input")
+        return [
+            {'label': 'NEGATIVE' if any(token % 2 for token in chunk) else 'POSITIVE', 'score': 0.9, 'heads': {}}
+            for chunk in token_chunks
+        ]
+
+    monkeypatch.setattr(analyzer, '_classify_bucketed', classify)
+    return analyzer
+
+def test_batch_results_follow_input_order(analyzer):
+    results = analyzer.analyze_batch(['ab cd', 'abc', ''])
+    assert [result['label'] for result in results] == ['POSITIVE', 'NEGATIVE', 'NEUTRAL']
+
+def test_failing_text_does_not_blank_its_batch(analyzer):
+    results = analyzer.analyze_batch(['ab cd', 'this is poison', 'abc'])
+    assert [result['label'] for result in results] == ['POSITIVE', 'ERROR', 'NEGATIVE']
+    assert results[0]['normalized_score'] == pytest.approx(0.9)
+
+def test_single_failing_text_returns_error_result(analyzer):
+    assert analyzer.analyze_batch(['poison'])[0]['label'] == 'ERROR'
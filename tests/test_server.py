@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import pytest
+
+pytest.importorskip('gunicorn')
+from app.server import SchedulerSupervisor, process_alive
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+def crash():
+    sys.exit(3)
+
+def run_forever():
+    while True:
+        time.sleep(1)
+
+def test_child_reaped_elsewhere_is_not_alive():
+    supervisor = SchedulerSupervisor(target=crash, check_interval=60)
+    supervisor._spawn()
+    # gunicorn's SIGCHLD handler reaps every child of the master
+    os.waitpid(supervisor.process.pid, 0)
+    assert not process_alive(supervisor.process)
+
+def test_dead_scheduler_is_restarted():
+    supervisor = SchedulerSupervisor(target=crash, check_interval=0.05)
+    supervisor.CRASH_LOOP_SECONDS = 0
+    supervisor.start()
+    try:
+        assert wait_for(lambda: supervisor.restarts >= 2)
+    finally:
+        supervisor.stop()
+
+def test_crash_loop_backs_off():
+    supervisor = SchedulerSupervisor(target=crash, check_interval=0.05)
+    supervisor.start()
+    time.sleep(0.5)
+    supervisor.stop()
+    # Delays of 0.05, 0.1, 0.2, 0.4s after each check leave room for at most three restarts
+    assert 1 <= supervisor.restarts <= 3
+
+def test_stop_terminates_the_scheduler_without_restarting_it():
+    supervisor = SchedulerSupervisor(target=run_forever, check_interval=0.05)
+    supervisor.start()
+    first = supervisor.process
+    assert wait_for(lambda: process_alive(first))
+    supervisor.stop()
+    assert not first.is_alive()
+    time.sleep(0.2)
+    assert supervisor.process is first and supervisor.restarts == 0
@@ -0,0 +1,68 @@
+import pytest
+from conftest import make_alert
+
+@pytest.fixture
+def alerts(components_db):
+    """Ids of three HIGH alerts (two Twitter, one Reddit) and one LOW alert"""
+    return [
+        components_db.add_alert(make_alert(source='Twitter')),
+        components_db.add_alert(make_alert(source='Twitter')),
+        components_db.add_alert(make_alert(source='Reddit')),
+        components_db.add_alert(make_alert(source='Reddit', urgency_level='LOW'))
+    ]
+
+def statuses(db, ids):
+    return [db.get_alert(alert_id)['status'] for alert_id in ids]
+
+def test_status_update_with_stale_version_conflicts(client, components_db, alerts):
+    alert_id = alerts[0]
+    assert client.put(f'/api/alert/{alert_id}/status', json={'status': 'in_progress', 'version': 0}).status_code == 200
+    # A second triager still looking at version 0
+    response = client.put(f'/api/alert/{alert_id}/status', json={'status': 'ignored', 'version': 0})
+    assert response.status_code == 409
+    alert = components_db.get_alert(alert_id)
+    assert (alert['status'], alert['version']) == ('in_progress', 1)
+
+def test_bulk_update_reports_version_conflicts(client, components_db, alerts):
+    components_db.update_alert_status(alerts[1], 'in_progress')
+    data = client.post('/api/alerts/status', json={
+        'status': 'resolved',
+        'alerts': [{'id': alerts[0], 'version': 0}, {'id': alerts[1], 'version': 0}, {'id': 999999, 'version': 0}]
+    }).get_json()
+    assert data['updated'] == [alerts[0]]
+    assert data['conflicts'] == [alerts[1], 999999]
+    assert statuses(components_db, alerts[:2]) == ['resolved', 'in_progress']
+
+def test_bulk_update_by_filter(client, components_db, alerts):
+    data = client.post('/api/alerts/status', json={
+        'status': 'ignored', 'filter': {'urgency': 'HIGH', 'source': ['Reddit']}
+    }).get_json()
+    assert data['updated'] == [alerts[2]]
+    assert statuses(components_db, alerts) == ['new', 'new', 'ignored', 'new']
+
+def test_misspelled_filter_key_does_not_widen_the_update(client, components_db, alerts):
+    response = client.post('/api/alerts/status', json={
+        'status': 'ignored', 'filter': {'urgency': 'HIGH', 'sorce': 'twitter'}
+    })
+    assert response.status_code == 400
+    assert 'sorce' in response.get_json()['error']
+    assert statuses(components_db, alerts) == ['new'] * 4
+
+@pytest.mark.parametrize('body', [
+    {'status': 'ignored', 'filter': {}},
+    {'status': 'ignored', 'filter': {'older_than_days': None}},
+    {'status': 'ignored', 'filter': 'urgency=HIGH'},
+    {'status': 'ignored', 'ids': []},
+    {'status': 'ignored', 'alerts': []},
+    {'status': 'ignored'},
+    {'status': 'deleted', 'ids': [1]},
+    {'status': 'ignored', 'filter': {'urgency': 'SEVERE'}},
+])
+def test_bulk_update_rejects_empty_or_invalid_requests(client, components_db, alerts, body):
+    assert client.post('/api/alerts/status', json=body).status_code == 400
+    assert statuses(components_db, alerts) == ['new'] * 4
+
+def test_bulk_update_by_ids(client, components_db, alerts):
+    data = client.post('/api/alerts/status', json={'status': 'resolved', 'ids': alerts[:2]}).get_json()
+    assert data['updated_count'] == 2 and data['conflict_count'] == 0
+    assert statuses(components_db, alerts) == ['resolved', 'resolved', 'new', 'new']
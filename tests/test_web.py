@@ -0,0 +1,41 @@
+import pytest
+from flask import url_for
+from app.main import app
+from app.web import _static_cache
+
+@pytest.fixture
+def web():
+    _static_cache.clear()
+    _static_cache.hits = 0
+    with app.test_request_context():
+        url = url_for('static', filename='js/dashboard.js')
+    return app.test_client(), url
+
+def test_fingerprinted_asset_is_cached_for_a_year(web):
+    client, url = web
+    assert '?v=' in url
+    response = client.get(url)
+    assert response.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+
+def test_unversioned_asset_is_revalidated(web):
+    client, _ = web
+    assert client.get('/static/js/dashboard.js').headers['Cache-Control'] == 'no-cache'
+
+def test_fingerprinted_asset_is_compressed_once_per_encoding(web):
+    client, url = web
+    first = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    second = client.get(url, headers={'Accept-Encoding': 'gzip'})
+    assert first.headers['Content-Encoding'] == 'gzip'
+    assert second.data == first.data
+    assert (len(_static_cache), _static_cache.hits) == (1, 1)
+
+    client.get('/static/js/dashboard.js', headers={'Accept-Encoding': 'gzip'})
+    assert len(_static_cache) == 1
+
+def test_static_cache_is_bounded():
+    from app.web import _StaticCache
+    cache = _StaticCache(max_entries=2)
+    for version in range(3):
+        cache.set(f'gzip;/static/app.js?v={version}:gzip', b'body')
+    cache.set('gzip;/api/stats?:gzip', b'body')
+    assert list(cache.entries) == ['gzip;/static/app.js?v=1:gzip', 'gzip;/static/app.js?v=2:gzip']
@@ -0,0 +1,112 @@
+import sqlite3
+import pytest
+from app.database.writer import DatabaseWriter
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / 'writes.db')
+    conn = sqlite3.connect(path)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('CREATE TABLE t (value INTEGER UNIQUE)')
+    conn.close()
+    return path
+
+@pytest.fixture
+def writer(path):
+    writer = DatabaseWriter(lambda: sqlite3.connect(path, check_same_thread=False), max_batch=10, max_delay=0.2)
+    yield writer
+    writer.close()
+
+def stored(path):
+    conn = sqlite3.connect(path)
+    values = [row[0] for row in conn.execute('SELECT value FROM t ORDER BY value')]
+    conn.close()
+    return values
+
+def insert(value):
+    def write(cursor):
+        cursor.execute('INSERT INTO t (value) VALUES (?)', (value,))
+        return cursor.lastrowid
+    return write
+
+def test_future_resolves_after_commit(writer, path):
+    assert writer.submit(insert(1)).result(timeout=5) == 1
+    # Visible to another connection as soon as the future resolves
+    assert stored(path) == [1]
+
+def test_writes_submitted_together_share_commits(writer, path):
+    futures = [writer.submit(insert(value)) for value in range(25)]
+    assert [future.result(timeout=5) for future in futures] == list(range(1, 26))
+    assert writer.get_status() == {'queued': 0, 'writes': 25, 'commits': 3}
+
+def test_failing_write_is_rolled_back_alone(writer, path):
+    def insert_then_fail(cursor):
+        cursor.execute('INSERT INTO t (value) VALUES (100)')
+        raise ValueError('rejected')
+
+    futures = [writer.submit(insert(1)), writer.submit(insert_then_fail), writer.submit(insert(1)),
+               writer.submit(insert(2))]
+    assert futures[0].result(timeout=5) == 1
+    with pytest.raises(ValueError):
+        futures[1].result(timeout=5)
+    with pytest.raises(sqlite3.IntegrityError):
+        futures[2].result(timeout=5)
+    futures[3].result(timeout=5)
+    assert stored(path) == [1, 2]
+    assert writer.commits == 1
+
+def test_cancelled_write_is_skipped(writer, path):
+    first = writer.submit(insert(1))
+    cancelled = writer.submit(insert(2))
+    assert cancelled.cancel()
+    first.result(timeout=5)
+    writer.submit(insert(3)).result(timeout=5)
+    assert stored(path) == [1, 3]
+
+def test_close_flushes_queued_writes(path):
+    writer = DatabaseWriter(lambda: sqlite3.connect(path, check_same_thread=False), max_batch=1000, max_delay=30)
+    futures = [writer.submit(insert(value)) for value in range(50)]
+    writer.close()
+    assert all(future.done() and future.exception() is None for future in futures)
+    assert stored(path) == list(range(50))
+
+def test_writer_restarts_after_close(writer, path):
+    writer.submit(insert(1)).result(timeout=5)
+    writer.close()
+    assert writer.submit(insert(2)).result(timeout=5) == 2
+    assert stored(path) == [1, 2]
+
+def test_failed_connect_fails_queued_writes_and_writer_recovers(path):
+    attempts = []
+
+    def connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise sqlite3.OperationalError('unable to open database file')
+        return sqlite3.connect(path, check_same_thread=False)
+
+    writer = DatabaseWriter(connect)
+    with pytest.raises(sqlite3.OperationalError):
+        writer.submit(insert(1)).result(timeout=3)
+    # The next write starts a fresh writer thread
+    assert writer.submit(insert(2)).result(timeout=3) == 1
+    writer.close()
+    assert stored(path) == [2]
+
+def test_fatal_commit_error_fails_batch_and_pending_writes(writer, path, monkeypatch):
+    commit = DatabaseWriter._commit
+    calls = []
+
+    def failing_commit(self, conn, batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise MemoryError('out of memory')
+        return commit(self, conn, batch)
+
+    monkeypatch.setattr(DatabaseWriter, '_commit', failing_commit)
+    futures = [writer.submit(insert(value)) for value in range(15)]
+    for future in futures:
+        with pytest.raises(MemoryError):
+            future.result(timeout=3)
+    assert writer.submit(insert(100)).result(timeout=3) == 1
+    assert stored(path) == [100]